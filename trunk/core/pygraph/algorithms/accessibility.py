@@ -30,7 +30,9 @@ Accessibility algorithms.
 
 
 # Imports
-from sys import getrecursionlimit, setrecursionlimit
+from pygraph.algorithms.walk import depth_first_walk, PRE, BACK
+from pygraph.classes.hypergraph import hypergraph
+from pygraph.classes.frozenhypergraph import frozenhypergraph
 
 # Transitive-closure
 
@@ -44,19 +46,17 @@ def accessibility(graph):
     @rtype:  dictionary
     @return: Accessibility information for each node.
     """
-    recursionlimit = getrecursionlimit()
-    setrecursionlimit(max(len(graph.nodes())*2,recursionlimit))
-    
     accessibility = {}        # Accessibility matrix
 
-    # For each node i, mark each node j if that exists a path from i to j.
-    for each in graph:
-        access = {}
-        # Perform DFS to explore all reachable nodes
-        _dfs(graph, access, 1, each)
-        accessibility[each] = list(access.keys())
+    # For each node i, list each node j if that exists a path from i to j.
+    if (getattr(graph, 'interning', False)):
+        nodes, ids, rows = graph.interned()
+        for i, each in enumerate(nodes):
+            accessibility[each] = [nodes[j] for j in _preorder(rows, i)]
+    else:
+        for each in graph:
+            accessibility[each] = _preorder(graph, each)
     
-    setrecursionlimit(recursionlimit)
     return accessibility
 
 
@@ -72,40 +72,35 @@ def mutual_accessibility(graph):
     @rtype:  dictionary
     @return: Mutual-accessibility information for each node.
     """
-    recursionlimit = getrecursionlimit()
-    setrecursionlimit(max(len(graph.nodes())*2,recursionlimit))
-    
     mutual_access = {}
     stack = []
     low = {}
-        
-    def visit(node):
-        if node in low:
-            return
-
-        num = len(low)
-        low[node] = num
-        stack_pos = len(stack)
-        stack.append(node)
-        
-        for successor in graph.neighbors(node):
-            visit(successor)
-            low[node] = min(low[node], low[successor])
-        
-        if num == low[node]:
-            component = stack[stack_pos:]
-            del stack[stack_pos:]
-            component.sort()
-            for each in component:
-                mutual_access[each] = component
-
-            for item in component:
-                low[item] = len(graph)
+    number = {}     # Order in which nodes were reached
+    position = {}   # Position of each node in the stack
+    done = len(graph)
     
-    for node in graph:
-        visit(node)
+    for event, node, other in depth_first_walk(graph, graph, back=True):
+        if (event == PRE):
+            number[node] = low[node] = len(low)
+            position[node] = len(stack)
+            stack.append(node)
+        elif (event == BACK):
+            low[node] = min(low[node], low[other])
+        else:
+            if number[node] == low[node]:
+                component = stack[position[node]:]
+                del stack[position[node]:]
+                component.sort()
+                for each in component:
+                    mutual_access[each] = component
+
+                for item in component:
+                    low[item] = done
+            
+            # Here, the search returns to the parent of the node
+            if (other is not None):
+                low[other] = min(low[other], low[node])
     
-    setrecursionlimit(recursionlimit)
     return mutual_access
 
 
@@ -121,46 +116,44 @@ def connected_components(graph):
     @rtype:  dictionary
     @return: Pairing that associates each node to its connected component.
     """
-    recursionlimit = getrecursionlimit()
-    setrecursionlimit(max(len(graph.nodes())*2,recursionlimit))
+    if (getattr(graph, 'interning', False)):
+        nodes, ids, rows = graph.interned()
+        walk = depth_first_walk(rows, range(len(nodes)))
+    else:
+        nodes = None
+        walk = depth_first_walk(graph, graph)
     
     visited = {}
-    count = 1
-
-    # For 'each' node not found to belong to a connected component, find its connected
-    # component.
-    for each in graph:
-        if (each not in visited):
-            _dfs(graph, visited, count, each)
-            count = count + 1
+    count = 0
+
+    # Each node reached from no parent starts a new connected component.
+    for event, node, parent in walk:
+        if (event == PRE):
+            if (parent is None):
+                count = count + 1
+            if (nodes is not None):
+                node = nodes[node]
+            visited[node] = count
     
-    setrecursionlimit(recursionlimit)
     return visited
 
 
 # Limited DFS implementations used by algorithms here
 
-def _dfs(graph, visited, count, node):
+def _preorder(graph, node):
     """
-    Depth-first search subfunction adapted for accessibility algorithms.
+    Return the nodes reachable from the given node, in depth-first preorder.
     
     @type  graph: graph, digraph, hypergraph
-    @param graph: Graph.
-
-    @type  visited: dictionary
-    @param visited: List of nodes (visited nodes are marked non-zero).
-
-    @type  count: number
-    @param count: Counter of connected components.
+    @param graph: Graph, or rows of neighbor ids returned by C{interned()}.
 
     @type  node: node
-    @param node: Node to be explored by DFS.
+    @param node: Node from which to search.
+    
+    @rtype:  list
+    @return: List of reachable nodes, including the given one.
     """
-    visited[node] = count
-    # Explore recursively the connected component
-    for each in graph[node]:
-        if (each not in visited):
-            _dfs(graph, visited, count, each)
+    return [each for event, each, parent in depth_first_walk(graph, [node]) if (event == PRE)]
 
 
 # Cut-Edge and Cut-Vertex identification
@@ -186,31 +179,17 @@ def cut_edges(graph):
     A cut edge, or bridge, is an edge of a graph whose removal increases the number of connected
     components in the graph.
     
-    @type  graph: graph, hypergraph
+    @type  graph: graph, hypergraph, frozenhypergraph
     @param graph: Graph.
     
     @rtype:  list
     @return: List of cut-edges.
     """
-    recursionlimit = getrecursionlimit()
-    setrecursionlimit(max(len(graph.nodes())*2,recursionlimit))
-
     # Dispatch if we have a hypergraph
-    if 'hypergraph' == graph.__class__.__name__:
+    if (isinstance(graph, (hypergraph, frozenhypergraph))):
         return _cut_hyperedges(graph)
 
-    pre = {}    # Pre-ordering
-    low = {}    # Lowest pre[] reachable from this node going down the spanning tree + one backedge
-    spanning_tree = {}
-    reply = []
-    pre[None] = 0
-
-    for each in graph:
-        if (each not in pre):
-            spanning_tree[each] = None
-            _cut_dfs(graph, spanning_tree, pre, low, reply, each)
-    
-    setrecursionlimit(recursionlimit)
+    spanning_tree, pre, low, reply = _cut_dfs(graph)
     return reply
 
 
@@ -218,7 +197,7 @@ def _cut_hyperedges(hypergraph):
     """
     Return the cut-hyperedges of the given hypergraph.
     
-    @type  hypergraph: hypergraph
+    @type  hypergraph: hypergraph, frozenhypergraph
     @param hypergraph: Hypergraph
     
     @rtype:  list
@@ -241,30 +220,20 @@ def cut_nodes(graph):
     A cut node, or articulation point, is a node of a graph whose removal increases the number of
     connected components in the graph.
     
-    @type  graph: graph, hypergraph
+    @type  graph: graph, hypergraph, frozenhypergraph
     @param graph: Graph.
         
     @rtype:  list
     @return: List of cut-nodes.
     """
-    recursionlimit = getrecursionlimit()
-    setrecursionlimit(max(len(graph.nodes())*2,recursionlimit))
-    
     # Dispatch if we have a hypergraph
-    if 'hypergraph' == graph.__class__.__name__:
+    if (isinstance(graph, (hypergraph, frozenhypergraph))):
         return _cut_hypernodes(graph)
         
-    pre = {}    # Pre-ordering
-    low = {}    # Lowest pre[] reachable from this node going down the spanning tree + one backedge
     reply = {}
-    spanning_tree = {}
-    pre[None] = 0
     
     # Create spanning trees, calculate pre[], low[]
-    for each in graph:
-        if (each not in pre):
-            spanning_tree[each] = None
-            _cut_dfs(graph, spanning_tree, pre, low, [], each)
+    spanning_tree, pre, low, edges = _cut_dfs(graph)
 
     # Find cuts
     for each in graph:
@@ -284,7 +253,6 @@ def cut_nodes(graph):
             if (children >= 2):
                 reply[each] = 1
 
-    setrecursionlimit(recursionlimit)
     return list(reply.keys())
 
 
@@ -292,7 +260,7 @@ def _cut_hypernodes(hypergraph):
     """
     Return the cut-nodes of the given hypergraph.
     
-    @type  hypergraph: hypergraph
+    @type  hypergraph: hypergraph, frozenhypergraph
     @param hypergraph: Hypergraph
     
     @rtype:  list
@@ -308,40 +276,38 @@ def _cut_hypernodes(hypergraph):
     return nodes
 
 
-def _cut_dfs(graph, spanning_tree, pre, low, reply, node):
+def _cut_dfs(graph):
     """
     Depth first search adapted for identification of cut-edges and cut-nodes.
     
     @type  graph: graph, digraph
     @param graph: Graph
     
-    @type  spanning_tree: dictionary
-    @param spanning_tree: Spanning tree being built for the graph by DFS.
-
-    @type  pre: dictionary
-    @param pre: Graph's preordering.
-    
-    @type  low: dictionary
-    @param low: Associates to each node, the preordering index of the node of lowest preordering
-    accessible from the given node.
-
-    @type  reply: list
-    @param reply: List of cut-edges.
-    
-    @type  node: node
-    @param node: Node to be explored by DFS.
+    @rtype:  tuple
+    @return: A tuple containing three dictionaries and a list:
+        1. Spanning tree built for the graph by DFS
+        2. Graph's preordering
+        3. Associates to each node, the preordering index of the node of lowest preordering
+        accessible from the given node
+        4. List of cut-edges
     """
-    pre[node] = pre[None]
-    low[node] = pre[None]
-    pre[None] = pre[None] + 1
+    spanning_tree = {}
+    pre = {}    # Pre-ordering
+    low = {}    # Lowest pre[] reachable from this node going down the spanning tree + one backedge
+    reply = []
+    
+    for event, node, other in depth_first_walk(graph, graph, back=True):
+        if (event == PRE):
+            spanning_tree[node] = other
+            pre[node] = low[node] = len(pre)
+        elif (event == BACK):
+            if (low[node] > pre[other] and spanning_tree[node] != other):
+                low[node] = pre[other]
+        elif (other is not None):
+            # Here, the search returns to the parent of the node
+            if (low[other] > low[node]):
+                low[other] = low[node]
+            if (low[node] == pre[node]):
+                reply.append((other, node))
     
-    for each in graph[node]:
-        if (each not in pre):
-            spanning_tree[each] = node
-            _cut_dfs(graph, spanning_tree, pre, low, reply, each)
-            if (low[node] > low[each]):
-                low[node] = low[each]
-            if (low[each] == pre[each]):
-                reply.append((node, each))
-        elif (low[node] > pre[each] and spanning_tree[node] != each):
-            low[node] = pre[each]
+    return spanning_tree, pre, low, reply
@@ -0,0 +1,171 @@
+# Copyright (c) 2012 Pedro Matiello <pmatiello@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+
+"""
+Caching of algorithm results.
+
+Results are cached per graph and per arguments and are only reused while the graph keeps the
+version it had when they were computed, so changing the graph invalidates them.
+
+    >>> from pygraph.algorithms.cache import cached
+    >>> from pygraph.algorithms.minmax import shortest_path
+    >>> cached_shortest_path = cached(shortest_path, maxsize=256)
+    >>> st, dist = cached_shortest_path(gr, 'A')
+    >>> cached_shortest_path.cache.stats()
+
+@sort: cached, resultcache
+"""
+
+
+# Imports
+from collections import OrderedDict
+from functools import wraps
+from weakref import ref
+
+
+class resultcache(object):
+    """
+    Size-bounded cache of algorithm results with least-recently-used eviction.
+    
+    Entries are keyed by the algorithm, the graph and the call arguments and remember the version
+    of the graph they were computed for. An entry found for an older version is discarded and
+    computed again. Calls whose arguments are not hashable, or on graphs without a version, are
+    not cached.
+    
+    Cached results are shared by every caller that gets them and should not be modified.
+    
+    @sort: __call__, __init__, __len__, clear, stats
+    """
+    
+    def __init__(self, maxsize=128):
+        """
+        Initialize the cache.
+        
+        @type  maxsize: number
+        @param maxsize: Maximum number of results kept.
+        """
+        self.maxsize = maxsize
+        self.entries = OrderedDict()    # Pairing: Key -> (Graph reference, Version, Result)
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+    
+    def __len__(self):
+        """
+        Return the number of results in the cache.
+        
+        @rtype:  number
+        @return: Number of cached results.
+        """
+        return len(self.entries)
+    
+    def __call__(self, function, graph, *args, **kwargs):
+        """
+        Return the result of calling the given algorithm, computing it only if it is not cached.
+        
+        @type  function: function
+        @param function: Algorithm taking the graph as its first argument.
+        
+        @type  graph: graph, digraph, hypergraph
+        @param graph: Graph.
+        
+        @return: Result of C{function(graph, *args, **kwargs)}.
+        """
+        version = getattr(graph, 'version', None)
+        key = (function, id(graph), args, tuple(sorted(kwargs.items())))
+        try:
+            hash(key)
+        except TypeError:
+            version = None
+        if (version is None):
+            self.misses = self.misses + 1
+            return function(graph, *args, **kwargs)
+        
+        entry = self.entries.pop(key, None)
+        if (entry is not None):
+            if (entry[0]() is graph and entry[1] == version):
+                self.hits = self.hits + 1
+                self.entries[key] = entry
+                return entry[2]
+            self.invalidations = self.invalidations + 1
+        
+        self.misses = self.misses + 1
+        result = function(graph, *args, **kwargs)
+        self.entries[key] = (ref(graph), version, result)
+        if (len(self.entries) > self.maxsize):
+            self.entries.popitem(last=False)
+            self.evictions = self.evictions + 1
+        return result
+    
+    def clear(self):
+        """
+        Remove all results from the cache. Statistics are kept.
+        """
+        self.entries.clear()
+    
+    def stats(self):
+        """
+        Return usage statistics of the cache.
+        
+        @rtype:  dictionary
+        @return: Number of hits, misses, invalidations and evictions, and the current and maximum
+        size of the cache.
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'invalidations': self.invalidations,
+                'evictions': self.evictions, 'size': len(self.entries), 'maxsize': self.maxsize}
+
+
+def cached(function=None, maxsize=128, cache=None):
+    """
+    Wrap an algorithm so that its results are cached.
+    
+    Can be called on the algorithm or used as a decorator, with or without arguments. The cache
+    is available as the C{cache} attribute of the returned function.
+    
+    @type  function: function
+    @param function: Algorithm taking the graph as its first argument.
+    
+    @type  maxsize: number
+    @param maxsize: Maximum number of results kept when a new cache is created.
+    
+    @type  cache: resultcache
+    @param cache: Cache to use, so that it can be shared by several algorithms.
+    
+    @rtype:  function
+    @return: Caching version of the algorithm.
+    """
+    if (cache is None):
+        cache = resultcache(maxsize)
+    
+    def decorate(function):
+        @wraps(function)
+        def wrapper(graph, *args, **kwargs):
+            return cache(function, graph, *args, **kwargs)
+        wrapper.cache = cache
+        return wrapper
+    
+    if (function is None):
+        return decorate
+    return decorate(function)
@@ -150,14 +150,11 @@ def critical_path(graph):
     
     path = []
     #find the critical path with backtracking trought the dictionary
-    def mid_critical_path(end):
-        if node_tuples[end][0] != None:
-            path.append(end)
-            mid_critical_path(node_tuples[end][0])
-        else:
-            path.append(end)
-    #call the recursive function
-    mid_critical_path(critical_node)
+    end = critical_node
+    while node_tuples[end][0] != None:
+        path.append(end)
+        end = node_tuples[end][0]
+    path.append(end)
     
     path.reverse()
     return path #return the array containing the critical path
\ No newline at end of file
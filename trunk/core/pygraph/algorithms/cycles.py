@@ -33,7 +33,9 @@ Cycle detection algorithms.
 from pygraph.classes.exceptions import InvalidGraphType
 from pygraph.classes.digraph import digraph as digraph_class
 from pygraph.classes.graph import graph as graph_class
-from sys import getrecursionlimit, setrecursionlimit
+from pygraph.classes.frozengraph import frozengraph
+from pygraph.classes.graphview import graphview
+from pygraph.algorithms.walk import depth_first_walk, PRE, BACK
 
 def find_cycle(graph):
     """
@@ -42,7 +44,7 @@ def find_cycle(graph):
     This function will return a list of nodes which form a cycle in the graph or an empty list if
     no cycle exists.
     
-    @type graph: graph, digraph
+    @type graph: graph, digraph, frozengraph, graphview
     @param graph: Graph.
     
     @rtype: list
@@ -53,6 +55,8 @@ def find_cycle(graph):
         directed = False
     elif (isinstance(graph, digraph_class)):
         directed = True
+    elif (isinstance(graph, (frozengraph, graphview))):
+        directed = graph.DIRECTED
     else:
         raise InvalidGraphType
 
@@ -70,39 +74,16 @@ def find_cycle(graph):
         path.reverse()
         return path
     
-    def dfs(node):
-        """
-        Depth-first search subfunction.
-        """
-        visited[node] = 1
-        # Explore recursively the connected component
-        for each in graph[node]:
-            if (cycle):
-                return
-            if (each not in visited):
-                spanning_tree[each] = node
-                dfs(each)
-            else:
-                if (directed or spanning_tree[node] != each):
-                    cycle.extend(find_cycle_to_ancestor(node, each))
-
-    recursionlimit = getrecursionlimit()
-    setrecursionlimit(max(len(graph.nodes())*2,recursionlimit))
-
-    visited = {}              # List for marking visited and non-visited nodes
     spanning_tree = {}        # Spanning tree
-    cycle = []
 
-    # Algorithm outer-loop
-    for each in graph:
-        # Select a non-visited node
-        if (each not in visited):
-            spanning_tree[each] = None
-            # Explore node's connected component
-            dfs(each)
-            if (cycle):
-                setrecursionlimit(recursionlimit)
-                return cycle
+    # Algorithm loop, over the edges found by depth-first search from each non-visited node
+    for event, node, other in depth_first_walk(graph, graph, back=True):
+        if (event == PRE):
+            spanning_tree[node] = other
+        elif (event == BACK):
+            if (directed or spanning_tree[node] != other):
+                cycle = find_cycle_to_ancestor(node, other)
+                if (cycle):
+                    return cycle
 
-    setrecursionlimit(recursionlimit)
     return []
@@ -30,6 +30,9 @@ Search filter for finding a specific node.
 class find(object):
     """
     Search filter for finding a specific node.
+    
+    Once the target is reached, the filter sets C{done}, which stops the search. The spanning tree
+    then holds the path from the root to the target and the nodes reached before it.
     """
     
     def __init__(self, target):
@@ -56,6 +59,7 @@ class find(object):
         """
         self.graph = graph
         self.spanning_tree = spanning_tree
+        self.done = False
          
     def __call__(self, node, parent):
         """
@@ -32,6 +32,9 @@ class radius(object):
     Radial search filter.
     
     This will keep searching contained inside a specified limit.
+    
+    The filter remembers the distance from the root of each node it accepts, so the distance of a
+    new node is found in constant time from the distance of its parent.
     """
     
     def __init__(self, radius):
@@ -45,6 +48,7 @@ class radius(object):
         self.spanning_tree = None
         self.radius = radius
         self.done = False
+        self.cost = {}
     
     def configure(self, graph, spanning_tree):
         """
@@ -58,6 +62,8 @@ class radius(object):
         """
         self.graph = graph
         self.spanning_tree = spanning_tree
+        self.done = False
+        self.cost = {}
          
     def __call__(self, node, parent):
         """
@@ -72,25 +78,46 @@ class radius(object):
         @rtype: boolean
         @return: Whether the given node should be included in the search process. 
         """
+        if (parent is None):
+            cost = 0
+        else:
+            cost = self.cost_to_root(parent) + self.graph.edge_weight((parent, node))
         
-        def cost_to_root(node):
-            if (node is not None):
-                return cost_to_parent(node, st[node]) + cost_to_root(st[node])
-            else:
-                return 0
+        if (cost <= self.radius):
+            self.cost[node] = cost
+            return True
+        else:
+            return False
+    
+    def cost_to_root(self, node):
+        """
+        Return the distance from the root to a node of the spanning tree.
         
-        def cost_to_parent(node, parent):
-            if (parent is not None):
-                return gr.edge_weight((parent, node))
-            else:
-                return 0
+        Nodes accepted by the filter are answered at once. Others, added to the spanning tree by
+        other means, are measured along the tree up to the first known node and then remembered.
         
-        gr = self.graph
-        st = self.spanning_tree
+        @type  node: node
+        @param node: Node of the spanning tree.
         
-        cost =  cost_to_parent(node, parent) + cost_to_root(parent)
+        @rtype:  number
+        @return: Sum of the weights of the edges from the root to the given node.
+        """
+        cost = self.cost
+        if (node in cost):
+            return cost[node]
         
-        if (cost <= self.radius):
-            return True
+        # Climb the spanning tree up to a node of known cost, then come back down
+        st = self.spanning_tree
+        path = []
+        while (node is not None and node not in cost):
+            path.append(node)
+            node = st[node]
+        if (node is None):
+            total = 0
         else:
-            return False
\ No newline at end of file
+            total = cost[node]
+        for each in reversed(path):
+            if (st[each] is not None):
+                total = total + self.graph.edge_weight((st[each], each))
+            cost[each] = total
+        return total
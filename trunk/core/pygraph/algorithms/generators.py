@@ -80,9 +80,8 @@ def generate(num_nodes, num_edges, directed=False, weight_range=(1, 1)):
     # Add edges to the graph
     min_wt = min(weight_range)
     max_wt = max(weight_range)
-    for i in range(num_edges):
-        each = edges[i]
-        random_graph.add_edge((each[0], each[1]), wt = randint(min_wt, max_wt))
+    weights = [randint(min_wt, max_wt) for i in range(num_edges)]
+    random_graph.add_edges(edges[:num_edges], weights)
 
     return random_graph
 
@@ -67,16 +67,11 @@ class euclidean(object):
         @type  graph: graph
         @param graph: Graph. 
         """
+        positions = graph.node_attribute_column('position')
         for start in graph.nodes():
+            start_attr = positions[start]
             for end in graph.nodes():
-                for each in graph.node_attributes(start):
-                    if (each[0] == 'position'):
-                        start_attr = each[1]
-                        break
-                for each in graph.node_attributes(end):
-                    if (each[0] == 'position'):
-                        end_attr = each[1]
-                        break
+                end_attr = positions[end]
                 dist = 0
                 for i in range(len(start_attr)):
                     dist = dist + (float(start_attr[i]) - float(end_attr[i]))**2
@@ -35,11 +35,11 @@ Minimization and maximization algorithms.
 shortest_path_bellman_ford
 """
 
+from itertools import count
 from pygraph.algorithms.utils import heappush, heappop
 from pygraph.classes.exceptions import NodeUnreachable
 from pygraph.classes.exceptions import NegativeWeightCycleError
 from pygraph.classes.digraph import digraph
-import bisect
 
 # Minimal spanning tree
 
@@ -132,11 +132,15 @@ def _lightest_edge(graph, visited):
 
 # Shortest Path
 
-def shortest_path(graph, source):
+def shortest_path(graph, source, target=None, targets=None, max_distance=None):
     """
     Return the shortest path distance between source and all other nodes using Dijkstra's
     algorithm.
     
+    The search can be stopped early: when C{target} or C{targets} are given, it ends as soon as
+    every requested node has been settled; when C{max_distance} is given, nodes farther than this
+    from the source are not settled.
+    
     @attention: All weights must be nonnegative.
     
     @see: shortest_path_bellman_ford
@@ -146,42 +150,132 @@ def shortest_path(graph, source):
 
     @type  source: node
     @param source: Node from which to start the search.
+    
+    @type  target: node
+    @param target: Optional node at which the search should stop.
+    
+    @type  targets: list
+    @param targets: Optional list of nodes. The search stops once all of them are settled.
+    
+    @type  max_distance: number
+    @param max_distance: Optional limit on the distance of the settled nodes.
 
     @rtype:  tuple
     @return: A tuple containing two dictionaries, each keyed by target nodes.
         1. Shortest path spanning tree
         2. Shortest distance from given source to each target node
-    Inaccessible target nodes do not appear in either dictionary.
+    Inaccessible target nodes do not appear in either dictionary. When the search is stopped
+    early, only the nodes settled so far appear.
     """
-    # Initialization
-    dist     = {source: 0}
-    previous = {source: None}
-
-    # This is a sorted queue of (dist, node) 2-tuples. The first item in the
-    # queue is always either a finalized node that we can ignore or the node
-    # with the smallest estimated distance from the source. Note that we will
-    # not remove nodes from this list as they are finalized; we just ignore them
-    # when they come up.
-    q = [(0, source)]
+    # Nodes we still need to settle before stopping early
+    pending = None
+    if (target is not None or targets is not None):
+        pending = set()
+        if (target is not None):
+            pending.add(target)
+        if (targets is not None):
+            pending.update(targets)
+    
+    if (getattr(graph, 'interning', False)):
+        return _interned_shortest_path(graph, source, pending, max_distance)
 
-    # The set of nodes for which we have final distances.
-    finished = set()
+    # Final distances and spanning tree, filled as nodes are settled
+    dist     = {}
+    previous = {}
+    
+    # Tentative distances and parents of the nodes discovered so far
+    estimate = {source: 0}
+    parent   = {source: None}
+
+    # This is a binary heap of (dist, sequence, node) 3-tuples. The first item in the heap is always
+    # either a settled node that we can ignore or the node with the smallest estimated distance
+    # from the source. Nodes at the same distance come up in the order they were pushed, so nodes
+    # are never compared. Note that we will not remove outdated entries from the heap when a
+    # shorter path is found; we just ignore them when they come up.
+    seq = count()
+    q = [(0, next(seq), source)]
 
     # Algorithm loop
-    while len(q) > 0:
-        du, u = q.pop(0)
+    while q:
+        du, _, u = heappop(q)
+        
+        if u in dist:
+            continue
+        if (max_distance is not None and du > max_distance):
+            break
+        
+        dist[u] = du
+        previous[u] = parent[u]
+        
+        if (pending is not None):
+            pending.discard(u)
+            if (not pending):
+                break
 
         # Process reachable, remaining nodes from u
-        if u not in finished:
-            finished.add(u)
-            for v in graph[u]:
-                if v not in finished:
-                    alt = du + graph.edge_weight((u, v))
-                    if (v not in dist) or (alt < dist[v]):
-                        dist[v] = alt
-                        previous[v] = u
-                        bisect.insort(q, (alt, v))
+        for v in graph[u]:
+            if v not in dist:
+                alt = du + graph.edge_weight((u, v))
+                if (v not in estimate) or (alt < estimate[v]):
+                    estimate[v] = alt
+                    parent[v] = u
+                    heappush(q, (alt, next(seq), v))
+
+    return previous, dist
 
+
+
+def _interned_shortest_path(graph, source, pending, max_distance):
+    """
+    Dijkstra's algorithm on the integer node ids of a graph with interning enabled.
+    
+    Arguments and result are the same as in C{shortest_path()}, except that the nodes to settle
+    before stopping early, if any, are given as a set.
+    """
+    nodes, ids, rows = graph.interned()
+    weights = graph.interned_weights()
+    if (pending is not None):
+        # Nodes not in the graph are never settled, so they get an id no node has
+        pending = set(ids.get(each, -1) for each in pending)
+    
+    dist     = {}
+    previous = {}
+    settled  = bytearray(len(nodes))
+    estimate = [None] * len(nodes)
+    parent   = [None] * len(nodes)
+    
+    s = ids[source]
+    estimate[s] = 0
+    seq = count()
+    q = [(0, next(seq), s)]
+    
+    # Algorithm loop, as in shortest_path(), breaking ties in the same way
+    while q:
+        du, _, u = heappop(q)
+        
+        if settled[u]:
+            continue
+        if (max_distance is not None and du > max_distance):
+            break
+        
+        settled[u] = 1
+        node = nodes[u]
+        dist[node] = du
+        previous[node] = parent[u]
+        
+        if (pending is not None):
+            pending.discard(u)
+            if (not pending):
+                break
+        
+        for v, wt in zip(rows[u], weights[u]):
+            if not settled[v]:
+                alt = du + wt
+                if (estimate[v] is None or alt < estimate[v]):
+                    estimate[v] = alt
+                    parent[v] = node
+                    heappush(q, (alt, next(seq), v))
+    
     return previous, dist
 
 
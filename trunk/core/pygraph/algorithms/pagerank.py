@@ -64,7 +64,7 @@ def pagerank(graph, damping_factor=0.85, max_iterations=100, min_delta=0.00001):
         for node in nodes:
             rank = min_value
             for referring_page in graph.incidents(node):
-                rank += damping_factor * pagerank[referring_page] / len(graph.neighbors(referring_page))
+                rank += damping_factor * pagerank[referring_page] / graph.node_order(referring_page)
                 
             diff += abs(pagerank[node] - rank)
             pagerank[node] = rank
@@ -25,13 +25,16 @@
 """
 Search algorithms.
 
-@sort: breadth_first_search, depth_first_search
+@sort: breadth_first_search, depth_first_search, weighted_search
 """
 
 
 # Imports
+from collections import deque
+from itertools import count
+from pygraph.algorithms.utils import heappush, heappop
 from pygraph.algorithms.filters.null import null
-from sys import getrecursionlimit, setrecursionlimit
+from pygraph.algorithms.walk import depth_first_walk, PRE
 
 
 # Depth-first search
@@ -46,59 +49,41 @@ def depth_first_search(graph, root=None, filter=null()):
     @type  root: node
     @param root: Optional root node (will explore only root's connected component)
 
+    @type  filter: search filter
+    @param filter: Optional search filter. If it has a C{done} attribute and this is true after a
+    call, the search stops at once. The nodes being explored are then added to the postordering.
+
     @rtype:  tuple
     @return: A tupple containing a dictionary and two lists:
         1. Generated spanning tree
         2. Graph's preordering
         3. Graph's postordering
     """
-    
-    recursionlimit = getrecursionlimit()
-    setrecursionlimit(max(len(graph.nodes())*2,recursionlimit))
 
-    def dfs(node):
-        """
-        Depth-first search subfunction.
-        """
-        visited[node] = 1
-        pre.append(node)
-        # Explore recursively the connected component
-        for each in graph[node]:
-            if (each not in visited and filter(each, node)):
-                spanning_tree[each] = node
-                dfs(each)
-        post.append(node)
-
-    visited = {}            # List for marking visited and non-visited nodes
     spanning_tree = {}      # Spanning tree
     pre = []                # Graph's preordering
     post = []               # Graph's postordering
     filter.configure(graph, spanning_tree)
 
-    # DFS from one node only
+    # DFS from one node only, or from every node not yet visited
     if (root is not None):
-        if filter(root, None):
-            spanning_tree[root] = None
-            dfs(root)
-        setrecursionlimit(recursionlimit)
-        return spanning_tree, pre, post
-    
-    # Algorithm loop
-    for each in graph:
-        # Select a non-visited node
-        if (each not in visited and filter(each, None)):
-            spanning_tree[each] = None
-            # Explore node's connected component
-            dfs(each)
-
-    setrecursionlimit(recursionlimit)
+        roots = [root]
+    else:
+        roots = graph
+    
+    for event, node, parent in depth_first_walk(graph, roots, filter):
+        if (event == PRE):
+            spanning_tree[node] = parent
+            pre.append(node)
+        else:
+            post.append(node)
     
     return (spanning_tree, pre, post)
 
 
 # Breadth-first search
 
-def breadth_first_search(graph, root=None, filter=null()):
+def breadth_first_search(graph, root=None, filter=null(), roots=None, levels=False):
     """
     Breadth-first search.
 
@@ -108,46 +93,240 @@ def breadth_first_search(graph, root=None, filter=null()):
     @type  root: node
     @param root: Optional root node (will explore only root's connected component)
 
+    @type  filter: search filter
+    @param filter: Optional search filter. If it has a C{done} attribute and this is true after a
+    call, the search stops at once.
+
+    @type  roots: list
+    @param roots: Optional list of root nodes, all searched at once (will explore only their
+    connected components). Each node is then reached from its nearest root. Giving both C{root}
+    and C{roots} searches from all of them.
+
+    @type  levels: boolean
+    @param levels: Whether to return the level of each node as well.
+
     @rtype:  tuple
-    @return: A tuple containing a dictionary and a list.
+    @return: A tuple containing a dictionary and a list, followed by another dictionary when
+    levels are requested:
         1. Generated spanning tree
         2. Graph's level-based ordering
+        3. Level of each node, that is, its distance in edges to the root it was reached from
     """
+    if (root is not None):
+        roots = [root] + list(roots or [])
+    if (getattr(graph, 'interning', False)):
+        return _interned_breadth_first_search(graph, roots, filter, levels)
+
+    def enqueue(node):
+        """
+        Enqueue a root node, if it was not visited yet and the filter accepts it.
+        """
+        if (node not in spanning_tree and filter(node, None)):
+            queue.append(node)
+            ordering.append(node)
+            spanning_tree[node] = None
+            level[node] = 0
 
     def bfs():
         """
         Breadth-first search subfunction.
         """
-        while (queue != []):
-            node = queue.pop(0)
+        while (queue and not (stoppable and filter.done)):
+            node = queue.popleft()
             
             for other in graph[node]:
-                if (other not in spanning_tree and filter(other, node)):
-                    queue.append(other)
-                    ordering.append(other)
-                    spanning_tree[other] = node
+                if (other not in spanning_tree):
+                    if (filter(other, node)):
+                        queue.append(other)
+                        ordering.append(other)
+                        spanning_tree[other] = node
+                        if (levels):
+                            level[other] = level[node] + 1
+                    if (stoppable and filter.done):
+                        return
     
-    queue = []            # Visiting queue
+    queue = deque()       # Visiting queue
     spanning_tree = {}    # Spanning tree
     ordering = []
+    level = {}
     filter.configure(graph, spanning_tree)
+    stoppable = hasattr(filter, 'done')
     
-    # BFS from one node only
-    if (root is not None):
-        if filter(root, None):
-            queue.append(root)
-            ordering.append(root)
-            spanning_tree[root] = None
+    # BFS from the given roots only
+    if (roots is not None):
+        for each in roots:
+            enqueue(each)
+            if (stoppable and filter.done):
+                break
+        bfs()
+    
+    # Algorithm
+    else:
+        for each in graph:
+            enqueue(each)
             bfs()
-        return spanning_tree, ordering
+            if (stoppable and filter.done):
+                break
+
+    if (levels):
+        return spanning_tree, ordering, level
+    return spanning_tree, ordering
+
 
+def _interned_breadth_first_search(graph, roots, filter, levels):
+    """
+    Breadth-first search on the integer node ids of a graph with interning enabled.
+    
+    Arguments and result are the same as in C{breadth_first_search()}, with C{root} already merged
+    into C{roots}.
+    """
+    nodes, ids, rows = graph.interned()
+    visited = bytearray(len(nodes))
+    depth = [0] * len(nodes)
+    queue = deque()       # Visiting queue
+    spanning_tree = {}    # Spanning tree
+    ordering = []
+    filter.configure(graph, spanning_tree)
+    stoppable = hasattr(filter, 'done')
+    
+    def enqueue(i):
+        """
+        Enqueue a root node, if it was not visited yet and the filter accepts it.
+        """
+        if (not visited[i] and filter(nodes[i], None)):
+            visited[i] = 1
+            queue.append(i)
+            ordering.append(nodes[i])
+            spanning_tree[nodes[i]] = None
+    
+    def bfs():
+        """
+        Breadth-first search subfunction.
+        """
+        while (queue and not (stoppable and filter.done)):
+            i = queue.popleft()
+            node = nodes[i]
+            for j in rows[i]:
+                if (not visited[j]):
+                    if (filter(nodes[j], node)):
+                        visited[j] = 1
+                        queue.append(j)
+                        ordering.append(nodes[j])
+                        spanning_tree[nodes[j]] = node
+                        depth[j] = depth[i] + 1
+                    if (stoppable and filter.done):
+                        return
+    
+    # BFS from the given roots only
+    if (roots is not None):
+        for each in roots:
+            enqueue(ids[each])
+            if (stoppable and filter.done):
+                break
+        bfs()
+    
     # Algorithm
-    for each in graph:
-        if (each not in spanning_tree):
-            if filter(each, None):
-                queue.append(each)
-                ordering.append(each)
-                spanning_tree[each] = None
-                bfs()
+    else:
+        for i in range(len(nodes)):
+            enqueue(i)
+            bfs()
+            if (stoppable and filter.done):
+                break
+    
+    if (levels):
+        return spanning_tree, ordering, dict((node, depth[ids[node]]) for node in ordering)
+    return spanning_tree, ordering
+
+
+# Weighted search
+
+def weighted_search(graph, root=None, filter=null(), roots=None, distances=False):
+    """
+    Weighted search.
+    
+    Nodes are visited in order of their distance from the roots, the distance of a node being the
+    sum of the edge weights along its path in the spanning tree, so the spanning tree is a shortest
+    path tree. Each node is passed to the filter when it is about to be visited, together with the
+    parent it is then reached from. Used with the radius filter, this visits every node within the
+    radius from the nearest of the roots, closest first.
+    
+    @attention: All weights must be nonnegative.
+
+    @type  graph: graph, digraph
+    @param graph: Graph.
+
+    @type  root: node
+    @param root: Optional root node (will explore only root's connected component)
 
+    @type  filter: search filter
+    @param filter: Optional search filter. If it has a C{done} attribute and this is true after a
+    call, the search stops at once.
+
+    @type  roots: list
+    @param roots: Optional list of root nodes, all searched at once (will explore only their
+    connected components). Giving both C{root} and C{roots} searches from all of them.
+
+    @type  distances: boolean
+    @param distances: Whether to return the distance of each node as well.
+
+    @rtype:  tuple
+    @return: A tuple containing a dictionary and a list, followed by another dictionary when
+    distances are requested:
+        1. Generated spanning tree
+        2. Graph's distance-based ordering
+        3. Distance of each node to the root it was reached from
+    """
+    if (root is not None):
+        roots = [root] + list(roots or [])
+
+    def search():
+        """
+        Weighted search subfunction.
+        """
+        while (heap):
+            du, _, node, parent = heappop(heap)
+            if (node in spanning_tree):
+                continue
+            if (not filter(node, parent)):
+                if (stoppable and filter.done):
+                    return
+                continue
+            
+            spanning_tree[node] = parent
+            ordering.append(node)
+            distance[node] = du
+            if (stoppable and filter.done):
+                return
+            
+            for other in graph[node]:
+                if (other not in spanning_tree):
+                    heappush(heap, (du + graph.edge_weight((node, other)), next(seq), other, node))
+    
+    # This is a binary heap of (distance, sequence, node, parent) 4-tuples. The sequence number
+    # keeps nodes at the same distance in the order they were found, and nodes from being compared.
+    heap = []
+    seq = count()
+    spanning_tree = {}    # Spanning tree
+    ordering = []
+    distance = {}
+    filter.configure(graph, spanning_tree)
+    stoppable = hasattr(filter, 'done')
+    
+    # Search from the given roots only
+    if (roots is not None):
+        for each in roots:
+            heappush(heap, (0, next(seq), each, None))
+        search()
+    
+    # Algorithm
+    else:
+        for each in graph:
+            if (each not in spanning_tree):
+                heappush(heap, (0, next(seq), each, None))
+                search()
+            if (stoppable and filter.done):
+                break
+    
+    if (distances):
+        return spanning_tree, ordering, distance
     return spanning_tree, ordering
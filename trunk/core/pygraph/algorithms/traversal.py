@@ -29,11 +29,19 @@ Traversal algorithms.
 """
 
 
-# Minimal spanning tree
+# Imports
+from collections import deque
+from pygraph.algorithms.walk import depth_first_walk, PRE, POST
 
-def traversal(graph, node, order):
+
+# Traversal
+
+def traversal(graph, node, order='pre', edges=False):
     """
     Graph traversal iterator.
+    
+    The traversal keeps its own stack or queue instead of nesting generators, so each node costs
+    the same to yield however deep it is, and deep graphs do not hit the recursion limit.
 
     @type  graph: graph, digraph
     @param graph: Graph.
@@ -43,42 +51,63 @@ def traversal(graph, node, order):
     
     @type  order: string
     @param order: traversal ordering. Possible values are:
-        2. 'pre' - Preordering (default)
-        1. 'post' - Postordering
+        1. 'pre' - Preordering (default)
+        2. 'post' - Postordering
+        3. 'bfs' - Level-based ordering
+    
+    @type  edges: boolean
+    @param edges: Whether to yield C{(parent, node, depth)} tuples instead of nodes. The parent
+    of the starting node is None and its depth is 0.
     
     @rtype:  iterator
     @return: Traversal iterator.
     """
-    visited = {}
-    if (order == 'pre'):
-        pre = 1
-        post = 0
+    if (order == 'bfs'):
+        return _breadth_first_traversal(graph, node, edges)
+    elif (order == 'pre'):
+        return _depth_first_traversal(graph, node, PRE, edges)
     elif (order == 'post'):
-        pre = 0
-        post = 1
-    
-    for each in _dfs(graph, visited, node, pre, post):
-        yield each
+        return _depth_first_traversal(graph, node, POST, edges)
+    else:
+        raise ValueError("Unknown traversal order: %s" % order)
 
 
-def _dfs(graph, visited, node, pre, post):
+def _depth_first_traversal(graph, node, wanted, edges):
     """
-    Depth-first search subfunction for traversals.
-    
-    @type  graph: graph, digraph
-    @param graph: Graph.
+    Depth-first traversal iterator, yielding the nodes reported by the walk as C{wanted} events.
+    """
+    depth = -1      # Depth of the node last reached and not yet left
+    for event, each, parent in depth_first_walk(graph, [node]):
+        if (event == PRE):
+            depth = depth + 1
+        if (event == wanted):
+            if (edges):
+                yield (parent, each, depth)
+            else:
+                yield each
+        if (event == POST):
+            depth = depth - 1
 
-    @type  visited: dictionary
-    @param visited: List of nodes (visited nodes are marked non-zero).
 
-    @type  node: node
-    @param node: Node to be explored by DFS.
+def _breadth_first_traversal(graph, node, edges):
+    """
+    Breadth-first traversal iterator. Nodes are yielded as soon as they are reached.
     """
-    visited[node] = 1
-    if (pre): yield node
-    # Explore recursively the connected component
-    for each in graph[node]:
-        if (each not in visited):
-            for other in _dfs(graph, visited, each, pre, post):
-                yield other
-    if (post): yield node
+    neighbors = graph.neighbors
+    visited = set([node])
+    queue = deque([(node, 0)])
+    if (edges):
+        yield (None, node, 0)
+    else:
+        yield node
+    while (queue):
+        parent, depth = queue.popleft()
+        depth = depth + 1
+        for each in neighbors(parent):
+            if (each not in visited):
+                visited.add(each)
+                queue.append((each, depth))
+                if (edges):
+                    yield (parent, each, depth)
+                else:
+                    yield each
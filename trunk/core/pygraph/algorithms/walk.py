@@ -0,0 +1,124 @@
+# Copyright (c) 2012 Pedro Matiello <pmatiello@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+
+"""
+Graph walking kernel shared by the depth-first algorithms.
+
+The walk uses an explicit stack instead of recursion, so the depth of the graph is not limited
+by the interpreter's recursion limit. It reports what it does as C{(event, node, other)} triples,
+in the same order as a recursive depth-first search would:
+
+    - C{(PRE, node, parent)} when C{node} is reached, C{parent} being None for roots;
+    - C{(POST, node, parent)} when every node reachable from C{node} has been explored;
+    - C{(BACK, node, other)}, if requested, for each edge from C{node} to an C{other} node that
+    was already reached. In undirected graphs, this includes the edge back to the parent.
+
+    >>> from pygraph.algorithms.walk import depth_first_walk, PRE, POST
+    >>> for event, node, parent in depth_first_walk(gr, gr):
+    ...     if (event == PRE):
+    ...         print(node)
+
+@sort: depth_first_walk
+"""
+
+
+# Events
+PRE = 'pre'
+POST = 'post'
+BACK = 'back'
+
+
+def depth_first_walk(graph, roots, filter=None, back=False):
+    """
+    Walk a graph in depth-first order from the given roots.
+    
+    Roots already reached from previous roots are skipped. Stopping the iteration stops the walk.
+    
+    @type  graph: graph, digraph, hypergraph
+    @param graph: Graph, or any object whose items C{graph[node]} list the neighbors of each node,
+    like the rows returned by C{interned()}.
+    
+    @type  roots: iterable
+    @param roots: Nodes from which to walk, in order.
+    
+    @type  filter: search filter
+    @param filter: Optional search filter, called as C{filter(node, parent)} before a node is
+    reached. Nodes it rejects are not reached from that parent. If the filter has a C{done}
+    attribute and it is true after a call, the walk stops: no other node is reached, and the nodes
+    being explored are left at once, in order, with their C{POST} events.
+    
+    @type  back: boolean
+    @param back: Whether to report the edges to nodes already reached.
+    
+    @rtype:  iterator
+    @return: Iterator of C{(event, node, other)} triples.
+    """
+    # Graphs list the neighbors of a node faster through neighbors() than through graph[node]
+    neighbors = getattr(graph, 'neighbors', None)
+    if (neighbors is None):
+        neighbors = graph.__getitem__
+    
+    # Filters may ask the walk to stop by setting their done attribute
+    stoppable = hasattr(filter, 'done')
+    
+    visited = set()
+    for root in roots:
+        if (root in visited):
+            continue
+        if (filter is not None and not filter(root, None)):
+            if (stoppable and filter.done):
+                return
+            continue
+        visited.add(root)
+        yield (PRE, root, None)
+        path = [root]                   # Nodes being explored, from the root
+        stack = [iter(neighbors(root))] # Neighbors still to be tried, for each node in the path
+        if (stoppable and filter.done):
+            stack = [()]
+        while (stack):
+            node = path[-1]
+            for each in stack[-1]:
+                if (each in visited):
+                    if (back):
+                        yield (BACK, node, each)
+                elif (filter is None or filter(each, node)):
+                    visited.add(each)
+                    yield (PRE, each, node)
+                    path.append(each)
+                    stack.append(iter(neighbors(each)))
+                    if (stoppable and filter.done):
+                        stack = [()] * len(stack)
+                    break
+                elif (stoppable and filter.done):
+                    stack = [()] * len(stack)
+                    break
+            else:
+                stack.pop()
+                path.pop()
+                if (path):
+                    yield (POST, node, path[-1])
+                else:
+                    yield (POST, node, None)
+        if (stoppable and filter.done):
+            return
@@ -0,0 +1,515 @@
+# Copyright (c) 2012 Pedro Matiello <pmatiello@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+
+"""
+Frozen graph class
+"""
+
+
+# Imports
+from pygraph.mixins.common import common
+from pygraph.mixins.basegraph import basegraph
+from pygraph.mixins.labeling import _labeling_eq, _packed_numbers
+from array import array
+from bisect import bisect_left
+
+
+class frozengraph(basegraph, common):
+    """
+    Frozen graph class.
+    
+    Frozen graphs are read-only snapshots of graphs and digraphs stored in compressed-sparse-row
+    form: nodes are numbered from 0 to n-1 and the neighbors of the node numbered i are the
+    entries C{targets[offsets[i]:offsets[i+1]]}, in the same order as in the graph. The weight of
+    each of these edges is kept at the same position in C{weights}. Edges are looked up in
+    C{sorted_targets}, which holds the same rows sorted by node id, and C{sorted_positions}, which
+    gives the position in C{targets} of each of its entries. Digraphs also keep the incidence rows
+    in C{in_offsets} and C{in_sources}.
+    
+    Frozen graphs are obtained through the C{freeze()} method of graphs and digraphs and can be
+    given to the functions in C{pygraph.algorithms} in their place. As their nodes are already
+    numbered, interning is enabled.
+
+    @sort:  __eq__, __getstate__, __init__, __ne__, edge_attributes, edge_label, edge_weight,
+    edges, has_edge, has_node, incidents, interned, interned_weights, inverse, neighbor_ids,
+    neighbors, node_attribute_column, node_attributes, node_id, node_order, nodes,
+    nodes_with_attribute, order, reverse, thaw
+    """
+    
+    interning = True
+    
+    def __init__(self, graph):
+        """
+        Initialize a frozen graph from the given graph.
+        
+        @type  graph: graph, digraph
+        @param graph: Graph.
+        """
+        self.DIRECTED = graph.DIRECTED
+        self.source_class = graph.__class__
+        
+        self.node_table = graph.nodes()         # Pairing: Node id -> Node
+        self.node_index = dict((node, i) for i, node in enumerate(self.node_table))
+        self.node_attr = {}                     # Pairing: Node id -> Attributes
+        self.edge_labels = {}                   # Pairing: Edge position -> Label
+        self.edge_attr = {}                     # Pairing: Edge position -> Attributes
+        
+        offsets = array('l', [0])
+        targets = array('l')
+        weights = []
+        
+        for i, node in enumerate(self.node_table):
+            attrs = graph.node_attributes(node)
+            if (attrs):
+                self.node_attr[i] = tuple(attrs)
+            row = [self.node_index[each] for each in graph.neighbors(node)]
+            for j in row:
+                edge = (node, self.node_table[j])
+                label = graph.edge_label(edge)
+                if (label != graph.DEFAULT_LABEL):
+                    self.edge_labels[len(targets)] = label
+                attrs = graph.edge_attributes(edge)
+                if (attrs):
+                    self.edge_attr[len(targets)] = tuple(attrs)
+                weights.append(graph.edge_weight(edge))
+                targets.append(j)
+            offsets.append(len(targets))
+        
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = _packed(weights)
+        self.sorted_targets, self.sorted_positions = _sorted_rows(offsets, targets)
+        
+        if (self.DIRECTED):
+            self.in_offsets = array('l', [0])
+            self.in_sources = array('l')
+            for node in self.node_table:
+                self.in_sources.extend(self.node_index[each] for each in graph.incidents(node))
+                self.in_offsets.append(len(self.in_sources))
+    
+    
+    def nodes(self):
+        """
+        Return node list.
+
+        @rtype:  list
+        @return: Node list.
+        """
+        return list(self.node_table)
+    
+    
+    def order(self):
+        """
+        Return the order of self, this is defined as the number of nodes in the graph.
+
+        @rtype:  number
+        @return: Size of the graph.
+        """
+        return len(self.node_table)
+    
+    
+    def node_id(self, node):
+        """
+        Return the integer identifier of the given node in this snapshot.
+        
+        @type  node: node
+        @param node: Node identifier.
+        
+        @rtype:  number
+        @return: Integer node id.
+        """
+        return self.node_index[node]
+    
+    
+    def interned(self):
+        """
+        Return the graph with its nodes numbered from 0 to n-1, as in C{node_id()}.
+        
+        @rtype:  tuple
+        @return: A tuple containing two lists and a dictionary:
+            1. Node table, listing the node of each id
+            2. Node index, pairing each node with its id
+            3. Rows listing the ids of the neighbors of each node
+        """
+        if (self._interned is None):
+            offsets = self.offsets
+            rows = [self.targets[offsets[i]:offsets[i+1]] for i in range(len(self.node_table))]
+            self._interned = (self.version, self.node_table, self.node_index, rows)
+        return self._interned[1:]
+    
+    
+    def interned_weights(self):
+        """
+        Return the weights of the edges listed by C{interned()}.
+        
+        @rtype:  list
+        @return: Rows listing the weights of the edges from each node to its neighbors, in the
+        same order as the rows of neighbor ids.
+        """
+        if (self._interned_weights is None):
+            offsets = self.offsets
+            rows = [self.weights[offsets[i]:offsets[i+1]] for i in range(len(self.node_table))]
+            self._interned_weights = (self.version, rows)
+        return self._interned_weights[1]
+    
+    
+    def neighbor_ids(self, i):
+        """
+        Return the integer ids of the nodes directly accessible from the node with the given id.
+        
+        @type  i: number
+        @param i: Integer node id.
+        
+        @rtype:  array
+        @return: Integer ids of the neighbors, in the same order as in the graph.
+        """
+        return self.targets[self.offsets[i]:self.offsets[i+1]]
+    
+    
+    def neighbors(self, node):
+        """
+        Return all nodes that are directly accessible from given node.
+
+        @type  node: node
+        @param node: Node identifier
+
+        @rtype:  list
+        @return: List of nodes directly accessible from given node.
+        """
+        i = self.node_index[node]
+        table = self.node_table
+        return [table[j] for j in self.targets[self.offsets[i]:self.offsets[i+1]]]
+    
+    
+    def incidents(self, node):
+        """
+        Return all nodes that are incident to the given node.
+        
+        @type  node: node
+        @param node: Node identifier
+
+        @rtype:  list
+        @return: List of nodes directly accessible from given node.    
+        """
+        if (not self.DIRECTED):
+            return self.neighbors(node)
+        i = self.node_index[node]
+        table = self.node_table
+        return [table[j] for j in self.in_sources[self.in_offsets[i]:self.in_offsets[i+1]]]
+    
+    
+    def edges(self):
+        """
+        Return all edges in the graph.
+        
+        @rtype:  list
+        @return: List of all edges in the graph.
+        """
+        table = self.node_table
+        offsets = self.offsets
+        targets = self.targets
+        return [ (table[i], table[targets[k]])
+                 for i in range(len(table)) for k in range(offsets[i], offsets[i+1]) ]
+    
+    
+    def has_node(self, node):
+        """
+        Return whether the requested node exists.
+
+        @type  node: node
+        @param node: Node identifier
+
+        @rtype:  boolean
+        @return: Truth-value for node existence.
+        """
+        return node in self.node_index
+    
+    
+    def has_edge(self, edge):
+        """
+        Return whether an edge exists.
+
+        @type  edge: tuple
+        @param edge: Edge.
+
+        @rtype:  boolean
+        @return: Truth-value for edge existence.
+        """
+        return self._position(edge) is not None
+    
+    
+    def node_order(self, node):
+        """
+        Return the order of the given node.
+        
+        @rtype:  number
+        @return: Order of the given node.
+        """
+        i = self.node_index[node]
+        return self.offsets[i+1] - self.offsets[i]
+    
+    
+    def edge_weight(self, edge):
+        """
+        Get the weight of an edge.
+
+        @type  edge: edge
+        @param edge: One edge.
+        
+        @rtype:  number
+        @return: Edge weight.
+        """
+        k = self._position(edge)
+        if (k is None):
+            return self.source_class.DEFAULT_WEIGHT
+        return self.weights[k]
+    
+    
+    def edge_label(self, edge):
+        """
+        Get the label of an edge.
+
+        @type  edge: edge
+        @param edge: One edge.
+        
+        @rtype:  string
+        @return: Edge label
+        """
+        return self.edge_labels.get(self._position(edge), self.source_class.DEFAULT_LABEL)
+    
+    
+    def edge_attributes(self, edge):
+        """
+        Return the attributes of the given edge.
+
+        @type  edge: edge
+        @param edge: One edge.
+
+        @rtype:  list
+        @return: List of attributes specified tuples in the form (attribute, value).
+        """
+        return list(self.edge_attr.get(self._position(edge), ()))
+    
+    
+    def node_attributes(self, node):
+        """
+        Return the attributes of the given node.
+
+        @type  node: node
+        @param node: Node identifier
+
+        @rtype:  list
+        @return: List of attributes specified tuples in the form (attribute, value).
+        """
+        return list(self.node_attr.get(self.node_index[node], ()))
+
+
+    def node_attribute_column(self, name):
+        """
+        Return the value of the given attribute for every node that has it.
+        
+        When a node has the same attribute more than once, the first value is used.
+
+        @type  name: string
+        @param name: Attribute name.
+
+        @rtype:  dictionary
+        @return: Pairing that associates each node having the attribute to its value.
+        """
+        column = {}
+        for i, attrs in self.node_attr.items():
+            for each, value in attrs:
+                if (each == name):
+                    column[self.node_table[i]] = value
+                    break
+        return column
+
+
+    def nodes_with_attribute(self, name, value):
+        """
+        Return the nodes whose given attribute has the given value.
+
+        @type  name: string
+        @param name: Attribute name.
+
+        @type  value: object
+        @param value: Attribute value.
+
+        @rtype:  list
+        @return: List of nodes.
+        """
+        return [ node for node, each in self.node_attribute_column(name).items() if each == value ]
+    
+    
+    def thaw(self):
+        """
+        Return a mutable copy of this snapshot.
+        
+        @rtype:  graph, digraph
+        @return: Graph of the same class as the one this snapshot was taken from.
+        """
+        gr = self.source_class()
+        gr.merge(self)
+        return gr
+    
+    
+    def inverse(self):
+        """
+        Return the inverse of the graph.
+        
+        @rtype:  frozengraph
+        @return: Complement graph for the graph.
+        """
+        return self.thaw().inverse().freeze()
+    
+    
+    def reverse(self):
+        """
+        Generate the reverse of a directed graph.
+        
+        @rtype:  frozengraph
+        @return: The directed graph that should be reversed.
+        """
+        return self.thaw().reverse().freeze()
+    
+    
+    def _position(self, edge):
+        """
+        Return the position of the given edge in the C{targets} array.
+        
+        @type  edge: edge
+        @param edge: One edge.
+        
+        @rtype:  number
+        @return: Position of the edge or None if the edge does not exist.
+        """
+        u, v = edge
+        try:
+            i = self.node_index[u]
+            j = self.node_index[v]
+        except KeyError:
+            return None
+        hi = self.offsets[i+1]
+        k = bisect_left(self.sorted_targets, j, self.offsets[i], hi)
+        if (k < hi and self.sorted_targets[k] == j):
+            return self.sorted_positions[k]
+        return None
+    
+    
+    def _memory_tables(self):
+        """
+        Return the tables holding the contents of the frozen graph, grouped by component.
+        
+        @rtype:  list
+        @return: List of C{(component, tables)} pairs.
+        """
+        adjacency = [self.node_table, self.node_index, self.offsets, self.targets,
+                     self.sorted_targets, self.sorted_positions]
+        if (self.DIRECTED):
+            adjacency.extend([self.in_offsets, self.in_sources])
+        return [('adjacency', adjacency),
+                ('edge_properties', [self.weights, self.edge_labels]),
+                ('edge_attr', [self.edge_attr]),
+                ('node_attr', [self.node_attr])]
+    
+    def __getstate__(self):
+        """
+        Return the state of the frozen graph for pickling and copying.
+        
+        The fingerprint and the interned neighbor rows and weights are left out, as they are
+        rebuilt when needed and fingerprints may differ between processes.
+        
+        @rtype:  dictionary
+        @return: State of the frozen graph.
+        """
+        state = dict(self.__dict__)
+        for name in ['_fingerprint', '_interned', '_interned_weights']:
+            state.pop(name, None)
+        return state
+    
+    def __eq__(self, other):
+        """
+        Return whether this graph is equal to another one.
+        
+        @type other: graph, digraph, frozengraph
+        @param other: Other graph
+        
+        @rtype: boolean
+        @return: Whether this graph and the other are equal.
+        """
+        try:
+            return common.__eq__(self, other) and _labeling_eq(self, other)
+        except AttributeError:
+            return False
+    
+    
+    def __ne__(self, other):
+        """
+        Return whether this graph is not equal to another one.
+        
+        @type other: graph, digraph, frozengraph
+        @param other: Other graph
+        
+        @rtype: boolean
+        @return: Whether this graph and the other are different.
+        """
+        return not (self == other)
+
+
+def _packed(values):
+    """
+    Pack a list of numbers into the most compact array able to hold them.
+    
+    Values are packed only if they are all integers or all floats, so that they are read back with
+    their own types.
+    
+    @type  values: list
+    @param values: List of values.
+    
+    @rtype:  array, tuple
+    @return: Integer or float array, or a tuple for values of other or mixed types.
+    """
+    packed = _packed_numbers(values)
+    if (isinstance(packed, array)):
+        return packed
+    return tuple(values)
+
+
+def _sorted_rows(offsets, targets):
+    """
+    Sort each row of a compressed-sparse-row structure by column index, for lookups.
+    
+    @type  offsets: array
+    @param offsets: Row offsets.
+    
+    @type  targets: array
+    @param targets: Column indexes.
+    
+    @rtype:  tuple
+    @return: Column indexes sorted within each row, and the position in C{targets} of each of them.
+    """
+    positions = array('l')
+    for i in range(len(offsets) - 1):
+        positions.extend(sorted(range(offsets[i], offsets[i+1]), key=targets.__getitem__))
+    return array('l', [targets[k] for k in positions]), positions
@@ -0,0 +1,492 @@
+# Copyright (c) 2012 Pedro Matiello <pmatiello@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+
+"""
+Frozen hypergraph class
+"""
+
+
+# Imports
+from pygraph.mixins.common import common
+from pygraph.mixins.basegraph import basegraph
+from pygraph.mixins.labeling import _labeling_eq
+from pygraph.classes.frozengraph import _packed
+from pygraph.classes.graph import graph
+from array import array
+
+
+class frozenhypergraph(basegraph, common):
+    """
+    Frozen hypergraph class.
+    
+    Frozen hypergraphs are read-only snapshots of hypergraphs whose links are stored in
+    compressed-sparse-row form in both directions. Nodes are numbered from 0 to n-1 and hyperedges
+    from 0 to m-1. The hyperedges linked to the node numbered i are the entries
+    C{node_edges[node_offsets[i]:node_offsets[i+1]]} and the nodes linked to the hyperedge numbered
+    j are the entries C{edge_nodes[edge_offsets[j]:edge_offsets[j+1]]}.
+    
+    Frozen hypergraphs are obtained through the C{freeze()} method of hypergraphs.
+
+    @sort:  __eq__, __getstate__, __init__, __ne__, degrees, edge_attributes, edge_label,
+    edge_weight, edges, graph, has_edge, has_hyperedge, has_node, hyperedge_id, hyperedges, links,
+    neighbor_ids, neighbors, node_attributes, node_id, nodes, order, rank, sizes, thaw
+    """
+    
+    DIRECTED = True
+    _bipartite = None       # Ordinary graph, built when needed
+    
+    def __init__(self, hypergraph):
+        """
+        Initialize a frozen hypergraph from the given hypergraph.
+        
+        @type  hypergraph: hypergraph
+        @param hypergraph: Hypergraph.
+        """
+        self.source_class = hypergraph.__class__
+        
+        self.node_table = hypergraph.nodes()        # Pairing: Node id -> Node
+        self.node_index = dict((node, i) for i, node in enumerate(self.node_table))
+        self.edge_table = hypergraph.hyperedges()   # Pairing: Hyperedge id -> Hyperedge
+        self.edge_index = dict((edge, j) for j, edge in enumerate(self.edge_table))
+        self.node_attr = {}                         # Pairing: Node id -> Attributes
+        self.edge_labels = {}                       # Pairing: Hyperedge id -> Label
+        self.edge_attr = {}                         # Pairing: Hyperedge id -> Attributes
+        
+        self.node_offsets, self.node_edges = _rows(self.node_table, self.edge_index,
+                                                   hypergraph.node_links)
+        self.edge_offsets, self.edge_nodes = _rows(self.edge_table, self.node_index,
+                                                   hypergraph.edge_links)
+        
+        for i, node in enumerate(self.node_table):
+            attrs = hypergraph.node_attributes(node)
+            if (attrs):
+                self.node_attr[i] = tuple(attrs)
+        weights = []
+        for j, edge in enumerate(self.edge_table):
+            label = hypergraph.edge_label(edge)
+            if (label != hypergraph.DEFAULT_LABEL):
+                self.edge_labels[j] = label
+            attrs = hypergraph.edge_attributes(edge)
+            if (attrs):
+                self.edge_attr[j] = tuple(attrs)
+            weights.append(hypergraph.edge_weight(edge))
+        self.weights = _packed(weights)
+    
+    
+    @property
+    def graph(self):
+        """
+        Bipartite graph linking the nodes of the hypergraph, as C{(node, 'n')}, to its hyperedges,
+        as C{(hyperedge, 'h')}, as in hypergraphs.
+        
+        The graph is built when first requested and kept. It should not be modified.
+        
+        @rtype:  graph
+        @return: Bipartite graph equivalent to the hypergraph.
+        """
+        if (self._bipartite is None):
+            nodes = [(node, 'n') for node in self.node_table]
+            hyperedges = [(hyperedge, 'h') for hyperedge in self.edge_table]
+            edge_offsets = self.edge_offsets
+            edge_nodes = self.edge_nodes
+            bipartite = graph()
+            bipartite.add_nodes(nodes + hyperedges)
+            bipartite.add_edges((nodes[i], hyperedges[j]) for j in range(len(hyperedges))
+                                for i in edge_nodes[edge_offsets[j]:edge_offsets[j+1]])
+            self._bipartite = bipartite
+        return self._bipartite
+    
+    
+    def nodes(self):
+        """
+        Return node list.
+        
+        @rtype:  list
+        @return: Node list.
+        """
+        return list(self.node_table)
+    
+    
+    def hyperedges(self):
+        """
+        Return hyperedge list.
+
+        @rtype:  list
+        @return: List of hyperedges in the graph.
+        """
+        return list(self.edge_table)
+    
+    
+    def edges(self):
+        """
+        Return the hyperedge list.
+        
+        @rtype:  list
+        @return: List of hyperedges in the graph.
+        """
+        return self.hyperedges()
+    
+    
+    def order(self):
+        """
+        Return the order of self, this is defined as the number of nodes in the graph.
+
+        @rtype:  number
+        @return: Size of the graph.
+        """
+        return len(self.node_table)
+    
+    
+    def node_id(self, node):
+        """
+        Return the integer identifier of the given node in this snapshot.
+        
+        @type  node: node
+        @param node: Node identifier.
+        
+        @rtype:  number
+        @return: Integer node id.
+        """
+        return self.node_index[node]
+    
+    
+    def hyperedge_id(self, hyperedge):
+        """
+        Return the integer identifier of the given hyperedge in this snapshot.
+        
+        @type  hyperedge: hyperedge
+        @param hyperedge: Hyperedge identifier.
+        
+        @rtype:  number
+        @return: Integer hyperedge id.
+        """
+        return self.edge_index[hyperedge]
+    
+    
+    def has_node(self, node):
+        """
+        Return whether the requested node exists.
+
+        @type  node: node
+        @param node: Node identifier
+
+        @rtype:  boolean
+        @return: Truth-value for node existence.
+        """
+        return node in self.node_index
+    
+    
+    def has_hyperedge(self, hyperedge):
+        """
+        Return whether the requested hyperedge exists.
+
+        @type  hyperedge: hyperedge
+        @param hyperedge: Hyperedge identifier
+
+        @rtype:  boolean
+        @return: Truth-value for hyperedge existence.
+        """
+        return hyperedge in self.edge_index
+    
+    
+    def has_edge(self, hyperedge):
+        """
+        Return whether the requested hyperedge exists.
+
+        @type  hyperedge: hyperedge
+        @param hyperedge: Hyperedge identifier
+
+        @rtype:  boolean
+        @return: Truth-value for hyperedge existence.
+        """
+        return hyperedge in self.edge_index
+    
+    
+    def links(self, obj):
+        """
+        Return all nodes connected by the given hyperedge or all hyperedges
+        connected to the given hypernode.
+        
+        @type  obj: hyperedge
+        @param obj: Object identifier.
+        
+        @rtype:  list
+        @return: List of node objects linked to the given hyperedge.
+        """
+        if (obj in self.edge_index):
+            j = self.edge_index[obj]
+            table = self.node_table
+            return [table[i] for i in self.edge_nodes[self.edge_offsets[j]:self.edge_offsets[j+1]]]
+        i = self.node_index[obj]
+        table = self.edge_table
+        return [table[j] for j in self.node_edges[self.node_offsets[i]:self.node_offsets[i+1]]]
+    
+    
+    def neighbor_ids(self, i):
+        """
+        Return the integer ids of the nodes sharing a hyperedge with the node with the given id.
+        
+        @type  i: number
+        @param i: Integer node id.
+        
+        @rtype:  array
+        @return: Integer ids of the neighbors, in ascending order.
+        """
+        edge_offsets = self.edge_offsets
+        edge_nodes = self.edge_nodes
+        seen = set()
+        for j in self.node_edges[self.node_offsets[i]:self.node_offsets[i+1]]:
+            seen.update(edge_nodes[edge_offsets[j]:edge_offsets[j+1]])
+        seen.discard(i)
+        return array('l', sorted(seen))
+    
+    
+    def neighbors(self, obj):
+        """
+        Return all neighbors adjacent to the given node.
+        
+        @type  obj: node
+        @param obj: Object identifier.
+        
+        @rtype:  list
+        @return: List of all node objects adjacent to the given node.
+        """
+        table = self.node_table
+        return [table[i] for i in self.neighbor_ids(self.node_index[obj])]
+    
+    
+    def degrees(self):
+        """
+        Return the number of hyperedges linked to each node.
+        
+        @rtype:  array
+        @return: Degree of each node, indexed by node id.
+        """
+        offsets = self.node_offsets
+        return array('l', [offsets[i+1] - offsets[i] for i in range(len(offsets) - 1)])
+    
+    
+    def sizes(self):
+        """
+        Return the number of nodes linked to each hyperedge.
+        
+        @rtype:  array
+        @return: Size of each hyperedge, indexed by hyperedge id.
+        """
+        offsets = self.edge_offsets
+        return array('l', [offsets[j+1] - offsets[j] for j in range(len(offsets) - 1)])
+    
+    
+    def rank(self):
+        """
+        Return the rank of the given hypergraph.
+        
+        @rtype:  int
+        @return: Rank of graph.
+        """
+        return max(self.sizes() or [0])
+    
+    
+    def edge_weight(self, hyperedge):
+        """
+        Get the weight of a hyperedge.
+
+        @type  hyperedge: hyperedge
+        @param hyperedge: One hyperedge.
+        
+        @rtype:  number
+        @return: Hyperedge weight.
+        """
+        j = self.edge_index.get(hyperedge)
+        if (j is None):
+            return self.source_class.DEFAULT_WEIGHT
+        return self.weights[j]
+    
+    
+    def edge_label(self, hyperedge):
+        """
+        Get the label of a hyperedge.
+
+        @type  hyperedge: hyperedge
+        @param hyperedge: One hyperedge.
+        
+        @rtype:  string
+        @return: Hyperedge label
+        """
+        return self.edge_labels.get(self.edge_index.get(hyperedge), self.source_class.DEFAULT_LABEL)
+    
+    
+    def edge_attributes(self, hyperedge):
+        """
+        Return the attributes of the given hyperedge.
+
+        @type  hyperedge: hyperedge
+        @param hyperedge: One hyperedge.
+
+        @rtype:  list
+        @return: List of attributes specified tuples in the form (attribute, value).
+        """
+        return list(self.edge_attr.get(self.edge_index.get(hyperedge), ()))
+    
+    
+    def node_attributes(self, node):
+        """
+        Return the attributes of the given node.
+
+        @type  node: node
+        @param node: Node identifier
+
+        @rtype:  list
+        @return: List of attributes specified tuples in the form (attribute, value).
+        """
+        return list(self.node_attr.get(self.node_index[node], ()))
+    
+    
+    def thaw(self):
+        """
+        Return a mutable copy of this snapshot.
+        
+        @rtype:  hypergraph
+        @return: Hypergraph of the same class as the one this snapshot was taken from.
+        """
+        hgr = self.source_class()
+        hgr.add_nodes(self.node_table)
+        hgr.add_hyperedges(self.edge_table, [self.edge_weight(edge) for edge in self.edge_table],
+                           [self.edge_label(edge) for edge in self.edge_table])
+        for node in self.node_table:
+            for attr in self.node_attributes(node):
+                hgr.add_node_attribute(node, attr)
+        for edge in self.edge_table:
+            for node in self.links(edge):
+                hgr.link(node, edge)
+            hgr.add_edge_attributes(edge, self.edge_attributes(edge))
+        return hgr
+    
+    
+    def _fingerprint_terms(self):
+        """
+        Generate the hashable terms whose hashes are added up into the fingerprint.
+        
+        @rtype:  iterator
+        @return: Iterator of hashable terms.
+        """
+        for term in common._fingerprint_terms(self):
+            yield term
+        for edge in self.edge_table:
+            for node in self.links(edge):
+                yield ('link', node, edge)
+    
+    
+    def _memory_tables(self):
+        """
+        Return the tables holding the contents of the frozen hypergraph, grouped by component.
+        
+        The bipartite graph counts only once it is built.
+        
+        @rtype:  list
+        @return: List of C{(component, tables)} pairs.
+        """
+        bipartite = []
+        if (self._bipartite is not None):
+            for component, tables in self._bipartite._memory_tables():
+                bipartite.extend(tables)
+        return [('adjacency', [self.node_table, self.node_index, self.edge_table, self.edge_index,
+                               self.node_offsets, self.node_edges, self.edge_offsets,
+                               self.edge_nodes]),
+                ('edge_properties', [self.weights, self.edge_labels]),
+                ('edge_attr', [self.edge_attr]),
+                ('node_attr', [self.node_attr]),
+                ('graph', bipartite)]
+    
+    def __getstate__(self):
+        """
+        Return the state of the frozen hypergraph for pickling and copying.
+        
+        The bipartite graph, the fingerprint and the interned neighbor rows are left out, as they
+        are rebuilt when needed and fingerprints may differ between processes.
+        
+        @rtype:  dictionary
+        @return: State of the frozen hypergraph.
+        """
+        state = dict(self.__dict__)
+        for name in ['_bipartite', '_fingerprint', '_interned', '_interned_weights']:
+            state.pop(name, None)
+        return state
+    
+    def __eq__(self, other):
+        """
+        Return whether this hypergraph is equal to another one.
+        
+        @type other: hypergraph, frozenhypergraph
+        @param other: Other hypergraph
+        
+        @rtype: boolean
+        @return: Whether this hypergraph and the other are equal.
+        """
+        try:
+            if (not common.__eq__(self, other)):
+                return False
+            for edge in self.edge_table:
+                if (sorted(self.links(edge), key=repr) != sorted(other.links(edge), key=repr)):
+                    return False
+            return _labeling_eq(self, other)
+        except AttributeError:
+            return False
+    
+    
+    def __ne__(self, other):
+        """
+        Return whether this hypergraph is not equal to another one.
+        
+        @type other: hypergraph, frozenhypergraph
+        @param other: Other hypergraph
+        
+        @rtype: boolean
+        @return: Whether this hypergraph and the other are different.
+        """
+        return not (self == other)
+
+
+def _rows(table, index, links):
+    """
+    Build a compressed-sparse-row structure from lists of linked objects.
+    
+    @type  table: list
+    @param table: Objects in row order.
+    
+    @type  index: dictionary
+    @param index: Pairing: Linked object -> Column index.
+    
+    @type  links: dictionary
+    @param links: Pairing: Object -> List of linked objects.
+    
+    @rtype:  tuple
+    @return: Row offsets and column indexes, in ascending order within each row.
+    """
+    offsets = array('l', [0])
+    columns = array('l')
+    for obj in table:
+        columns.extend(sorted(index[each] for each in links[obj]))
+        offsets.append(len(columns))
+    return offsets, columns
@@ -0,0 +1,643 @@
+# Copyright (c) 2012 Pedro Matiello <pmatiello@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+
+"""
+Graph view classes
+"""
+
+
+# Imports
+from pygraph.mixins.common import common, ordered_dict
+from pygraph.mixins.basegraph import basegraph
+from pygraph.mixins.labeling import _labeling_eq
+
+
+class graphview(basegraph, common):
+    """
+    Base class for read-only views of graphs and digraphs.
+    
+    Views keep a reference to the graph they were created from and answer every query by looking
+    at it, so they cost nothing to build and always reflect the current state of that graph. Edge
+    and node labeling is read from the underlying graph.
+    
+    @sort:  __eq__, __init__, __ne__, copy, edge_attributes, edge_label, edge_weight, edges,
+    has_edge, has_node, incidents, inverse, neighbors, node_attribute_column, node_attributes,
+    node_order, nodes, nodes_with_attribute, reverse, version
+    """
+    
+    def __init__(self, graph):
+        """
+        Initialize a view of the given graph.
+        
+        @type  graph: graph, digraph
+        @param graph: Graph.
+        """
+        common.__init__(self)
+        self.graph = graph
+        self.DIRECTED = graph.DIRECTED
+        self.DEFAULT_WEIGHT = graph.DEFAULT_WEIGHT
+        self.DEFAULT_LABEL = graph.DEFAULT_LABEL
+    
+    
+    @property
+    def version(self):
+        """
+        Version of the underlying graph, as views change whenever it does.
+        
+        @rtype:  number
+        @return: Number of changes made to the underlying graph.
+        """
+        return self.graph.version
+    
+    
+    def edges(self):
+        """
+        Return all edges in the graph.
+        
+        @rtype:  list
+        @return: List of all edges in the graph.
+        """
+        return [ (u, v) for u in self.nodes() for v in self.neighbors(u) ]
+    
+    
+    def node_order(self, node):
+        """
+        Return the order of the given node.
+        
+        @rtype:  number
+        @return: Order of the given node.
+        """
+        return len(self.neighbors(node))
+    
+    
+    def edge_weight(self, edge):
+        """
+        Get the weight of an edge.
+
+        @type  edge: edge
+        @param edge: One edge.
+        
+        @rtype:  number
+        @return: Edge weight.
+        """
+        return self.graph.edge_weight(edge)
+    
+    
+    def edge_label(self, edge):
+        """
+        Get the label of an edge.
+
+        @type  edge: edge
+        @param edge: One edge.
+        
+        @rtype:  string
+        @return: Edge label
+        """
+        return self.graph.edge_label(edge)
+    
+    
+    def edge_attributes(self, edge):
+        """
+        Return the attributes of the given edge.
+
+        @type  edge: edge
+        @param edge: One edge.
+
+        @rtype:  list
+        @return: List of attributes specified tuples in the form (attribute, value).
+        """
+        return self.graph.edge_attributes(edge)
+    
+    
+    def node_attributes(self, node):
+        """
+        Return the attributes of the given node.
+
+        @type  node: node
+        @param node: Node identifier
+
+        @rtype:  list
+        @return: List of attributes specified tuples in the form (attribute, value).
+        """
+        return self.graph.node_attributes(node)
+    
+    
+    def node_attribute_column(self, name):
+        """
+        Return the value of the given attribute for every node of the view that has it.
+        
+        @type  name: string
+        @param name: Attribute name.
+
+        @rtype:  dictionary
+        @return: Pairing that associates each node having the attribute to its value.
+        """
+        column = self.graph.node_attribute_column(name)
+        return dict((node, value) for node, value in column.items() if self.has_node(node))
+    
+    
+    def nodes_with_attribute(self, name, value):
+        """
+        Return the nodes of the view whose given attribute has the given value.
+
+        @type  name: string
+        @param name: Attribute name.
+
+        @type  value: object
+        @param value: Attribute value.
+
+        @rtype:  list
+        @return: List of nodes.
+        """
+        return [ node for node in self.graph.nodes_with_attribute(name, value) if self.has_node(node) ]
+    
+    
+    def copy(self):
+        """
+        Return a mutable copy of this view.
+        
+        @rtype:  graph, digraph
+        @return: Graph of the same class as the one this view was created from.
+        """
+        gr = self.graph.__class__()
+        gr.merge(self)
+        return gr
+    
+    
+    def inverse(self):
+        """
+        Return the inverse of the graph.
+        
+        @rtype:  graph, digraph
+        @return: Complement graph for the graph.
+        """
+        return self.copy().inverse()
+    
+    
+    def reverse(self):
+        """
+        Generate the reverse of a directed graph.
+        
+        @rtype:  digraph
+        @return: The directed graph that should be reversed.
+        """
+        return self.copy().reverse()
+    
+    
+    def __eq__(self, other):
+        """
+        Return whether this graph is equal to another one.
+        
+        @type other: graph, digraph, frozengraph, graphview
+        @param other: Other graph
+        
+        @rtype: boolean
+        @return: Whether this graph and the other are equal.
+        """
+        try:
+            return common.__eq__(self, other) and _labeling_eq(self, other)
+        except AttributeError:
+            return False
+    
+    
+    def __ne__(self, other):
+        """
+        Return whether this graph is not equal to another one.
+        
+        @type other: graph, digraph, frozengraph, graphview
+        @param other: Other graph
+        
+        @rtype: boolean
+        @return: Whether this graph and the other are different.
+        """
+        return not (self == other)
+
+
+class subgraphview(graphview):
+    """
+    Read-only view of the subgraph induced by a set of nodes.
+    
+    The view contains the given nodes that exist in the underlying graph and every edge of the
+    underlying graph between two of them.
+    
+    @sort:  __init__, has_edge, has_node, incidents, neighbors, nodes, order
+    """
+    
+    def __init__(self, graph, nodes):
+        """
+        Initialize a view of the subgraph of the given graph induced by the given nodes.
+        
+        @type  graph: graph, digraph
+        @param graph: Graph.
+        
+        @type  nodes: iterable
+        @param nodes: Nodes of the subgraph.
+        """
+        graphview.__init__(self, graph)
+        self.node_set = ordered_dict()  # Nodes of the view (as an ordered dict)
+        for node in nodes:
+            if (graph.has_node(node)):
+                self.node_set[node] = None
+    
+    
+    def nodes(self):
+        """
+        Return node list.
+
+        @rtype:  list
+        @return: Node list.
+        """
+        return list(self.node_set)
+    
+    
+    def order(self):
+        """
+        Return the order of self, this is defined as the number of nodes in the graph.
+
+        @rtype:  number
+        @return: Size of the graph.
+        """
+        return len(self.node_set)
+    
+    
+    def neighbors(self, node):
+        """
+        Return all nodes that are directly accessible from given node.
+
+        @type  node: node
+        @param node: Node identifier
+
+        @rtype:  list
+        @return: List of nodes directly accessible from given node.
+        """
+        if (node not in self.node_set):
+            raise KeyError(node)
+        node_set = self.node_set
+        return [ each for each in self.graph.neighbors(node) if each in node_set ]
+    
+    
+    def incidents(self, node):
+        """
+        Return all nodes that are incident to the given node.
+        
+        @type  node: node
+        @param node: Node identifier
+
+        @rtype:  list
+        @return: List of nodes directly accessible from given node.    
+        """
+        if (node not in self.node_set):
+            raise KeyError(node)
+        node_set = self.node_set
+        if (not self.DIRECTED):
+            return [ each for each in self.graph.neighbors(node) if each in node_set ]
+        return [ each for each in self.graph.incidents(node) if each in node_set ]
+    
+    
+    def has_node(self, node):
+        """
+        Return whether the requested node exists.
+
+        @type  node: node
+        @param node: Node identifier
+
+        @rtype:  boolean
+        @return: Truth-value for node existence.
+        """
+        return node in self.node_set
+    
+    
+    def has_edge(self, edge):
+        """
+        Return whether an edge exists.
+
+        @type  edge: tuple
+        @param edge: Edge.
+
+        @rtype:  boolean
+        @return: Truth-value for edge existence.
+        """
+        u, v = edge
+        return u in self.node_set and v in self.node_set and self.graph.has_edge(edge)
+
+
+class reversedview(graphview):
+    """
+    Read-only view of a digraph with the direction of every edge reversed.
+    
+    Neighbors of a node in the view are its incidents in the underlying digraph and vice-versa.
+    The edge (u, v) of the view is the edge (v, u) of the underlying digraph and has its weight,
+    label and attributes.
+    
+    @sort:  __init__, edge_attributes, edge_label, edge_weight, has_edge, has_node, incidents,
+    neighbors, node_order, nodes, order
+    """
+    
+    def __init__(self, graph):
+        """
+        Initialize a reversed view of the given digraph.
+        
+        @type  graph: digraph
+        @param graph: Digraph.
+        """
+        graphview.__init__(self, graph)
+    
+    
+    def nodes(self):
+        """
+        Return node list.
+
+        @rtype:  list
+        @return: Node list.
+        """
+        return self.graph.nodes()
+    
+    
+    def order(self):
+        """
+        Return the order of self, this is defined as the number of nodes in the graph.
+
+        @rtype:  number
+        @return: Size of the graph.
+        """
+        return self.graph.order()
+    
+    
+    def neighbors(self, node):
+        """
+        Return all nodes that are directly accessible from given node.
+
+        @type  node: node
+        @param node: Node identifier
+
+        @rtype:  list
+        @return: List of nodes directly accessible from given node.
+        """
+        return self.graph.incidents(node)
+    
+    
+    def incidents(self, node):
+        """
+        Return all nodes that are incident to the given node.
+        
+        @type  node: node
+        @param node: Node identifier
+
+        @rtype:  list
+        @return: List of nodes directly accessible from given node.    
+        """
+        return self.graph.neighbors(node)
+    
+    
+    def node_order(self, node):
+        """
+        Return the order of the given node.
+        
+        @rtype:  number
+        @return: Order of the given node.
+        """
+        return len(self.graph.incidents(node))
+    
+    
+    def has_node(self, node):
+        """
+        Return whether the requested node exists.
+
+        @type  node: node
+        @param node: Node identifier
+
+        @rtype:  boolean
+        @return: Truth-value for node existence.
+        """
+        return self.graph.has_node(node)
+    
+    
+    def has_edge(self, edge):
+        """
+        Return whether an edge exists.
+
+        @type  edge: tuple
+        @param edge: Edge.
+
+        @rtype:  boolean
+        @return: Truth-value for edge existence.
+        """
+        u, v = edge
+        return self.graph.has_edge((v, u))
+    
+    
+    def edge_weight(self, edge):
+        """
+        Get the weight of an edge.
+
+        @type  edge: edge
+        @param edge: One edge.
+        
+        @rtype:  number
+        @return: Edge weight.
+        """
+        u, v = edge
+        return self.graph.edge_weight((v, u))
+    
+    
+    def edge_label(self, edge):
+        """
+        Get the label of an edge.
+
+        @type  edge: edge
+        @param edge: One edge.
+        
+        @rtype:  string
+        @return: Edge label
+        """
+        u, v = edge
+        return self.graph.edge_label((v, u))
+    
+    
+    def edge_attributes(self, edge):
+        """
+        Return the attributes of the given edge.
+
+        @type  edge: edge
+        @param edge: One edge.
+
+        @rtype:  list
+        @return: List of attributes specified tuples in the form (attribute, value).
+        """
+        u, v = edge
+        return self.graph.edge_attributes((v, u))
+
+
+class complementview(graphview):
+    """
+    Read-only view of the complement of a graph or digraph.
+    
+    The view has the nodes of the underlying graph and an edge between every two different nodes
+    that are not adjacent in it. Neighbors are computed when requested, so the complement of a
+    large sparse graph can be explored without being built. Edges of the view have the default
+    weight and label and no attributes.
+    
+    @sort:  __init__, edge_attributes, edge_label, edge_weight, has_edge, has_node, incidents,
+    neighbors, node_order, nodes, order
+    """
+    
+    def __init__(self, graph):
+        """
+        Initialize a view of the complement of the given graph.
+        
+        @type  graph: graph, digraph
+        @param graph: Graph.
+        """
+        graphview.__init__(self, graph)
+    
+    
+    def nodes(self):
+        """
+        Return node list.
+
+        @rtype:  list
+        @return: Node list.
+        """
+        return self.graph.nodes()
+    
+    
+    def order(self):
+        """
+        Return the order of self, this is defined as the number of nodes in the graph.
+
+        @rtype:  number
+        @return: Size of the graph.
+        """
+        return self.graph.order()
+    
+    
+    def neighbors(self, node):
+        """
+        Return all nodes that are directly accessible from given node.
+
+        @type  node: node
+        @param node: Node identifier
+
+        @rtype:  list
+        @return: List of nodes directly accessible from given node.
+        """
+        adjacent = set(self.graph.neighbors(node))
+        adjacent.add(node)
+        return [ each for each in self.graph.nodes() if each not in adjacent ]
+    
+    
+    def incidents(self, node):
+        """
+        Return all nodes that are incident to the given node.
+        
+        @type  node: node
+        @param node: Node identifier
+
+        @rtype:  list
+        @return: List of nodes directly accessible from given node.    
+        """
+        if (not self.DIRECTED):
+            return self.neighbors(node)
+        adjacent = set(self.graph.incidents(node))
+        adjacent.add(node)
+        return [ each for each in self.graph.nodes() if each not in adjacent ]
+    
+    
+    def node_order(self, node):
+        """
+        Return the order of the given node.
+        
+        @rtype:  number
+        @return: Order of the given node.
+        """
+        adjacent = set(self.graph.neighbors(node))
+        adjacent.discard(node)
+        return self.graph.order() - 1 - len(adjacent)
+    
+    
+    def has_node(self, node):
+        """
+        Return whether the requested node exists.
+
+        @type  node: node
+        @param node: Node identifier
+
+        @rtype:  boolean
+        @return: Truth-value for node existence.
+        """
+        return self.graph.has_node(node)
+    
+    
+    def has_edge(self, edge):
+        """
+        Return whether an edge exists.
+
+        @type  edge: tuple
+        @param edge: Edge.
+
+        @rtype:  boolean
+        @return: Truth-value for edge existence.
+        """
+        u, v = edge
+        return (u != v and self.graph.has_node(u) and self.graph.has_node(v)
+                and not self.graph.has_edge(edge))
+    
+    
+    def edge_weight(self, edge):
+        """
+        Get the weight of an edge.
+
+        @type  edge: edge
+        @param edge: One edge.
+        
+        @rtype:  number
+        @return: Edge weight.
+        """
+        return self.DEFAULT_WEIGHT
+    
+    
+    def edge_label(self, edge):
+        """
+        Get the label of an edge.
+
+        @type  edge: edge
+        @param edge: One edge.
+        
+        @rtype:  string
+        @return: Edge label
+        """
+        return self.DEFAULT_LABEL
+    
+    
+    def edge_attributes(self, edge):
+        """
+        Return the attributes of the given edge.
+
+        @type  edge: edge
+        @param edge: One edge.
+
+        @rtype:  list
+        @return: List of attributes specified tuples in the form (attribute, value).
+        """
+        return []
@@ -31,10 +31,11 @@ Hypergraph class
 
 # Imports
 from pygraph.classes.graph import graph
+from pygraph.classes.frozenhypergraph import frozenhypergraph
 from pygraph.classes.exceptions import AdditionError
 
-from pygraph.mixins.labeling import labeling
-from pygraph.mixins.common import common
+from pygraph.mixins.labeling import labeling, edge_record
+from pygraph.mixins.common import common, mutator, ordered_dict
 from pygraph.mixins.basegraph import basegraph
 
 class hypergraph (basegraph, common, labeling):
@@ -44,8 +45,9 @@ class hypergraph (basegraph, common, labeling):
     Hypergraphs are a generalization of graphs where an edge (called hyperedge) can connect more
     than two nodes.
     
-    @sort: __init__, __len__, __str__, add_hyperedge, add_hyperedges, add_node, add_nodes,
-    del_edge, has_node, has_edge, has_hyperedge, hyperedges, link, links, nodes, unlink
+    @sort: __getitem__, __getstate__, __init__, __len__, __setstate__, __str__, add_hyperedge,
+    add_hyperedges, add_node, add_nodes, del_edge, freeze, graph, has_node, has_edge,
+    has_hyperedge, hyperedges, link, links, materialize_neighbors, neighbors, nodes, unlink
     """
 
     # Technically this isn't directed, but it gives us the right
@@ -58,9 +60,35 @@ class hypergraph (basegraph, common, labeling):
         """
         common.__init__(self)
         labeling.__init__(self)
-        self.node_links = {}    # Pairing: Node -> Hyperedge
-        self.edge_links = {}     # Pairing: Hyperedge -> Node
-        self.graph = graph()    # Ordinary graph
+        self.node_links = ordered_dict()    # Pairing: Node -> Hyperedge
+        self.edge_links = ordered_dict()    # Pairing: Hyperedge -> Node
+        self._bipartite = None  # Version and ordinary graph, built when needed
+        self._neighbors = {}    # Pairing: Node -> Neighbors, filled when needed
+
+
+    @property
+    def graph(self):
+        """
+        Bipartite graph linking the nodes of the hypergraph, as C{(node, 'n')}, to its hyperedges,
+        as C{(hyperedge, 'h')}.
+        
+        The graph is built when first requested and kept until the hypergraph changes. It should
+        not be modified.
+        
+        @rtype:  graph
+        @return: Bipartite graph equivalent to the hypergraph.
+        """
+        if (self._bipartite is None or self._bipartite[0] != self.version):
+            # Each node of the bipartite graph is a single tuple, shared by all its edges
+            nodes = ordered_dict((node, (node,'n')) for node in self.node_links)
+            hyperedges = ordered_dict((hyperedge, (hyperedge,'h'))
+                                      for hyperedge in self.edge_links)
+            bipartite = graph()
+            bipartite.add_nodes(list(nodes.values()) + list(hyperedges.values()))
+            bipartite.add_edges((nodes[node], hyperedges[hyperedge])
+                                for hyperedge, links in self.edge_links.items() for node in links)
+            self._bipartite = (self.version, bipartite)
+        return self._bipartite[1]
 
 
     def nodes(self):
@@ -140,18 +168,68 @@ class hypergraph (basegraph, common, labeling):
         """
         Return all neighbors adjacent to the given node.
         
+        The neighbors of each node are computed once and kept until the links of the node or of
+        one of its neighbors change.
+        
         @type  obj: node
         @param obj: Object identifier.
         
         @rtype:  list
         @return: List of all node objects adjacent to the given node.
         """
-        neighbors = set([])
+        return list(self._cached_neighbors(obj))
+    
+    
+    def __getitem__(self, node):
+        """
+        Return a iterator passing through all neighbors of the given node.
+        
+        @rtype:  iterator
+        @return: Iterator passing through all neighbors of the given node.
+        """
+        for n in self._cached_neighbors(node):
+            yield n
+    
+    
+    def _cached_neighbors(self, node):
+        """
+        Return the cached list of neighbors of the given node, computing it if needed.
+        
+        @type  node: node
+        @param node: Node identifier.
         
-        for e in self.node_links[obj]:
-            neighbors.update(set(self.edge_links[e]))
+        @rtype:  list
+        @return: Cached list of neighbors. It must not be modified.
+        """
+        try:
+            return self._neighbors[node]
+        except KeyError:
+            neighbors = set()
+            for e in self.node_links[node]:
+                neighbors.update(self.edge_links[e])
+            neighbors.discard(node)
+            self._neighbors[node] = neighbors = list(neighbors)
+            return neighbors
+    
+    
+    def materialize_neighbors(self):
+        """
+        Compute the neighbors of every node at once, so that later calls to C{neighbors()} are
+        lookups. This is useful before running several read-only algorithms on the hypergraph.
+        """
+        for node in self.node_links:
+            self._cached_neighbors(node)
+    
+    
+    def _forget_neighbors(self, nodes):
+        """
+        Discard the cached neighbors of the given nodes.
         
-        return list(neighbors - set([obj]))
+        @type  nodes: iterable
+        @param nodes: Nodes whose neighbors may have changed.
+        """
+        for node in nodes:
+            self._neighbors.pop(node, None)
 
 
     def has_node(self, node):
@@ -167,6 +245,7 @@ class hypergraph (basegraph, common, labeling):
         return node in self.node_links
 
 
+    @mutator
     def add_node(self, node):
         """
         Add given node to the hypergraph.
@@ -180,11 +259,36 @@ class hypergraph (basegraph, common, labeling):
         if (not node in self.node_links):
             self.node_links[node] = []
             self.node_attr[node] = []
-            self.graph.add_node((node,'n'))
         else:
             raise AdditionError("Node %s already in graph" % node)
     
     
+    @mutator
+    def add_nodes(self, nodelist):
+        """
+        Add given nodes to the hypergraph.
+        
+        The whole list is checked before the hypergraph is modified, so the hypergraph is left
+        unchanged if any of the nodes is already present.
+        
+        @attention: While nodes can be of any type, it's strongly recommended to use only numbers
+        and single-line strings as node identifiers if you intend to use write().
+
+        @type  nodelist: list
+        @param nodelist: List of nodes to be added to the hypergraph.
+        """
+        nodelist = list(nodelist)
+        batch = set()
+        for node in nodelist:
+            if (node in self.node_links or node in batch):
+                raise AdditionError("Node %s already in graph" % node)
+            batch.add(node)
+        for node in nodelist:
+            self.node_links[node] = []
+            self.node_attr[node] = []
+    
+    
+    @mutator
     def del_node(self, node):
         """
         Delete a given node from the hypergraph.
@@ -195,11 +299,14 @@ class hypergraph (basegraph, common, labeling):
         if self.has_node(node):
             for e in self.node_links[node]:
                 self.edge_links[e].remove(node)
+                self._forget_neighbors(self.edge_links[e])
+            self._neighbors.pop(node, None)
 
             self.node_links.pop(node)
-            self.graph.del_node((node,'n'))
+            self.del_node_labeling(node)
 
 
+    @mutator
     def add_edge(self, hyperedge):
         """
         Add given hyperedge to the hypergraph.
@@ -213,6 +320,7 @@ class hypergraph (basegraph, common, labeling):
         self.add_hyperedge(hyperedge)
     
 
+    @mutator
     def add_hyperedge(self, hyperedge):
         """
         Add given hyperedge to the hypergraph.
@@ -225,10 +333,10 @@ class hypergraph (basegraph, common, labeling):
         """
         if (not hyperedge in self.edge_links):
             self.edge_links[hyperedge] = []
-            self.graph.add_node((hyperedge,'h'))
 
 
-    def add_edges(self, edgelist):
+    @mutator
+    def add_edges(self, edgelist, weights=None, labels=None):
         """
         Add given hyperedges to the hypergraph.
 
@@ -237,24 +345,48 @@ class hypergraph (basegraph, common, labeling):
         
         @type  edgelist: list
         @param edgelist: List of hyperedge-nodes to be added to the graph.
+        
+        @type  weights: list
+        @param weights: Optional list of hyperedge weights, in the same order as the hyperedges.
+        
+        @type  labels: list
+        @param labels: Optional list of hyperedge labels, in the same order as the hyperedges.
         """
-        self.add_hyperedges(edgelist)
+        self.add_hyperedges(edgelist, weights, labels)
             
 
-    def add_hyperedges(self, edgelist):
+    @mutator
+    def add_hyperedges(self, edgelist, weights=None, labels=None):
         """
         Add given hyperedges to the hypergraph.
+        
+        Hyperedges already in the hypergraph, or repeated in the list, keep their first weight
+        and label. The weights and labels are checked before the hypergraph is modified, so the
+        hypergraph is left unchanged if they don't match the hyperedges.
 
         @attention: While hyperedge-nodes can be of any type, it's strongly recommended to use only
         numbers and single-line strings as node identifiers if you intend to use write().
         
         @type  edgelist: list
         @param edgelist: List of hyperedge-nodes to be added to the graph.
-        """
-        for each in edgelist:
-            self.add_hyperedge(each)
+        
+        @type  weights: list
+        @param weights: Optional list of hyperedge weights, in the same order as the hyperedges.
+        
+        @type  labels: list
+        @param labels: Optional list of hyperedge labels, in the same order as the hyperedges.
+        """
+        edgelist = list(edgelist)
+        labeled = (weights is not None or labels is not None)
+        weights, labels = self._edge_batch_properties(len(edgelist), weights, labels)
+        for each, wt, label in zip(edgelist, weights, labels):
+            if (not each in self.edge_links):
+                self.edge_links[each] = []
+                if (labeled):
+                    self.edge_properties[each] = edge_record(wt, label)
 
     
+    @mutator
     def del_edge(self, hyperedge):
         """
         Delete the given hyperedge.
@@ -265,6 +397,7 @@ class hypergraph (basegraph, common, labeling):
         self.del_hyperedge(hyperedge)
         
         
+    @mutator
     def del_hyperedge(self, hyperedge):
         """
         Delete the given hyperedge.
@@ -272,15 +405,16 @@ class hypergraph (basegraph, common, labeling):
         @type  hyperedge: hyperedge
         @param hyperedge: Hyperedge identifier.
         """
-        if (hyperedge in self.hyperedges()):
+        if (hyperedge in self.edge_links):
             for n in self.edge_links[hyperedge]:
                 self.node_links[n].remove(hyperedge)
+            self._forget_neighbors(self.edge_links[hyperedge])
 
             del(self.edge_links[hyperedge])
             self.del_edge_labeling(hyperedge)
-            self.graph.del_node((hyperedge,'h'))
             
 
+    @mutator
     def link(self, node, hyperedge):
         """
         Link given node and hyperedge.
@@ -294,11 +428,12 @@ class hypergraph (basegraph, common, labeling):
         if (hyperedge not in self.node_links[node]):
             self.edge_links[hyperedge].append(node)
             self.node_links[node].append(hyperedge)
-            self.graph.add_edge(((node,'n'), (hyperedge,'h')))
+            self._forget_neighbors(self.edge_links[hyperedge])
         else:
             raise AdditionError("Link (%s, %s) already in graph" % (node, hyperedge))
 
 
+    @mutator
     def unlink(self, node, hyperedge):
         """
         Unlink given node and hyperedge.
@@ -311,9 +446,21 @@ class hypergraph (basegraph, common, labeling):
         """
         self.node_links[node].remove(hyperedge)
         self.edge_links[hyperedge].remove(node)
-        self.graph.del_edge(((node,'n'), (hyperedge,'h')))
+        self._forget_neighbors(self.edge_links[hyperedge])
+        self._neighbors.pop(node, None)
 
     
+    def freeze(self):
+        """
+        Return a read-only snapshot of the hypergraph with links stored in compressed-sparse-row
+        arrays.
+        
+        @rtype:  frozenhypergraph
+        @return: Frozen snapshot of the hypergraph.
+        """
+        return frozenhypergraph(self)
+    
+    
     def rank(self):
         """
         Return the rank of the given hypergraph.
@@ -329,6 +476,79 @@ class hypergraph (basegraph, common, labeling):
                 
         return max_rank
 
+    def _fingerprint_terms(self):
+        """
+        Generate the hashable terms whose hashes are added up into the fingerprint.
+        
+        @rtype:  iterator
+        @return: Iterator of hashable terms.
+        """
+        for term in common._fingerprint_terms(self):
+            yield term
+        for edge, links in self.edge_links.items():
+            for node in links:
+                yield ('link', node, edge)
+    
+    def _memory_tables(self):
+        """
+        Return the tables holding the contents of the hypergraph, grouped by component.
+        
+        The bipartite graph and the cached neighbors count only while they are kept.
+        
+        @rtype:  list
+        @return: List of C{(component, tables)} pairs.
+        """
+        bipartite = []
+        if (self._bipartite is not None):
+            for component, tables in self._bipartite[1]._memory_tables():
+                bipartite.extend(tables)
+        return ([('adjacency', [self.node_links, self.edge_links, self._neighbors])] +
+                labeling._memory_tables(self) + [('graph', bipartite)])
+
+    def __getstate__(self):
+        """
+        Return the state of the hypergraph for pickling and copying.
+        
+        The bipartite graph, the cached neighbors, the fingerprint and the integer node ids are
+        left out, as they are rebuilt when needed and fingerprints may differ between processes.
+        
+        @rtype:  dictionary
+        @return: State of the hypergraph.
+        """
+        state = dict(self.__dict__)
+        for name in ['_bipartite', '_neighbors', '_fingerprint', '_interned', '_interned_weights']:
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state):
+        """
+        Restore the state of the hypergraph, converting one pickled by releases up to 1.8.
+
+        Those releases kept the bipartite graph up to date in C{graph}, edge properties in
+        dictionaries and no attribute columns.
+
+        @type  state: dictionary
+        @param state: State of the hypergraph.
+        """
+        self._bipartite = None
+        self._neighbors = {}
+        self.__dict__.update(state)
+        if ('graph' not in state):
+            return
+        self._bipartite = (self.version, self.__dict__.pop('graph'))
+        self.node_links = ordered_dict(self.node_links)
+        self.edge_links = ordered_dict(self.edge_links)
+        for edge, properties in list(self.edge_properties.items()):
+            properties = dict(properties)
+            record = edge_record(properties.pop(self.WEIGHT_ATTRIBUTE_NAME, self.DEFAULT_WEIGHT),
+                                 properties.pop(self.LABEL_ATTRIBUTE_NAME, self.DEFAULT_LABEL))
+            if (properties):
+                record.extra = properties
+            self.edge_properties[edge] = record
+        self.node_attr_columns = {}
+        for node, attrs in self.node_attr.items():
+            self._index_node_attributes(node, attrs)
+
     def __eq__(self, other):
         """
         Return whether this hypergraph is equal to another one.
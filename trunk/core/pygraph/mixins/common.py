@@ -23,14 +23,355 @@
 # OTHER DEALINGS IN THE SOFTWARE.
 
 
+# Imports
+from pygraph.classes.exceptions import AdditionError
+from collections import deque
+from functools import wraps
+from sys import getsizeof, version_info
+
+# Dictionaries keep insertion order from Python 3.7 on; earlier versions need OrderedDict for it
+if (version_info >= (3, 7)):
+    ordered_dict = dict
+else:
+    from collections import OrderedDict as ordered_dict
+
+
+def mutator(method):
+    """
+    Decorate a method that modifies the graph.
+    
+    Each call bumps the version of the graph and, if the journal is enabled, is recorded in it.
+    Calls made while another decorated method is running are part of that change and are not
+    counted separately. A call that raises an exception after one of these calls has changed the
+    graph still bumps the version, but it can't be replayed, so the journal is emptied instead.
+    
+    @type  method: function
+    @param method: Method modifying the graph.
+    
+    @rtype:  function
+    @return: Decorated method.
+    """
+    name = method.__name__
+    
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if (self._mutating):
+            result = method(self, *args, **kwargs)
+            self._changed = True
+            return result
+        if (self.journal is not None):
+            # Iterators would be exhausted by the call, so the journal keeps their contents
+            args = tuple(_materialize(each) for each in args)
+            kwargs = dict((key, _materialize(kwargs[key])) for key in kwargs)
+        self._mutating = True
+        self._changed = False
+        done = False
+        try:
+            result = method(self, *args, **kwargs)
+            done = True
+        finally:
+            self._mutating = False
+            if (done or self._changed):
+                self.version = self.version + 1
+                if (self.journal is not None):
+                    if (done):
+                        self.journal.append((name, args, kwargs))
+                    else:
+                        self.journal.clear()
+        return result
+    
+    return wrapper
+
+
+def _materialize(arg):
+    """
+    Return the contents of the given argument as a list if it is an iterator.
+    """
+    try:
+        if (iter(arg) is arg):
+            return list(arg)
+    except TypeError:
+        pass
+    return arg
+
+
+def _merge(gr, other, conflict):
+    """
+    Add the nodes and edges of other graph to a graph or digraph, along with their labeling.
+    
+    See C{graph.merge()} for the conflict policies.
+    
+    @type  gr: graph, digraph
+    @param gr: Graph being changed.
+    
+    @type  other: graph, digraph
+    @param other: Graph, or any read-only graph class.
+    
+    @type  conflict: string
+    @param conflict: Conflict policy: C{'keep'}, C{'overwrite'} or C{'sum'}.
+    """
+    if (conflict not in ('keep', 'overwrite', 'sum')):
+        raise AdditionError("Unknown conflict policy %s" % conflict)
+    
+    nodes = other.nodes()
+    for node in nodes:
+        if (not gr.has_node(node)):
+            gr.add_node(node, other.node_attributes(node))
+        elif (conflict == 'overwrite'):
+            gr._relabel_node(node, other.node_attributes(node))
+    
+    # An undirected graph gets one edge for both orientations of an edge or pair of arcs, which
+    # are listed from the endpoint coming first
+    once = not gr.DIRECTED
+    position = dict((node, i) for i, node in enumerate(nodes))
+    for edge in other.edges():
+        u, v = edge
+        if (once and position[u] > position[v] and (not other.DIRECTED or other.has_edge((v, u)))):
+            continue
+        wt = other.edge_weight(edge)
+        if (not gr.has_edge(edge)):
+            gr.add_edge(edge, wt, other.edge_label(edge), other.edge_attributes(edge))
+        elif (conflict == 'overwrite'):
+            gr._relabel_edge(edge, wt, other.edge_label(edge), other.edge_attributes(edge))
+        elif (conflict == 'sum'):
+            gr.set_edge_weight(edge, gr.edge_weight(edge) + wt)
+
+
+def _hashable(value):
+    """
+    Return a hashable stand-in for the given value.
+    
+    Lists of attributes become sets of their hashable items, as attributes are compared as sets.
+    Other values are kept when hashable and replaced by None otherwise.
+    """
+    if (isinstance(value, list)):
+        return frozenset(each for each in value if _hashable(each) is each)
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return None
+
+
+def _deep_size(obj, seen):
+    """
+    Return the size in bytes of an object and of everything it refers to.
+    
+    Objects whose id is in C{seen} are not counted again.
+    
+    @type  obj: object
+    @param obj: Object.
+    
+    @type  seen: set
+    @param seen: Ids of the objects already counted. Updated with the objects counted now.
+    
+    @rtype:  number
+    @return: Size in bytes.
+    """
+    size = 0
+    stack = [obj]
+    while (stack):
+        obj = stack.pop()
+        if (id(obj) in seen):
+            continue
+        seen.add(id(obj))
+        size = size + getsizeof(obj)
+        if (isinstance(obj, dict)):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif (isinstance(obj, (list, tuple, set, frozenset, deque))):
+            stack.extend(obj)
+        else:
+            for name in getattr(type(obj), '__slots__', ()):
+                if (hasattr(obj, name)):
+                    stack.append(getattr(obj, name))
+            if (hasattr(obj, '__dict__')):
+                stack.append(obj.__dict__)
+    return size
+
+
+def _table_size(table, seen, sample, chosen, known):
+    """
+    Return the size in bytes of a table, measuring only a sample of its entries if it is large.
+    
+    Dictionaries are sampled on the entries of the chosen nodes and of the edges leaving them,
+    so that tables describing the same nodes and edges are sampled alike. Other tables, and
+    dictionaries keyed otherwise, are sampled evenly. The nodes of edges used as keys are
+    counted in the earlier tables holding these nodes.
+    
+    @type  table: object
+    @param table: Table.
+    
+    @type  seen: set
+    @param seen: Ids of the objects already counted.
+    
+    @type  sample: number
+    @param sample: Number of entries above which a table is sampled, or None to measure all of
+    them.
+    
+    @type  chosen: set
+    @param chosen: Nodes whose entries are measured in sampled dictionaries.
+    
+    @type  known: set
+    @param known: Keys of the tables measured so far. Updated with those of this table.
+    
+    @rtype:  number
+    @return: Size in bytes, estimated from the sample if one was taken.
+    """
+    if (sample is None or not isinstance(table, (dict, list)) or id(table) in seen):
+        return _deep_size(table, seen)
+    seen.add(id(table))
+    size = getsizeof(table)
+    if (isinstance(table, list)):
+        if (len(table) <= sample):
+            return size + sum(_table_size(each, seen, sample, chosen, known) for each in table)
+        entries = table[::len(table) // sample]
+        measured = sum(_deep_size(each, seen) for each in entries)
+        return size + measured * len(table) // len(entries)
+    
+    entries = []
+    for key in table:
+        if (key in chosen):
+            entries.append(key)
+        elif (type(key) is tuple and len(key) == 2 and key not in known):
+            u, v = key
+            if (u in known and v in known):
+                # Edges between nodes counted in earlier tables
+                seen.add(id(u))
+                seen.add(id(v))
+                if (u in chosen):
+                    entries.append(key)
+    known.update(table)
+    if (len(table) <= sample):
+        # Small tables may still hold large ones, like the columns of node attributes
+        for key in table:
+            size = size + _deep_size(key, seen) + _table_size(table[key], seen, sample, chosen,
+                                                              known)
+        return size
+    if (not entries):
+        entries = list(table)[::len(table) // sample]
+    measured = sum(_deep_size(key, seen) for key in entries)
+    # Keys, usually nodes or edges, are also referred to by the values
+    seen.update(id(key) for key in table)
+    measured = measured + sum(_deep_size(table[key], seen) for key in entries)
+    return size + measured * len(table) // len(entries)
+
+
 class common( object ):
     """
     Standard methods common to all graph classes.
     
+    Graphs count the changes made to them in C{version}, which starts at 0 and grows by one for
+    each call of a method that modifies the graph. Changes made directly to the internal tables
+    or to the records returned by C{get_edge_properties()} are not counted. When enabled, the
+    journal keeps the most recent changes as (method name, positional arguments, keyword
+    arguments) records.
+    
+    When interning is enabled, the algorithms in C{pygraph.algorithms} that support it number the
+    nodes from 0 to n-1 and work on these integer ids, translating their results back to nodes.
+    
     @sort: __eq__, __getitem__, __iter__, __len__, __repr__, __str__, add_graph, add_nodes,
-    add_spanning_tree, complete, inverse, order, reverse
+    add_spanning_tree, changes_since, complete, disable_interning, disable_journal,
+    enable_interning, enable_journal, fingerprint, interned, interned_weights, inverse,
+    memory_report, order, reverse
     """
     
+    version = 0             # Number of changes made to the graph
+    journal = None          # Most recent changes, when enabled
+    interning = False       # Whether algorithms should work on integer node ids
+    _mutating = False       # Whether a change is being made
+    _changed = False        # Whether the change being made has already modified the graph
+    _fingerprint = None     # Version and fingerprint of the graph, once computed
+    _interned = None        # Version, node table, node index and neighbor ids, once computed
+    _interned_weights = None    # Version and weights of the edges to the neighbors, once computed
+    
+    def enable_journal(self, maxlen=1000):
+        """
+        Start recording the changes made to the graph.
+        
+        @type  maxlen: number
+        @param maxlen: Maximum number of changes kept. Older changes are discarded.
+        """
+        self.journal = deque(maxlen=maxlen)
+    
+    def disable_journal(self):
+        """
+        Stop recording the changes made to the graph and discard the journal.
+        """
+        self.journal = None
+    
+    def changes_since(self, version):
+        """
+        Return the changes made to the graph since the given version.
+        
+        @type  version: number
+        @param version: Version of the graph.
+        
+        @rtype:  list
+        @return: List of (method name, positional arguments, keyword arguments) records, oldest
+        first, or None if the journal does not go back to the given version.
+        """
+        count = self.version - version
+        if (self.journal is None or count < 0 or count > len(self.journal)):
+            return None
+        if (count == 0):
+            return []
+        return list(self.journal)[-count:]
+    
+    def enable_interning(self):
+        """
+        Let algorithms work on integer node ids instead of the nodes themselves.
+        
+        The ids are assigned when an algorithm first needs them and again after each change to
+        the graph. Algorithms then look up neighbors and mark visited nodes in lists, without
+        hashing the nodes, which pays off for nodes that are slow to hash or compare, like long
+        strings or tuples, and for graphs searched several times between changes.
+        """
+        self.interning = True
+    
+    def disable_interning(self):
+        """
+        Let algorithms work on the nodes themselves and discard the integer node ids.
+        """
+        self.interning = False
+        self._interned = None
+        self._interned_weights = None
+    
+    def interned(self):
+        """
+        Return the graph with its nodes numbered from 0 to n-1.
+        
+        The result is computed once per version of the graph, so changes made directly to the
+        internal tables are not seen. It should not be modified.
+        
+        @rtype:  tuple
+        @return: A tuple containing two lists and a dictionary:
+            1. Node table, listing the node of each id
+            2. Node index, pairing each node with its id
+            3. Rows listing the ids of the neighbors of each node, in the order of C{neighbors()}
+        """
+        if (self._interned is None or self._interned[0] != self.version):
+            nodes = self.nodes()
+            ids = dict((node, i) for i, node in enumerate(nodes))
+            rows = [[ids[each] for each in self.neighbors(node)] for node in nodes]
+            self._interned = (self.version, nodes, ids, rows)
+        return self._interned[1:]
+    
+    def interned_weights(self):
+        """
+        Return the weights of the edges listed by C{interned()}.
+        
+        @rtype:  list
+        @return: Rows listing the weights of the edges from each node to its neighbors, in the
+        same order as the rows of neighbor ids.
+        """
+        if (self._interned_weights is None or self._interned_weights[0] != self.version):
+            nodes, ids, rows = self.interned()
+            weights = [[self.edge_weight((node, nodes[j])) for j in row]
+                       for node, row in zip(nodes, rows)]
+            self._interned_weights = (self.version, weights)
+        return self._interned_weights[1]
+    
     def __str__(self):
         """
         Return a string representing the graph when requested by str() (or print).
@@ -89,6 +430,7 @@ class common( object ):
         """
         return len(self.nodes())
             
+    @mutator
     def add_nodes(self, nodelist):
         """
         Add given nodes to the graph.
@@ -104,6 +446,7 @@ class common( object ):
         for each in nodelist:
             self.add_node(each)
             
+    @mutator
     def add_graph(self, other):
         """
         Add other graph to this graph.
@@ -113,7 +456,7 @@ class common( object ):
         @type  other: graph
         @param other: Graph
         """
-        self.add_nodes( n for n in other.nodes() if not n in self.nodes() )
+        self.add_nodes( n for n in other.nodes() if not self.has_node(n) )
         
         for each_node in other.nodes():
             for each_edge in other.neighbors(each_node):
@@ -121,6 +464,7 @@ class common( object ):
                     self.add_edge((each_node, each_edge))
 
 
+    @mutator
     def add_spanning_tree(self, st):
         """
         Add a spanning tree to the graph.
@@ -134,33 +478,51 @@ class common( object ):
                 self.add_edge((st[each], each))
                 
     
+    @mutator
     def complete(self):
         """
         Make the graph a complete graph.
         
         @attention: This will modify the current graph.
         """
-        for each in self.nodes():
-            for other in self.nodes():
-                if (each != other and not self.has_edge((each, other))):
-                    self.add_edge((each, other))
+        self.add_edges(self._missing_edges())
 
 
     def inverse(self):
         """
         Return the inverse of the graph.
         
+        The inverse is built directly from the non-neighbors of each node. For large sparse graphs,
+        whose inverse is dense, consider C{complement_view()} instead.
+        
         @rtype:  graph
         @return: Complement graph for the graph.
         """
         inv = self.__class__()
         inv.add_nodes(self.nodes())
-        inv.complete()
-        for each in self.edges():
-            if (inv.has_edge(each)):
-                inv.del_edge(each)
+        inv.add_edges(self._missing_edges())
         return inv
     
+    def _missing_edges(self):
+        """
+        Return the edges, other than self-loops, that would make the graph complete.
+        
+        @rtype:  list
+        @return: List of edges not in the graph, each undirected edge being listed once.
+        """
+        nodes = self.nodes()
+        missing = []
+        for i, each in enumerate(nodes):
+            adjacent = set(self.neighbors(each))
+            if (self.DIRECTED):
+                others = nodes
+            else:
+                others = nodes[i+1:]
+            for other in others:
+                if (other != each and other not in adjacent):
+                    missing.append((each, other))
+        return missing
+    
     def reverse(self):
         """
         Generate the reverse of a directed graph, returns an identical graph if not directed.
@@ -184,10 +546,89 @@ class common( object ):
             N.add_edge((v, u), wt, label, attributes)
         return N
 
+    def memory_report(self, sample=None):
+        """
+        Return the memory used by the graph, in bytes, broken down by component.
+        
+        Everything reachable from each component is counted, including node objects, weights,
+        labels and attributes. Objects shared between components are counted once, in the first
+        one that refers to them. For large graphs, C{sample} limits the measure to the entries of
+        about that many nodes, and of the edges leaving them, and the size of the rest is
+        extrapolated from them. The estimate is usually within a few percent of the full count,
+        but objects other than nodes that are shared by several entries of a table, like node
+        objects given anew for each link of a hypergraph, are counted more than once.
+        
+        @type  sample: number
+        @param sample: Number of nodes whose entries are measured, or None to measure all of them.
+        
+        @rtype:  dictionary
+        @return: Size in bytes of each component of the graph and their C{'total'}.
+        """
+        if (sample is not None and sample <= 0):
+            raise ValueError("Sample size must be positive, got %s" % sample)
+        chosen = set()
+        if (sample is not None):
+            nodes = self.nodes()
+            chosen.update(nodes[::max(1, len(nodes) // sample)])
+        seen = set()
+        known = set()
+        report = {}
+        for component, tables in self._memory_tables():
+            report[component] = sum(_table_size(table, seen, sample, chosen, known)
+                                    for table in tables)
+        report['total'] = sum(report.values())
+        return report
+    
+    def fingerprint(self):
+        """
+        Return a hash of the nodes, edges, weights, labels and attributes of the graph.
+        
+        The fingerprint does not depend on the order in which nodes, edges and attributes were
+        added, and graphs that are equal have equal fingerprints. It is computed once per
+        version of the graph, so changes made directly to the internal tables or to the records
+        returned by C{get_edge_properties()} are not seen. Attribute values that are not
+        hashable are left out. Like C{hash()}, fingerprints may differ between processes.
+        
+        @rtype:  number
+        @return: Fingerprint of the graph.
+        """
+        if (self._fingerprint is None or self._fingerprint[0] != self.version):
+            total = 0
+            for term in self._fingerprint_terms():
+                total = (total + hash(term)) & 0xFFFFFFFFFFFFFFFF
+            self._fingerprint = (self.version, total)
+        return self._fingerprint[1]
+    
+    def _fingerprint_terms(self):
+        """
+        Generate the hashable terms whose hashes are added up into the fingerprint.
+        
+        @rtype:  iterator
+        @return: Iterator of hashable terms.
+        """
+        for node in self.nodes():
+            yield (node, _hashable(self.node_attributes(node)))
+        for edge in self.edges():
+            yield (edge, _hashable((self.edge_weight(edge), self.edge_label(edge))),
+                   _hashable(self.edge_attributes(edge)))
+    
+    def _memory_tables(self):
+        """
+        Return the tables holding the contents of the graph, grouped by component.
+        
+        Graphs that own no tables, like views, have no components.
+        
+        @rtype:  list
+        @return: List of C{(component, tables)} pairs.
+        """
+        return []
+    
     def __eq__(self, other):
         """
         Return whether this graph is equal to another one.
         
+        Graphs with different fingerprints are told apart without comparing their contents.
+        
         @type other: graph, digraph
         @param other: Other graph or digraph
         
@@ -196,20 +637,20 @@ class common( object ):
         """
         
         def nodes_eq():
+            if (self.order() != other.order()): return False
             for each in self:
                 if (not other.has_node(each)): return False
-            for each in other:
-                if (not self.has_node(each)): return False
             return True
         
         def edges_eq():
-            for edge in self.edges():
-                    if (not other.has_edge(edge)): return False
-            for edge in other.edges():
-                    if (not self.has_edge(edge)): return False
+            edges = self.edges()
+            if (len(edges) != len(other.edges())): return False
+            for edge in edges:
+                if (not other.has_edge(edge)): return False
             return True
         
         try:
+            if (self.fingerprint() != other.fingerprint()): return False
             return nodes_eq() and edges_eq()
         except AttributeError:
             return False
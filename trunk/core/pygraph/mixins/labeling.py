@@ -23,13 +23,158 @@
 # OTHER DEALINGS IN THE SOFTWARE.
 
 
+# Imports
+from pygraph.classes.exceptions import AdditionError
+from pygraph.mixins.common import mutator, ordered_dict
+from array import array
+from collections import deque
+try:
+    from collections.abc import MutableMapping
+except ImportError:
+    from collections import MutableMapping
+
+
+def _packed_numbers(values):
+    """
+    Pack a list of numbers into the smallest array able to hold them.
+    
+    Integers are packed only if they are all integers, and floats only if they are all floats, so
+    that unpacking gives back values of the same type.
+    
+    @type  values: list
+    @param values: List of values.
+    
+    @rtype:  array, list
+    @return: Integer or float array, or the list itself for values of other or mixed types.
+    """
+    if (all(type(value) is int for value in values)):
+        for typecode in ('b', 'h', 'i', 'l', 'q'):
+            try:
+                return array(typecode, values)
+            except (OverflowError, ValueError):
+                pass
+    elif (all(type(value) is float for value in values)):
+        return array('d', values)
+    return values
+
+
+def _labeling_eq(gr, other):
+    """
+    Return whether two graphs have the same node attributes and edge weights, labels and
+    attributes. Attributes are compared as sets.
+    
+    @type  gr: graph
+    @param gr: Graph, or any read-only graph class.
+    
+    @type  other: graph
+    @param other: Other graph, assumed to have the same nodes and edges.
+    
+    @rtype:  boolean
+    @return: Whether both graphs are labeled alike.
+    """
+    def attrs_eq(list1, list2):
+        try:
+            return set(list1) == set(list2)
+        except TypeError:
+            # Some attribute values are not hashable
+            for each in list1:
+                if (each not in list2): return False
+            for each in list2:
+                if (each not in list1): return False
+            return True
+    
+    def edges_eq():
+        for edge in gr.edges():
+            if (gr.edge_weight(edge) != other.edge_weight(edge)): return False
+            if (gr.edge_label(edge) != other.edge_label(edge)): return False
+            if (not attrs_eq(gr.edge_attributes(edge), other.edge_attributes(edge))): return False
+        return True
+    
+    def nodes_eq():
+        for node in gr:
+            if (not attrs_eq(gr.node_attributes(node), other.node_attributes(node))): return False
+        return True
+    
+    return nodes_eq() and edges_eq()
+
+
+class edge_record( MutableMapping ):
+    """
+    Properties of an edge.
+    
+    Edge records behave as dictionaries mapping property names to values, but the weight and the
+    label are kept in slots and a real dictionary is only created when some other property is
+    set. This makes the common case much smaller than a dictionary per edge.
+    
+    The weight and the label are always present; deleting them restores their default values.
+    """
+    
+    __slots__ = ('weight', 'label', 'extra')
+    
+    def __init__(self, weight=1, label=""):
+        self.weight = weight
+        self.label = label
+        self.extra = None
+    
+    def __getitem__(self, key):
+        if (key == "weight"):
+            return self.weight
+        if (key == "label"):
+            return self.label
+        if (self.extra is None):
+            raise KeyError(key)
+        return self.extra[key]
+    
+    def __setitem__(self, key, value):
+        if (key == "weight"):
+            self.weight = value
+        elif (key == "label"):
+            self.label = value
+        else:
+            if (self.extra is None):
+                self.extra = {}
+            self.extra[key] = value
+    
+    def __delitem__(self, key):
+        if (key == "weight"):
+            self.weight = labeling.DEFAULT_WEIGHT
+        elif (key == "label"):
+            self.label = labeling.DEFAULT_LABEL
+        else:
+            if (self.extra is None):
+                raise KeyError(key)
+            del(self.extra[key])
+    
+    def __iter__(self):
+        yield "weight"
+        yield "label"
+        if (self.extra is not None):
+            for key in self.extra:
+                yield key
+    
+    def __len__(self):
+        if (self.extra is None):
+            return 2
+        return 2 + len(self.extra)
+    
+    def __repr__(self):
+        return repr(dict(self))
+    
+    def __getstate__(self):
+        return (self.weight, self.label, self.extra)
+    
+    def __setstate__(self, state):
+        self.weight, self.label, self.extra = state
+
+
 class labeling( object ):
     """
     Generic labeling support for graphs
     
     @sort: __eq__, __init__, add_edge_attribute, add_edge_attributes, add_node_attribute,
     del_edge_labeling, del_node_labeling, edge_attributes, edge_label, edge_weight,
-    get_edge_properties, node_attributes, set_edge_label, set_edge_properties, set_edge_weight 
+    get_edge_properties, node_attribute_column, node_attributes, nodes_with_attribute,
+    set_edge_label, set_edge_properties, set_edge_weight 
     """
     WEIGHT_ATTRIBUTE_NAME = "weight"
     DEFAULT_WEIGHT = 1
@@ -38,30 +183,68 @@ class labeling( object ):
     DEFAULT_LABEL = ""
     
     def __init__(self):
-        # Metadata bout edges
-        self.edge_properties = {}    # Mapping: Edge -> Dict mapping, lablel-> str, wt->num
+        # Metadata bout edges. Undirected edges are stored once, under their canonical key.
+        self.edge_properties = {}    # Mapping: Edge -> Edge record, lablel-> str, wt->num
         self.edge_attr = {}          # Key value pairs: (Edge -> Attributes)
         
         # Metadata bout nodes
         self.node_attr = {}          # Pairing: Node -> Attributes
+        self.node_attr_columns = {}  # Mapping: Attribute name -> (Node -> First value)
         
+    @mutator
     def del_node_labeling( self, node ):
         if node in self.node_attr:
             # Since attributes and properties are lazy, they might not exist.
+            for name, value in self.node_attr[node]:
+                column = self.node_attr_columns.get(name)
+                if (column is not None):
+                    column.pop(node, None)
+                    if (not column):
+                        del( self.node_attr_columns[name] )
             del( self.node_attr[node] )
+    
+    def _index_node_attributes(self, node, attrs):
+        """
+        Record the given attributes of a node in the attribute columns.
+        
+        @type  node: node
+        @param node: Node identifier
         
+        @type  attrs: list
+        @param attrs: List of attributes specified as (attribute, value) tuples.
+        """
+        for name, value in attrs:
+            self.node_attr_columns.setdefault(name, {}).setdefault(node, value)
+        
+    @mutator
     def del_edge_labeling( self, edge ):
         
-        keys = [edge]
-        if not self.DIRECTED:
-            keys.append(edge[::-1])
-            
-        for key in keys:
-            for mapping in [self.edge_properties, self.edge_attr ]:
-                try:
-                    del ( mapping[key] )
-                except KeyError:
-                    pass
+        key = self._edge_key(edge)
+        for mapping in [self.edge_properties, self.edge_attr ]:
+            try:
+                del ( mapping[key] )
+            except KeyError:
+                pass
+    
+    def _edge_key(self, edge):
+        """
+        Return the key under which the labeling of the given edge is stored.
+        
+        Directed edges are stored under themselves. An undirected edge is stored only once, under
+        the orientation it was first labeled with, and can be looked up by either orientation.
+        
+        @type  edge: edge
+        @param edge: One edge.
+        
+        @rtype:  edge
+        @return: Canonical key for the edge.
+        """
+        if (self.DIRECTED or edge in self.edge_properties):
+            return edge
+        reverse = (edge[1], edge[0])
+        if (reverse in self.edge_properties or reverse in self.edge_attr):
+            return reverse
+        return edge
     
     def edge_weight(self, edge):
         """
@@ -73,9 +256,10 @@ class labeling( object ):
         @rtype:  number
         @return: Edge weight.
         """
-        return self.get_edge_properties( edge ).setdefault( self.WEIGHT_ATTRIBUTE_NAME, self.DEFAULT_WEIGHT )
+        return self.get_edge_properties( edge ).weight
 
 
+    @mutator
     def set_edge_weight(self, edge, wt):
         """
         Set the weight of an edge.
@@ -87,8 +271,6 @@ class labeling( object ):
         @param wt: Edge weight.
         """
         self.set_edge_properties(edge, weight=wt )
-        if not self.DIRECTED:
-            self.set_edge_properties((edge[1], edge[0]) , weight=wt )
 
 
     def edge_label(self, edge):
@@ -101,8 +283,9 @@ class labeling( object ):
         @rtype:  string
         @return: Edge label
         """
-        return self.get_edge_properties( edge ).setdefault( self.LABEL_ATTRIBUTE_NAME, self.DEFAULT_LABEL )
+        return self.get_edge_properties( edge ).label
 
+    @mutator
     def set_edge_label(self, edge, label):
         """
         Set the label of an edge.
@@ -114,17 +297,293 @@ class labeling( object ):
         @param label: Edge label.
         """
         self.set_edge_properties(edge, label=label )
-        if not self.DIRECTED:
-            self.set_edge_properties((edge[1], edge[0]) , label=label )
             
+    @mutator
     def set_edge_properties(self, edge, **properties ):
-        self.edge_properties.setdefault( edge, {} ).update( properties )
-        if (not self.DIRECTED and edge[0] != edge[1]):
-            self.edge_properties.setdefault((edge[1], edge[0]), {}).update( properties )
+        self.get_edge_properties( edge ).update( properties )
         
     def get_edge_properties(self, edge):
-        return self.edge_properties.setdefault( edge, {} )
+        key = self._edge_key(edge)
+        try:
+            return self.edge_properties[key]
+        except KeyError:
+            record = self.edge_properties[key] = edge_record(self.DEFAULT_WEIGHT, self.DEFAULT_LABEL)
+            return record
+            
+    def _label_new_edge(self, edge, wt, label, attrs):
+        """
+        Set the weight, label and attributes of an edge being added to the graph.
+        
+        @type  edge: edge
+        @param edge: One edge.
+        
+        @type  wt: number
+        @param wt: Edge weight.
+        
+        @type  label: string
+        @param label: Edge label.
+        
+        @type  attrs: list
+        @param attrs: List of edge attributes specified as (attribute, value) tuples.
+        """
+        key = self._edge_key(edge)
+        record = self.get_edge_properties(key)
+        record.weight = wt
+        record.label = label
+        if (attrs):
+            self.edge_attr[key] = self.edge_attributes(key) + list(attrs)
+            
+    def _relabel_edge(self, edge, wt, label, attrs):
+        """
+        Replace the weight, label and attributes of an edge.
+        
+        @type  edge: edge
+        @param edge: One edge.
+        
+        @type  wt: number
+        @param wt: Edge weight.
+        
+        @type  label: string
+        @param label: Edge label.
+        
+        @type  attrs: list
+        @param attrs: List of edge attributes specified as (attribute, value) tuples.
+        """
+        key = self._edge_key(edge)
+        record = self.get_edge_properties(key)
+        record.weight = wt
+        record.label = label
+        if (attrs):
+            self.edge_attr[key] = list(attrs)
+        else:
+            self.edge_attr.pop(key, None)
+    
+    def _relabel_node(self, node, attrs):
+        """
+        Replace the attributes of a node.
+        
+        @type  node: node
+        @param node: Node identifier
+        
+        @type  attrs: list
+        @param attrs: List of node attributes specified as (attribute, value) tuples.
+        """
+        self.del_node_labeling(node)
+        self.node_attr[node] = list(attrs)
+        self._index_node_attributes(node, self.node_attr[node])
             
+    def _packed_state(self):
+        """
+        Return the state of the graph with its tables packed for pickling.
+        
+        Nodes are listed once and everything else refers to them by position: adjacency, and
+        incidence for directed graphs, is kept as compressed-sparse-row arrays and edge weights in
+        an array, each undirected edge once. Labels, other edge properties and attributes are kept
+        only where they are set. Cached results are left out.
+        
+        @rtype:  dictionary
+        @return: Packed state of the graph.
+        """
+        state = dict(self.__dict__)
+        for name in ['node_neighbors', 'node_incidence', 'edge_properties', 'edge_attr',
+                     'node_attr', 'node_attr_columns', '_fingerprint', '_interned',
+                     '_interned_weights']:
+            state.pop(name, None)
+        
+        nodes = self.nodes()
+        index = dict((node, i) for i, node in enumerate(nodes))
+        default = edge_record(self.DEFAULT_WEIGHT, self.DEFAULT_LABEL)
+        offsets = [0]
+        targets = []
+        weights = []
+        labels = {}
+        extra = {}
+        edge_attr = {}
+        for i, node in enumerate(nodes):
+            for neighbor in self.node_neighbors[node]:
+                j = index[neighbor]
+                targets.append(j)
+                if (self.DIRECTED or i <= j):
+                    key = self._edge_key((node, neighbor))
+                    record = self.edge_properties.get(key, default)
+                    if (record.label != self.DEFAULT_LABEL):
+                        labels[len(weights)] = record.label
+                    if (record.extra):
+                        extra[len(weights)] = record.extra
+                    if (self.edge_attr.get(key)):
+                        edge_attr[len(weights)] = self.edge_attr[key]
+                    weights.append(record.weight)
+            offsets.append(len(targets))
+        node_attr = dict((i, self.node_attr[node]) for i, node in enumerate(nodes)
+                         if (self.node_attr.get(node)))
+        
+        # Incident nodes are kept in their own order, which may differ from the adjacency one
+        incidence = None
+        if (self.DIRECTED):
+            in_offsets = [0]
+            sources = []
+            for node in nodes:
+                sources.extend(index[each] for each in self.node_incidence[node])
+                in_offsets.append(len(sources))
+            incidence = (_packed_numbers(in_offsets), _packed_numbers(sources))
+        
+        state['_packed'] = (nodes, _packed_numbers(offsets), _packed_numbers(targets),
+                            incidence, _packed_numbers(weights), labels, extra, edge_attr,
+                            node_attr)
+        return state
+    
+    def _unpack_state(self, state):
+        """
+        Restore the state of the graph from one returned by C{_packed_state()}.
+        
+        @type  state: dictionary
+        @param state: Packed state of the graph.
+        """
+        state = dict(state)
+        if ('_packed' not in state):
+            self._pack_legacy_state(state)
+        nodes, offsets, targets, incidence, weights, labels, extra, edge_attr, node_attr = \
+            state.pop('_packed')
+        self.__dict__.update(state)
+        labeling.__init__(self)
+        
+        # Shallow copies get the same state, which must not be shared with the original graph
+        if (self.journal is not None):
+            self.journal = deque(self.journal, self.journal.maxlen)
+        
+        self.node_neighbors = ordered_dict()
+        properties = self.edge_properties
+        default_label = self.DEFAULT_LABEL
+        position = 0
+        for i, node in enumerate(nodes):
+            row = self.node_neighbors[node] = ordered_dict()
+            for j in targets[offsets[i]:offsets[i+1]]:
+                neighbor = nodes[j]
+                row[neighbor] = None
+                if (self.DIRECTED or i <= j):
+                    edge = (node, neighbor)
+                    record = properties[edge] = edge_record(weights[position],
+                                                            labels.get(position, default_label))
+                    if (position in extra):
+                        record.extra = dict(extra[position])
+                    if (position in edge_attr):
+                        self.edge_attr[edge] = list(edge_attr[position])
+                    position = position + 1
+        
+        if (incidence is not None):
+            in_offsets, sources = incidence
+            self.node_incidence = ordered_dict()
+            for i, node in enumerate(nodes):
+                self.node_incidence[node] = ordered_dict((nodes[j], None)
+                                                 for j in sources[in_offsets[i]:in_offsets[i+1]])
+        
+        for i, node in enumerate(nodes):
+            attrs = list(node_attr.get(i, []))
+            self.node_attr[node] = attrs
+            self._index_node_attributes(node, attrs)
+    
+    def _pack_legacy_state(self, state):
+        """
+        Convert, in place, a state pickled by releases up to 1.8 into the one returned by
+        C{_packed_state()}.
+        
+        Those releases pickled the tables themselves: neighbors in lists, and one dictionary of
+        properties and one list of attributes for each orientation of an undirected edge.
+        
+        @type  state: dictionary
+        @param state: State of the graph, as pickled by an earlier release.
+        """
+        neighbors = state.pop('node_neighbors')
+        properties = state.pop('edge_properties', {})
+        attributes = state.pop('edge_attr', {})
+        node_attributes = state.pop('node_attr', {})
+        
+        nodes = list(neighbors)
+        index = dict((node, i) for i, node in enumerate(nodes))
+        offsets = [0]
+        targets = []
+        weights = []
+        labels = {}
+        extra = {}
+        edge_attr = {}
+        for i, node in enumerate(nodes):
+            for neighbor in neighbors[node]:
+                j = index[neighbor]
+                targets.append(j)
+                if (self.DIRECTED or i <= j):
+                    edge = (node, neighbor)
+                    record = dict(properties.get(edge, {}))
+                    attrs = attributes.get(edge, [])
+                    if (not self.DIRECTED and not record):
+                        record = dict(properties.get((neighbor, node), {}))
+                    if (not self.DIRECTED and not attrs):
+                        attrs = attributes.get((neighbor, node), [])
+                    label = record.pop(self.LABEL_ATTRIBUTE_NAME, self.DEFAULT_LABEL)
+                    if (label != self.DEFAULT_LABEL):
+                        labels[len(weights)] = label
+                    if (attrs):
+                        edge_attr[len(weights)] = attrs
+                    weights.append(record.pop(self.WEIGHT_ATTRIBUTE_NAME, self.DEFAULT_WEIGHT))
+                    if (record):
+                        extra[len(weights) - 1] = record
+            offsets.append(len(targets))
+        node_attr = dict((i, node_attributes[node]) for i, node in enumerate(nodes)
+                         if (node_attributes.get(node)))
+        
+        incidence = None
+        if (self.DIRECTED):
+            incident = state.pop('node_incidence')
+            in_offsets = [0]
+            sources = []
+            for node in nodes:
+                sources.extend(index[each] for each in incident[node])
+                in_offsets.append(len(sources))
+            incidence = (in_offsets, sources)
+        
+        state['_packed'] = (nodes, offsets, targets, incidence, weights, labels, extra, edge_attr,
+                            node_attr)
+    
+    def _memory_tables(self):
+        """
+        Return the labeling tables, grouped by component.
+        
+        @rtype:  list
+        @return: List of C{(component, tables)} pairs.
+        """
+        return [('edge_properties', [self.edge_properties]),
+                ('edge_attr', [self.edge_attr]),
+                ('node_attr', [self.node_attr, self.node_attr_columns])]
+    
+    def _edge_batch_properties(self, count, weights, labels):
+        """
+        Return the weights and labels for a batch of edges, using the defaults where omitted.
+        
+        @type  count: number
+        @param count: Number of edges in the batch.
+        
+        @type  weights: list
+        @param weights: List of edge weights or None.
+        
+        @type  labels: list
+        @param labels: List of edge labels or None.
+        
+        @rtype:  tuple
+        @return: A tuple containing the list of weights and the list of labels.
+        """
+        if weights is None:
+            weights = [self.DEFAULT_WEIGHT] * count
+        else:
+            weights = list(weights)
+        if labels is None:
+            labels = [self.DEFAULT_LABEL] * count
+        else:
+            labels = list(labels)
+        if (len(weights) != count or len(labels) != count):
+            raise AdditionError("Expected %d weights and labels, got %d and %d"
+                                % (count, len(weights), len(labels)))
+        return weights, labels
+            
+    @mutator
     def add_edge_attribute(self, edge, attr):
         """
         Add attribute to the given edge.
@@ -135,11 +594,10 @@ class labeling( object ):
         @type  attr: tuple
         @param attr: Node attribute specified as a tuple in the form (attribute, value).
         """
-        self.edge_attr[edge] = self.edge_attributes(edge) + [attr]
-        
-        if (not self.DIRECTED and edge[0] != edge[1]):
-            self.edge_attr[(edge[1],edge[0])] = self.edge_attributes((edge[1], edge[0])) + [attr]
+        key = self._edge_key(edge)
+        self.edge_attr[key] = self.edge_attributes(key) + [attr]
     
+    @mutator
     def add_edge_attributes(self, edge, attrs):
         """
         Append a sequence of attributes to the given edge
@@ -154,6 +612,7 @@ class labeling( object ):
             self.add_edge_attribute(edge, attr)
     
     
+    @mutator
     def add_node_attribute(self, node, attr):
         """
         Add attribute to the given node.
@@ -165,6 +624,7 @@ class labeling( object ):
         @param attr: Node attribute specified as a tuple in the form (attribute, value).
         """
         self.node_attr[node] = self.node_attr[node] + [attr]
+        self._index_node_attributes(node, [attr])
 
 
     def node_attributes(self, node):
@@ -180,6 +640,39 @@ class labeling( object ):
         return self.node_attr[node]
 
 
+    def node_attribute_column(self, name):
+        """
+        Return the value of the given attribute for every node that has it.
+        
+        Attributes are also stored by name, one column per attribute, so this does not need to
+        look at the attributes of each node. When a node has the same attribute more than once,
+        the first value is used.
+        
+        @type  name: string
+        @param name: Attribute name.
+        
+        @rtype:  dictionary
+        @return: Pairing that associates each node having the attribute to its value.
+        """
+        return dict(self.node_attr_columns.get(name, {}))
+
+
+    def nodes_with_attribute(self, name, value):
+        """
+        Return the nodes whose given attribute has the given value.
+        
+        @type  name: string
+        @param name: Attribute name.
+        
+        @type  value: object
+        @param value: Attribute value.
+        
+        @rtype:  list
+        @return: List of nodes.
+        """
+        return [ node for node, each in self.node_attr_columns.get(name, {}).items() if each == value ]
+
+
     def edge_attributes(self, edge):
         """
         Return the attributes of the given edge.
@@ -191,7 +684,7 @@ class labeling( object ):
         @return: List of attributes specified tuples in the form (attribute, value).
         """
         try:
-            return self.edge_attr[edge]
+            return self.edge_attr[self._edge_key(edge)]
         except KeyError:
             return []
 
@@ -205,23 +698,4 @@ class labeling( object ):
         @rtype: boolean
         @return: Whether this graph and the other are equal.
         """
-        def attrs_eq(list1, list2):
-            for each in list1:
-                if (each not in list2): return False
-            for each in list2:
-                if (each not in list1): return False
-            return True
-        
-        def edges_eq():
-            for edge in self.edges():
-                if (self.edge_weight(edge) != other.edge_weight(edge)): return False
-                if (self.edge_label(edge) != other.edge_label(edge)): return False
-                if (not attrs_eq(self.edge_attributes(edge), other.edge_attributes(edge))): return False 
-            return True
-        
-        def nodes_eq():
-            for node in self:
-                if (not attrs_eq(self.node_attributes(node), other.node_attributes(node))): return False 
-            return True
-        
-        return nodes_eq() and edges_eq()
\ No newline at end of file
+        return _labeling_eq(self, other)
\ No newline at end of file
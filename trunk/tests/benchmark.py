@@ -0,0 +1,186 @@
+# Copyright (c) 2012 Pedro Matiello <pmatiello@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+
+"""
+Benchmarks for python-graph.
+
+Run all of them with C{make benchmark} or choose some by name:
+
+    python benchmark.py edges
+"""
+
+
+# Imports
+import sys
+sys.path.append('..')
+from pygraph.classes.graph import graph
+from pygraph.classes.digraph import digraph
+from random import seed, choice, shuffle
+from time import time
+
+
+# Configuration
+random_seed = 1
+sizes = [(10000, 3), (20000, 5)]     # Number of nodes, edges added per node
+
+
+# Helpers
+
+def power_law_edges(num_nodes, m):
+    """
+    Return the edges of a random graph built by preferential attachment (Barabasi-Albert).
+    
+    Node degrees follow a power law, so a few hubs accumulate a large share of the edges.
+    
+    @type  num_nodes: number
+    @param num_nodes: Number of nodes.
+    
+    @type  m: number
+    @param m: Number of edges added with each new node.
+    
+    @rtype:  list
+    @return: List of edges.
+    """
+    seed(random_seed)
+    edges = []
+    endpoints = list(range(m))     # Each node appears here once per incident edge
+    for node in range(m, num_nodes):
+        targets = set()
+        while (len(targets) < m):
+            targets.add(choice(endpoints))
+        for other in targets:
+            edges.append((node, other))
+            endpoints.append(other)
+            endpoints.append(node)
+    return edges
+
+
+def star_edges(num_nodes):
+    """
+    Return the edges of a star: a single hub linked to every other node.
+    
+    @type  num_nodes: number
+    @param num_nodes: Number of nodes.
+    
+    @rtype:  list
+    @return: List of edges.
+    """
+    return [(0, each) for each in range(1, num_nodes)]
+
+
+def report(name, count, elapsed):
+    """
+    Print a throughput line.
+    """
+    print("    %-40s %10d ops  %8.3fs  %12.0f ops/s" % (name, count, elapsed, count / max(elapsed, 1e-9)))
+
+
+# Benchmarks
+
+def bench_edges():
+    """
+    Edge addition and removal throughput on power-law and star graphs.
+    """
+    workloads = [("power-law n=%d m=%d" % (n, m), n, power_law_edges(n, m)) for n, m in sizes]
+    workloads.append(("star n=%d" % sizes[-1][0], sizes[-1][0], star_edges(sizes[-1][0])))
+    
+    for cls in (graph, digraph):
+        for name, num_nodes, edges in workloads:
+            print("  %s, %s" % (cls.__name__, name))
+            gr = cls()
+            gr.add_nodes(range(num_nodes))
+            
+            start = time()
+            for edge in edges:
+                gr.add_edge(edge)
+            report("add_edge", len(edges), time() - start)
+            
+            start = time()
+            for edge in edges:
+                gr.has_edge(edge)
+            report("has_edge", len(edges), time() - start)
+            
+            removed = list(edges)
+            shuffle(removed)
+            start = time()
+            for edge in removed:
+                gr.del_edge(edge)
+            report("del_edge", len(edges), time() - start)
+            
+            for edge in edges:
+                gr.add_edge(edge)
+            start = time()
+            for node in range(num_nodes):
+                gr.del_node(node)
+            report("del_node", num_nodes, time() - start)
+
+
+def bench_bulk():
+    """
+    Bulk addition of nodes and edges compared to adding them one by one.
+    """
+    for cls in (graph, digraph):
+        for n, m in sizes:
+            edges = power_law_edges(n, m)
+            weights = list(range(len(edges)))
+            print("  %s, power-law n=%d m=%d" % (cls.__name__, n, m))
+            
+            gr = cls()
+            start = time()
+            for node in range(n):
+                gr.add_node(node)
+            report("add_node", n, time() - start)
+            start = time()
+            for edge, wt in zip(edges, weights):
+                gr.add_edge(edge, wt)
+            report("add_edge", len(edges), time() - start)
+            
+            gr = cls()
+            start = time()
+            gr.add_nodes(range(n))
+            report("add_nodes", n, time() - start)
+            start = time()
+            gr.add_edges(edges, weights)
+            report("add_edges", len(edges), time() - start)
+
+
+benchmarks = [ ('edges', bench_edges),
+               ('bulk', bench_bulk) ]
+
+
+def main():
+    selected = sys.argv[1:]
+    print ("")
+    print ("--------------------------------------------------")
+    print ("python-graph benchmarks")
+    print ("--------------------------------------------------")
+    print ("")
+    for name, function in benchmarks:
+        if (not selected or name in selected):
+            print ("%s: %s" % (name, function.__doc__.strip()))
+            function()
+            print ("")
+
+if __name__ == "__main__":
+    main()
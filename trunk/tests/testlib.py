@@ -70,3 +70,32 @@ def new_hypergraph():
 def new_uniform_hypergraph(_r):
     seed(random_seed)
     return generate_hypergraph(num_nodes[use_size], num_edges[use_size], r = _r)
+
+def tree_weight(gr, tree):
+    sum = 0
+    for each in tree:
+        if (tree[each] is not None):
+            sum = sum + gr.edge_weight((each, tree[each]))
+    return sum
+
+def assert_spanning_tree(gr, st):
+    for each in st:
+        if (st[each] is not None):
+            assert gr.has_edge((st[each], each))
+
+def induced(gr, nodes):
+    sub = gr.__class__()
+    sub.add_nodes(nodes)
+    for edge in gr.edges():
+        if (edge[0] in nodes and edge[1] in nodes and not sub.has_edge(edge)):
+            sub.add_edge(edge, gr.edge_weight(edge), gr.edge_label(edge))
+    return sub
+
+def graph_likes(gr):
+    # Pairs of read-only objects built over gr and the graphs they should behave as
+    yield gr.freeze(), gr
+    nodes = [node for node in gr if node % 3 != 2]
+    yield gr.subgraph_view(nodes), induced(gr, nodes)
+    if (gr.DIRECTED):
+        yield gr.reversed_view(), gr.reverse()
+    yield gr.complement_view(), gr.inverse()
@@ -147,6 +147,15 @@ class test_accessibility(unittest.TestCase):
                 else:
                     assert m not in depth_first_search(gr, n)[0]
 
+    def test_accessibility_and_connected_components_with_interning(self):
+        for gr in [testlib.new_graph(), testlib.new_digraph(), testlib.new_hypergraph()]:
+            access = accessibility(gr)
+            cc = connected_components(gr) if not gr.DIRECTED else None
+            gr.enable_interning()
+            assert accessibility(gr) == access
+            if (cc is not None):
+                assert connected_components(gr) == cc
+    
     def test_connected_components_on_very_deep_graph(self):
         gr = pygraph.classes.graph.graph()
         gr.add_nodes(range(0,5001))
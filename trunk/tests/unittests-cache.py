@@ -0,0 +1,115 @@
+# Copyright (c) 2012 Pedro Matiello <pmatiello@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+
+
+"""
+Unittests for graph.algorithms.cache
+"""
+
+
+import unittest
+import testlib
+from pygraph.classes.graph import graph
+from pygraph.algorithms.cache import cached, resultcache
+from pygraph.algorithms.accessibility import accessibility, connected_components
+from pygraph.algorithms.minmax import shortest_path
+from pygraph.algorithms.pagerank import pagerank
+
+
+class test_cache(unittest.TestCase):
+    
+    def test_results_are_reused(self):
+        gr = testlib.new_graph()
+        sp = cached(shortest_path)
+        first = sp(gr, 0)
+        assert sp(gr, 0) is first
+        assert sp(gr, source=0) == first
+        assert sp(gr, 1) == shortest_path(gr, 1)
+        assert sp.cache.stats() == {'hits': 1, 'misses': 3, 'invalidations': 0,
+                                    'evictions': 0, 'size': 3, 'maxsize': 128}
+        assert sp.__name__ == 'shortest_path'
+    
+    def test_changes_invalidate_results(self):
+        gr = graph()
+        gr.add_nodes([0, 1, 2])
+        gr.add_edge((0, 1))
+        cc = cached(connected_components)
+        assert cc(gr)[2] != cc(gr)[0]
+        gr.add_edge((1, 2))
+        assert cc(gr)[2] == cc(gr)[0]
+        gr.set_edge_weight((1, 2), 3)
+        cc(gr)
+        stats = cc.cache.stats()
+        assert stats['hits'] == 2
+        assert stats['invalidations'] == 2
+        assert stats['size'] == 1
+    
+    def test_graphs_are_cached_separately(self):
+        gr1 = testlib.new_digraph()
+        gr2 = testlib.new_digraph()
+        gr2.del_node(0)
+        acc = cached(accessibility)
+        assert 0 in acc(gr1)
+        assert 0 not in acc(gr2)
+    
+    def test_least_recently_used_results_are_evicted(self):
+        gr = testlib.new_digraph()
+        pr = cached(pagerank, maxsize=2)
+        pr(gr, 0.85)
+        pr(gr, 0.5)
+        pr(gr, 0.85)
+        pr(gr, 0.6)
+        assert len(pr.cache) == 2
+        assert pr.cache.evictions == 1
+        pr(gr, 0.85)
+        assert pr.cache.hits == 2
+    
+    def test_shared_cache(self):
+        cache = resultcache(maxsize=10)
+        sp = cached(shortest_path, cache=cache)
+        
+        @cached(cache=cache)
+        def order(gr):
+            return len(gr)
+        
+        gr = testlib.new_graph()
+        sp(gr, 0)
+        order(gr)
+        order(gr)
+        assert len(cache) == 2
+        assert cache.hits == 1
+        cache.clear()
+        assert len(cache) == 0
+    
+    def test_unhashable_arguments_are_not_cached(self):
+        gr = testlib.new_graph()
+        sp = cached(shortest_path)
+        sp(gr, 0, targets=[1, 2])
+        sp(gr, 0, targets=[1, 2])
+        assert sp.cache.misses == 2
+        assert len(sp.cache) == 0
+
+
+if __name__ == "__main__":
+    unittest.main()
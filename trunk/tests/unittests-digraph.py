@@ -35,6 +35,7 @@ from pygraph.classes.digraph import digraph
 from pygraph.classes.graph import graph
 import testlib
 from copy import copy, deepcopy
+from pickle import dumps, loads
 
 class test_digraph(unittest.TestCase):
 
@@ -71,8 +72,8 @@ class test_digraph(unittest.TestCase):
             pass
         else:
             self.fail("The graph allowed an edge to be added from a non-existing node.")
-        assert gr.node_neighbors == {0: [], 1: []}
-        assert gr.node_incidence == {0: [], 1: []}
+        assert gr.node_neighbors == {0: {}, 1: {}}
+        assert gr.node_incidence == {0: {}, 1: {}}
     
     def test_raise_exception_when_edge_added_to_non_existing_node(self):
         gr = digraph()
@@ -83,8 +84,8 @@ class test_digraph(unittest.TestCase):
             pass
         else:
             self.fail("TThe graph allowed an edge to be added to a non-existing node.")
-        assert gr.node_neighbors == {0: [], 1: []}
-        assert gr.node_incidence == {0: [], 1: []}
+        assert gr.node_neighbors == {0: {}, 1: {}}
+        assert gr.node_incidence == {0: {}, 1: {}}
     
     def test_remove_node(self):
         gr = testlib.new_digraph()
@@ -107,8 +108,86 @@ class test_digraph(unittest.TestCase):
         gr.del_node(0)
 
     
+    # Bulk addition
+    
+    def test_add_nodes_is_atomic(self):
+        gr = digraph()
+        gr.add_nodes([0, 1])
+        self.assertRaises(AdditionError, gr.add_nodes, [2, 3, 1])
+        assert gr.nodes() == [0, 1]
+        assert gr.node_incidence == {0: {}, 1: {}}
+    
+    def test_add_edges_is_equivalent_to_add_edge(self):
+        edges = [(0, 1), (1, 0), (1, 2), (2, 2), (3, 0)]
+        gr1 = digraph()
+        gr1.add_nodes(range(4))
+        for i, edge in enumerate(edges):
+            gr1.add_edge(edge, wt=i, label=str(i))
+        gr2 = digraph()
+        gr2.add_nodes(range(4))
+        gr2.add_edges(edges, weights=range(5), labels=[str(i) for i in range(5)])
+        assert gr1 == gr2
+        assert gr2.edge_weight((1, 0)) == 1
+        assert gr2.incidents(0) == [1, 3]
+    
+    def test_add_edges_is_atomic(self):
+        gr = digraph()
+        gr.add_nodes(range(3))
+        gr.add_edge((0, 1))
+        self.assertRaises(AdditionError, gr.add_edges, [(1, 0), (0, 1)])
+        self.assertRaises(AdditionError, gr.add_edges, [(1, 2), (1, 2)])
+        self.assertRaises(AdditionError, gr.add_edges, [(1, 2), (2, 7)])
+        assert gr.edges() == [(0, 1)]
+        assert gr.incidents(0) == []
+    
+    def test_version_and_journal(self):
+        gr = digraph()
+        gr.enable_journal()
+        gr.add_nodes([0, 1])
+        gr.add_edges([(0, 1), (1, 0)], weights=[1, 2])
+        gr.del_edge((1, 0))
+        gr.add_edge_attribute((0, 1), ('key', 'value'))
+        self.assertRaises(AdditionError, gr.add_edges, [(0, 1)])
+        assert gr.version == 4
+        assert [op for op, args, kwargs in gr.changes_since(0)] == \
+               ['add_nodes', 'add_edges', 'del_edge', 'add_edge_attribute']
+        assert gr.reversed_view().version == 4
+    
     # Invert graph
     
+    def test_pickle(self):
+        gr = testlib.new_digraph(wt_range=(1, 10))
+        gr.add_node('a')
+        gr.add_edge((1, 'a'), wt=0.5, label='x', attrs=[('color', 'red')])
+        gr.add_edge((0, 'a'))
+        gr2 = loads(dumps(gr))
+        assert gr2 == gr
+        for node in gr:
+            assert gr2.neighbors(node) == gr.neighbors(node)
+            assert gr2.incidents(node) == gr.incidents(node)
+        assert gr2.edge_weight((1, 'a')) == 0.5
+        assert len(dumps(gr)) * 2 < len(dumps(gr.__dict__))
+    
+    def test_load_state_of_earlier_releases(self):
+        # Digraphs pickled by releases up to 1.8 kept their tables as they were
+        state = {'node_neighbors': {'a': ['b', 'c'], 'b': ['a'], 'c': []},
+                 'node_incidence': {'a': ['b'], 'b': ['a'], 'c': ['a']},
+                 'edge_properties': {('a', 'b'): {'weight': 2, 'label': 'x'},
+                                     ('b', 'a'): {'weight': 3, 'label': ''},
+                                     ('a', 'c'): {'weight': 1, 'label': ''}},
+                 'edge_attr': {('b', 'a'): [('color', 'red')]},
+                 'node_attr': {'a': [], 'b': [], 'c': []}}
+        gr = digraph.__new__(digraph)
+        gr.__setstate__(state)
+        assert gr.neighbors('a') == ['b', 'c']
+        assert gr.incidents('c') == ['a']
+        assert gr.edge_weight(('a', 'b')) == 2
+        assert gr.edge_weight(('b', 'a')) == 3
+        assert gr.edge_label(('a', 'b')) == 'x'
+        assert gr.edge_attributes(('b', 'a')) == [('color', 'red')]
+        assert gr.edge_attributes(('a', 'b')) == []
+        assert loads(dumps(gr)) == gr
+    
     def test_invert_digraph(self):
         gr = testlib.new_digraph()
         inv = gr.inverse()
@@ -181,6 +260,21 @@ class test_digraph(unittest.TestCase):
         self.assertTrue(gr1.nodes() == gr1c.nodes())
         self.assertTrue(gr1.edges() == gr1c.edges())
     
+    def test_merge_graph_into_digraph(self):
+        d = digraph()
+        d.add_nodes(['A', 'B'])
+        d.add_edge(('A', 'B'), wt=2)
+        g = graph()
+        g.add_nodes(['A', 'B', 'C'])
+        g.add_edge(('A', 'B'), wt=3, label='x')
+        g.add_edge(('B', 'C'), wt=4)
+        d.merge(g, conflict='sum')
+        assert d.edge_weight(('A', 'B')) == 5
+        assert d.edge_weight(('B', 'A')) == 3
+        assert d.edge_label(('B', 'A')) == 'x'
+        assert d.edge_weight(('C', 'B')) == 4
+        assert sorted(d.incidents('B')) == ['A', 'C']
+    
     def test_add_graph_into_diagraph(self):
         d = digraph()
         g = graph()
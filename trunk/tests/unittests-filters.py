@@ -31,6 +31,9 @@ Unit tests for python-graph
 import unittest
 import pygraph
 from pygraph.algorithms.searching import depth_first_search, breadth_first_search
+from pygraph.algorithms.searching import weighted_search
+from pygraph.algorithms.minmax import shortest_path
+from sys import getrecursionlimit
 from pygraph.classes.graph import graph
 
 from pygraph.algorithms.filters.radius import radius
@@ -92,6 +95,51 @@ class test_find_filter(unittest.TestCase):
         assert 'dont-find-me' not in st
 
 
+    def test_search_stops_at_target(self):
+        calls = []
+        class counting_find(find):
+            def __call__(self, node, parent):
+                calls.append(node)
+                return find.__call__(self, node, parent)
+        for gr in [testlib.new_graph(), testlib.new_digraph()]:
+            for search in [breadth_first_search, depth_first_search, weighted_search]:
+                del calls[:]
+                ft = counting_find(5)
+                result = search(gr, filter=ft)
+                st, order = result[0], result[1]
+                assert ft.done
+                assert calls[-1] == 5
+                assert order[-1] == 5
+                assert len(calls) <= sum(len(gr.neighbors(node)) for node in st) + len(st)
+    
+    def test_reused_filter(self):
+        gr = testlib.new_graph()
+        ft = find(5)
+        first = breadth_first_search(gr, root=0, filter=ft)
+        assert breadth_first_search(gr, root=0, filter=ft) == first
+    
+    def test_dfs_postorder_after_stop(self):
+        gr = graph()
+        gr.add_nodes(range(5))
+        gr.add_edges([(0, 1), (1, 2), (2, 3), (1, 4)])
+        st, pre, post = depth_first_search(gr, root=0, filter=find(3))
+        assert st == {0: None, 1: 0, 2: 1, 3: 2}
+        assert pre == [0, 1, 2, 3]
+        assert post == [3, 2, 1, 0]
+    
+    def test_stop_at_root(self):
+        gr = testlib.new_graph()
+        for search in [breadth_first_search, depth_first_search, weighted_search]:
+            result = search(gr, filter=find(gr.nodes()[0]))
+            assert result[0] == {gr.nodes()[0]: None}
+    
+    def test_stop_with_interning(self):
+        gr = testlib.new_digraph()
+        expected = breadth_first_search(gr, filter=find(5))
+        gr.enable_interning()
+        assert breadth_first_search(gr, filter=find(5)) == expected
+    
+    
 class test_radius_filter(unittest.TestCase):
 
     def testbfs_in_empty_graph(self):
@@ -134,6 +182,33 @@ class test_radius_filter(unittest.TestCase):
         for each in st:
             assert (st[each] == None or st[each] == 0
                     or st[st[each]] == 0 or st[st[st[each]]] == 0)
+    
+    def test_costs_follow_spanning_tree(self):
+        for gr in [testlib.new_graph(), testlib.new_digraph()]:
+            for search in [breadth_first_search, depth_first_search]:
+                ft = radius(10)
+                st = search(gr, root=0, filter=ft)[0]
+                assert set(ft.cost) == set(st)
+                for each in st:
+                    if (st[each] is None):
+                        assert ft.cost[each] == 0
+                    else:
+                        assert ft.cost[each] == ft.cost[st[each]] + gr.edge_weight((st[each], each))
+                    assert ft.cost[each] <= 10
+    
+    def test_very_deep_graph(self):
+        gr = graph()
+        gr.add_nodes(range(0, 5 * getrecursionlimit()))
+        gr.add_edges((i, i+1) for i in range(0, 5 * getrecursionlimit() - 1))
+        st, lo = breadth_first_search(gr, root=0, filter=radius(len(gr) - 11))
+        assert len(st) == len(gr) - 10
+    
+    def test_weighted_search(self):
+        for gr in [testlib.new_graph(), testlib.new_digraph()]:
+            st, lo, dist = weighted_search(gr, root=0, filter=radius(20), distances=True)
+            expected = shortest_path(gr, 0, max_distance=20)[1]
+            assert dist == expected
+            assert [dist[each] for each in lo] == sorted(expected.values())
             
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,166 @@
+# Copyright (c) 2012 Pedro Matiello <pmatiello@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+
+
+"""
+Unittests for graph.classes.frozengraph
+"""
+
+
+import unittest
+import testlib
+from pickle import dumps, loads
+from pygraph.classes.graph import graph
+from pygraph.classes.digraph import digraph
+from pygraph.classes.frozengraph import frozengraph
+
+
+class test_frozengraph(unittest.TestCase):
+    
+    def test_freeze_graph(self):
+        gr = testlib.new_graph(wt_range=(1,10))
+        fr = gr.freeze()
+        assert isinstance(fr, frozengraph)
+        assert not fr.DIRECTED
+        assert fr == gr
+        assert gr == fr
+        assert fr.order() == gr.order()
+        assert sorted(fr.edges()) == sorted(gr.edges())
+        for node in gr:
+            assert sorted(fr.neighbors(node)) == sorted(gr.neighbors(node))
+            assert fr.node_order(node) == gr.node_order(node)
+            for other in gr[node]:
+                assert fr.edge_weight((node, other)) == gr.edge_weight((node, other))
+    
+    def test_freeze_digraph(self):
+        gr = testlib.new_digraph(wt_range=(1,10))
+        fr = gr.freeze()
+        assert fr.DIRECTED
+        assert fr == gr
+        assert gr == fr
+        for node in gr:
+            assert sorted(fr.neighbors(node)) == sorted(gr.neighbors(node))
+            assert sorted(fr.incidents(node)) == sorted(gr.incidents(node))
+        for edge in gr.edges():
+            assert fr.has_edge(edge)
+            assert fr.edge_weight(edge) == gr.edge_weight(edge)
+        assert not fr.has_edge(('invalid', 0))
+    
+    def test_freeze_keeps_labels_and_attributes(self):
+        gr = graph()
+        gr.add_nodes(['a', 'b', 'c'])
+        gr.add_node_attribute('a', ('position', (0, 1)))
+        gr.add_edge(('a', 'b'), wt=2.5, label='road', attrs=[('lanes', 2)])
+        gr.add_edge(('b', 'c'))
+        gr.add_edge(('c', 'c'))
+        fr = gr.freeze()
+        assert fr.node_attributes('a') == [('position', (0, 1))]
+        assert fr.node_attributes('b') == []
+        assert fr.edge_weight(('b', 'a')) == 2.5
+        assert fr.edge_label(('b', 'a')) == 'road'
+        assert fr.edge_attributes(('a', 'b')) == [('lanes', 2)]
+        assert fr.edge_label(('b', 'c')) == ''
+        assert fr.has_edge(('c', 'c'))
+        assert fr == gr
+    
+    def test_equality_compares_attributes_as_sets(self):
+        gr1 = graph()
+        gr1.add_node('a', attrs=[('color', 'red'), ('color', 'red')])
+        gr2 = graph()
+        gr2.add_node('a', attrs=[('color', 'red')])
+        assert gr1.freeze() == gr2
+        assert gr2 == gr1.freeze()
+        assert gr1.freeze() == gr2.freeze()
+    
+    def test_freeze_is_a_snapshot(self):
+        gr = testlib.new_graph()
+        fr = gr.freeze()
+        gr.del_node(0)
+        assert fr.has_node(0)
+        assert fr != gr
+    
+    def test_integer_node_ids(self):
+        gr = testlib.new_digraph()
+        fr = gr.freeze()
+        for node in gr:
+            i = fr.node_id(node)
+            assert fr.node_table[i] == node
+            assert [fr.node_table[j] for j in fr.neighbor_ids(i)] == fr.neighbors(node)
+    
+    def test_freeze_keeps_neighbor_order(self):
+        for gr in (graph(), digraph()):
+            gr.add_nodes(range(5))
+            for edge in [(0, 4), (0, 1), (0, 3), (2, 0), (3, 1), (4, 2)]:
+                gr.add_edge(edge, wt=edge[1])
+            fr = gr.freeze()
+            for node in gr:
+                assert fr.neighbors(node) == gr.neighbors(node)
+                if (gr.DIRECTED):
+                    assert fr.incidents(node) == gr.incidents(node)
+                for each in gr.neighbors(node):
+                    assert fr.edge_weight((node, each)) == gr.edge_weight((node, each))
+    
+    def test_freeze_keeps_weight_types(self):
+        gr = graph()
+        gr.add_nodes(['a', 'b', 'c'])
+        gr.add_edge(('a', 'b'), wt=1)
+        gr.add_edge(('b', 'c'), wt=2.5)
+        fr = gr.freeze()
+        assert type(fr.edge_weight(('a', 'b'))) is int
+        assert type(fr.edge_weight(('b', 'c'))) is float
+        assert fr.edge_weight(('a', 'b')) == 1
+        assert fr.edge_weight(('c', 'b')) == 2.5
+    
+    def test_memory_report(self):
+        for gr in [testlib.new_graph(), testlib.new_digraph()]:
+            report = gr.freeze().memory_report()
+            assert report['total'] < gr.memory_report()['total']
+            assert report['adjacency'] > 0
+    
+    def test_pickle_leaves_out_caches(self):
+        fr = testlib.new_graph().freeze()
+        fr.interned()
+        # Stands for a fingerprint computed in another process, with another hash seed
+        fr._fingerprint = (fr.version, fr.fingerprint() + 1)
+        loaded = loads(dumps(fr))
+        assert loaded._interned is None
+        assert loaded == testlib.new_graph().freeze()
+    
+    def test_thaw(self):
+        for gr in (testlib.new_graph(wt_range=(1,10)), testlib.new_digraph(wt_range=(1,10))):
+            thawed = gr.freeze().thaw()
+            assert thawed.__class__ == gr.__class__
+            assert thawed == gr
+    
+    def test_reverse(self):
+        gr = testlib.new_digraph()
+        assert gr.freeze().reverse() == gr.reverse()
+    
+    def test_inverse(self):
+        gr = testlib.new_graph()
+        assert gr.freeze().inverse() == gr.inverse()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+# Copyright (c) 2012 Pedro Matiello <pmatiello@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+
+
+"""
+Unittests for graph.classes.frozenhypergraph
+"""
+
+
+import unittest
+import testlib
+from pickle import dumps, loads
+from pygraph.classes.hypergraph import hypergraph
+from pygraph.classes.frozenhypergraph import frozenhypergraph
+from pygraph.algorithms.accessibility import cut_edges, cut_nodes
+
+
+class test_frozenhypergraph(unittest.TestCase):
+    
+    def test_freeze_matches_hypergraph(self):
+        hgr = testlib.new_hypergraph()
+        fr = hgr.freeze()
+        assert isinstance(fr, frozenhypergraph)
+        assert fr.nodes() == hgr.nodes()
+        assert fr.hyperedges() == hgr.hyperedges()
+        for node in hgr.nodes():
+            assert sorted(fr.links(node)) == sorted(hgr.links(node))
+            assert sorted(fr.neighbors(node)) == sorted(hgr.neighbors(node))
+        for edge in hgr.hyperedges():
+            assert sorted(fr.links(edge)) == sorted(hgr.links(edge))
+        assert fr.rank() == hgr.rank()
+        assert fr == hgr
+        assert hgr == fr
+        assert fr.thaw() == hgr
+    
+    def test_degrees_and_sizes(self):
+        hgr = testlib.new_hypergraph()
+        fr = hgr.freeze()
+        degrees = fr.degrees()
+        sizes = fr.sizes()
+        for node in hgr.nodes():
+            assert degrees[fr.node_id(node)] == len(hgr.links(node))
+        for edge in hgr.hyperedges():
+            assert sizes[fr.hyperedge_id(edge)] == len(hgr.links(edge))
+        assert max(sizes) == hgr.rank()
+    
+    def test_csr_layout(self):
+        hgr = hypergraph()
+        hgr.add_nodes(['a', 'b', 'c'])
+        hgr.add_hyperedges(['x', 'y'])
+        hgr.link('a', 'x')
+        hgr.link('c', 'x')
+        hgr.link('c', 'y')
+        fr = hgr.freeze()
+        assert list(fr.node_offsets) == [0, 1, 1, 3]
+        assert list(fr.node_edges) == [0, 0, 1]
+        assert list(fr.edge_offsets) == [0, 2, 3]
+        assert list(fr.edge_nodes) == [0, 2, 2]
+        assert list(fr.neighbor_ids(0)) == [2]
+        assert fr.neighbors('b') == []
+        assert list(fr.degrees()) == [1, 0, 2]
+        assert fr.rank() == 2
+        assert hypergraph().freeze().rank() == 0
+    
+    def test_freeze_keeps_labeling(self):
+        hgr = hypergraph()
+        hgr.add_nodes([0, 1])
+        hgr.add_hyperedge('e')
+        hgr.link(0, 'e')
+        hgr.add_node_attribute(0, ('color', 'red'))
+        hgr.set_edge_weight('e', 3)
+        hgr.set_edge_label('e', 'label')
+        hgr.add_edge_attribute('e', ('key', 'value'))
+        fr = hgr.freeze()
+        assert fr.node_attributes(0) == [('color', 'red')]
+        assert fr.edge_weight('e') == 3
+        assert fr.edge_label('e') == 'label'
+        assert fr.edge_attributes('e') == [('key', 'value')]
+        assert fr.thaw() == hgr
+        hgr.unlink(0, 'e')
+        assert fr != hgr
+        assert fr.links('e') == [0]
+    
+    def test_pickle_leaves_out_caches(self):
+        fr = testlib.new_hypergraph().freeze()
+        fr.graph
+        # Stands for a fingerprint computed in another process, with another hash seed
+        fr._fingerprint = (fr.version, fr.fingerprint() + 1)
+        loaded = loads(dumps(fr))
+        assert loaded._bipartite is None
+        assert loaded == testlib.new_hypergraph().freeze()
+    
+    def test_bipartite_graph(self):
+        hgr = testlib.new_hypergraph()
+        fr = hgr.freeze()
+        assert fr.memory_report()['graph'] == 0
+        assert fr.graph == hgr.graph
+        assert fr.graph is fr.graph
+        assert fr.memory_report()['graph'] > 0
+    
+    def test_cut_nodes_and_edges(self):
+        hgr = hypergraph()
+        hgr.add_nodes(range(6))
+        hgr.add_hyperedges(['a1', 'a2', 'b1', 'b2', 'l'])
+        for edge, nodes in [('a1', [0, 1, 2]), ('a2', [0, 1, 2]), ('b1', [3, 4, 5]),
+                            ('b2', [3, 4, 5]), ('l', [2, 3])]:
+            for node in nodes:
+                hgr.link(node, edge)
+        fr = hgr.freeze()
+        assert sorted(cut_nodes(fr)) == sorted(cut_nodes(hgr)) == [2, 3]
+        assert cut_edges(fr) == cut_edges(hgr) == ['l']
+        hgr = testlib.new_hypergraph()
+        fr = hgr.freeze()
+        assert sorted(cut_nodes(fr)) == sorted(cut_nodes(hgr))
+        assert sorted(cut_edges(fr)) == sorted(cut_edges(hgr))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -30,10 +30,19 @@ Unittests for graph.classes.Graph
 import unittest
 import pygraph
 from pygraph.algorithms.generators import generate
+from pygraph.algorithms.searching import breadth_first_search
 from pygraph.classes.exceptions import AdditionError
 from pygraph.classes.graph import graph
+from pygraph.classes.digraph import digraph
+from pygraph.classes.hypergraph import hypergraph
+from pygraph.mixins.labeling import edge_record
 import testlib
 from copy import copy, deepcopy
+from pickle import dumps, loads, HIGHEST_PROTOCOL
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
 
 class test_graph(unittest.TestCase):
 
@@ -70,7 +79,7 @@ class test_graph(unittest.TestCase):
             pass
         else:
             fail()
-        assert gr.node_neighbors == {0: [], 1: []}
+        assert gr.node_neighbors == {0: {}, 1: {}}
     
     def test_raise_exception_when_edge_added_to_non_existing_node(self):
         gr = graph()
@@ -81,7 +90,7 @@ class test_graph(unittest.TestCase):
             pass
         else:
             fail()
-        assert gr.node_neighbors == {0: [], 1: []}
+        assert gr.node_neighbors == {0: {}, 1: {}}
     
     def test_remove_node(self):
         gr = testlib.new_graph()
@@ -112,10 +121,309 @@ class test_graph(unittest.TestCase):
         assert len(gr.edges()) == 2
         assert gr.neighbors(0) == [1]
         assert gr.neighbors(1) == [0]
-        assert (0,1) in gr.edge_properties.keys()
-        assert (1,0) in gr.edge_properties.keys()
-        assert (0,1) in gr.edge_attr.keys()
-        assert (1,0) in gr.edge_attr.keys()
+        assert list(gr.edge_properties.keys()) == [(0,1)]
+        assert list(gr.edge_attr.keys()) == [(0,1)]
+        assert gr.edge_label((1,0)) == "label"
+        assert gr.edge_attributes((1,0)) == [('key','value')]
+    
+    def test_edge_records(self):
+        gr = graph()
+        gr.add_nodes([0,1])
+        gr.add_edge((0,1), wt=3, label="label")
+        record = gr.get_edge_properties((1,0))
+        assert isinstance(record, edge_record)
+        assert record == {'weight': 3, 'label': "label"}
+        assert record.extra is None
+        gr.set_edge_properties((0,1), color='red')
+        assert record == {'weight': 3, 'label': "label", 'color': 'red'}
+        assert gr.edge_weight((0,1)) == 3
+        del(record['weight'])
+        assert gr.edge_weight((0,1)) == 1
+        assert deepcopy(gr) == gr
+    
+    def test_node_attribute_columns(self):
+        gr = graph()
+        gr.add_node(0, attrs=[('color', 'red'), ('shape', 'box')])
+        gr.add_nodes([1, 2])
+        gr.add_node_attribute(1, ('color', 'blue'))
+        gr.add_node_attribute(2, ('color', 'red'))
+        gr.add_node_attribute(2, ('color', 'green'))
+        assert gr.node_attribute_column('color') == {0: 'red', 1: 'blue', 2: 'red'}
+        assert sorted(gr.nodes_with_attribute('color', 'red')) == [0, 2]
+        assert gr.nodes_with_attribute('shape', 'box') == [0]
+        assert gr.nodes_with_attribute('size', 1) == []
+        assert gr.node_attribute_column('size') == {}
+        gr.del_node(0)
+        assert gr.nodes_with_attribute('color', 'red') == [2]
+        assert gr.node_attribute_column('shape') == {}
+        assert 'shape' not in gr.node_attr_columns
+        assert gr.freeze().node_attribute_column('color') == {1: 'blue', 2: 'red'}
+    
+    def test_version_counts_changes(self):
+        gr = graph()
+        assert gr.version == 0
+        gr.add_nodes([0, 1, 2])
+        gr.add_node(3, attrs=[('color', 'red')])
+        gr.add_edge((0, 1), wt=2, label='a', attrs=[('key', 'value')])
+        assert gr.version == 3
+        gr.set_edge_weight((1, 0), 5)
+        gr.add_node_attribute(0, ('color', 'blue'))
+        gr.del_node(1)
+        assert gr.version == 6
+        self.assertRaises(AdditionError, gr.add_node, 0)
+        gr.edges()
+        gr.edge_weight((0, 2))
+        assert gr.version == 6
+        assert gr.subgraph_view([0]).version == 6
+    
+    def test_fingerprint(self):
+        gr1 = graph()
+        gr1.add_nodes([0, 1, 2])
+        gr1.add_node_attribute(0, ('color', 'red'))
+        gr1.add_node_attribute(0, ('shape', 'box'))
+        gr1.add_edge((0, 1), wt=2)
+        gr1.add_edge((1, 2), label='a', attrs=[('key', 'value')])
+        gr2 = graph()
+        gr2.add_node(2)
+        gr2.add_node(1)
+        gr2.add_node(0, attrs=[('shape', 'box'), ('color', 'red')])
+        gr2.add_edge((2, 1), label='a', attrs=[('key', 'value')])
+        gr2.add_edge((1, 0), wt=2)
+        assert gr1.fingerprint() == gr2.fingerprint()
+        assert gr1 == gr2
+        assert gr1.freeze().fingerprint() == gr1.fingerprint()
+        for change in [lambda gr: gr.set_edge_weight((0, 1), 3),
+                       lambda gr: gr.set_edge_label((0, 1), 'b'),
+                       lambda gr: gr.add_edge_attribute((0, 1), ('key', 'value')),
+                       lambda gr: gr.add_node_attribute(1, ('color', 'red')),
+                       lambda gr: gr.add_node(3),
+                       lambda gr: gr.del_edge((0, 1))]:
+            gr = deepcopy(gr1)
+            change(gr)
+            assert gr.fingerprint() != gr1.fingerprint()
+            assert gr != gr1
+    
+    def test_fingerprint_with_unhashable_attributes(self):
+        gr1 = graph()
+        gr1.add_node(0, attrs=[('position', [0, 1])])
+        gr2 = graph()
+        gr2.add_node(0, attrs=[('position', [0, 1])])
+        assert gr1.fingerprint() == gr2.fingerprint()
+        assert gr1 == gr2
+        gr2.node_attr[0][0][1].append(2)
+        assert gr1 != gr2
+    
+    def test_journal(self):
+        gr = graph()
+        gr.add_node(0)
+        assert gr.journal is None
+        assert gr.changes_since(0) is None
+        gr.enable_journal(maxlen=3)
+        start = gr.version
+        gr.add_nodes(n for n in [1, 2])
+        gr.add_edge((0, 1), wt=2)
+        assert gr.changes_since(start) == [('add_nodes', ([1, 2],), {}),
+                                           ('add_edge', ((0, 1),), {'wt': 2})]
+        assert gr.changes_since(gr.version) == []
+        gr.set_edge_label((0, 1), 'a')
+        gr.del_node(2)
+        assert gr.changes_since(start) is None
+        assert gr.changes_since(gr.version - 1) == [('del_node', (2,), {})]
+        gr.disable_journal()
+        assert gr.changes_since(gr.version) is None
+    
+    def test_journal_replay(self):
+        gr = testlib.new_graph()
+        replica = deepcopy(gr)
+        gr.enable_journal()
+        start = gr.version
+        gr.del_node(0)
+        gr.add_node('a', attrs=[('color', 'red')])
+        gr.add_edge(('a', 1), wt=3, label='x')
+        gr.set_edge_weight((1, 'a'), 4)
+        gr.add_edge_attribute(('a', 1), ('key', 'value'))
+        gr.add_edges(edges=(('a', n) for n in [2, 3]))
+        for op, args, kwargs in gr.changes_since(start):
+            getattr(replica, op)(*args, **kwargs)
+        assert replica == gr
+
+    def test_failed_change_bumps_version(self):
+        gr = graph()
+        gr.enable_journal()
+        gr.add_node('c')
+        gr.enable_interning()
+        assert breadth_first_search(gr) == ({'c': None}, ['c'])
+        try:
+            gr.add_edge(('c', 'c'))
+            gr.add_edge(('c', 'c'))
+        except AdditionError:
+            pass
+        assert gr.version == 2
+        assert len(gr.changes_since(0)) == 2
+        try:
+            gr.add_spanning_tree({'a': 'b', 'b': 'a'})
+        except AdditionError:
+            pass
+        assert gr.has_node('a') and gr.has_node('b')
+        assert gr.version == 3
+        assert gr.changes_since(2) is None
+        assert set(breadth_first_search(gr)[1]) == set(['a', 'b', 'c'])
+
+    @unittest.skipIf(tracemalloc is None, "tracemalloc is not available")
+    def test_edge_records_use_less_memory_than_dicts(self):
+        def traced(build):
+            tracemalloc.start()
+            try:
+                before = tracemalloc.get_traced_memory()[0]
+                objects = build()
+                return tracemalloc.get_traced_memory()[0] - before
+            finally:
+                tracemalloc.stop()
+        records = traced(lambda: [edge_record(2, "label") for i in range(10000)])
+        dicts = traced(lambda: [{'weight': 2, 'label': "label"} for i in range(10000)])
+        assert records * 2 < dicts
+    
+    def test_memory_report(self):
+        gr = graph()
+        nodes = ['node%d' % i for i in range(2000)]
+        gr.add_nodes(nodes)
+        gr.add_edges((nodes[i], nodes[(i * 7 + 1) % 2000]) for i in range(2000) if i % 10)
+        gr.add_node_attribute(nodes[0], ('position', (0, 0)))
+        report = gr.memory_report()
+        assert set(report) == set(['adjacency', 'edge_properties', 'edge_attr', 'node_attr',
+                                   'total'])
+        assert report['total'] == sum(report[key] for key in report if key != 'total')
+        assert report['adjacency'] > report['node_attr'] > report['edge_attr'] > 0
+        gr.add_edge_attribute((nodes[0], nodes[1]), ('color', 'x' * 10000))
+        assert gr.memory_report()['edge_attr'] > report['edge_attr'] + 10000
+        sampled = gr.memory_report(sample=100)
+        assert abs(sampled['adjacency'] - report['adjacency']) < report['adjacency'] * 0.2
+        assert abs(sampled['total'] - gr.memory_report()['total']) < report['total'] * 0.2
+        self.assertRaises(ValueError, gr.memory_report, sample=0)
+    
+    def test_sampled_memory_report_with_integer_nodes(self):
+        # Edges and attributes hold integer objects of their own, equal to the nodes
+        gr = graph()
+        gr.add_nodes(range(5000))
+        edges = set()
+        for i in range(5000):
+            for j in [(i * 7 + 1) % 5000, (i * 13 + 5) % 5000, (i * 31 + 11) % 5000]:
+                if (i != j and (j, i) not in edges):
+                    edges.add((i, j))
+        gr.add_edges(sorted(edges))
+        for i in range(0, 5000, 3):
+            gr.add_node_attribute(i, ('position', (i, i + 1)))
+        report = gr.memory_report()
+        sampled = gr.memory_report(sample=250)
+        # Node objects shared by the rows of several neighbors are counted once per sampled row
+        tolerance = {'adjacency': 0.15, 'total': 0.1}
+        for component in report:
+            error = abs(sampled[component] - report[component])
+            assert error <= report[component] * tolerance.get(component, 0.02)
+    
+    def test_interning(self):
+        gr = graph()
+        gr.add_nodes(['a', 'b', 'c'])
+        gr.add_edge(('a', 'b'), wt=2)
+        gr.add_edge(('c', 'a'), wt=3)
+        assert not gr.interning
+        gr.enable_interning()
+        nodes, ids, rows = gr.interned()
+        assert nodes == ['a', 'b', 'c']
+        assert [nodes[i] for i in rows[ids['a']]] == gr.neighbors('a')
+        assert gr.interned_weights()[ids['a']] == [2, 3]
+        assert gr.interned()[2] is rows
+        gr.del_edge(('a', 'b'))
+        assert gr.interned()[2][ids['a']] == [ids['c']]
+        gr.disable_interning()
+        assert not gr.interning
+    
+    def test_pickle(self):
+        gr = testlib.new_graph(wt_range=(1, 10))
+        gr.add_node('a', attrs=[('position', (0, 1))])
+        gr.add_edge(('a', 0), label='x', attrs=[('color', 'red')])
+        gr.add_edge(('a', 'a'))
+        gr.set_edge_properties((0, 'a'), capacity=3)
+        gr.enable_journal()
+        gr.del_edge(('a', 'a'))
+        gr2 = loads(dumps(gr))
+        assert gr2 == gr
+        for node in gr:
+            assert gr2.neighbors(node) == gr.neighbors(node)
+        assert gr2.get_edge_properties(('a', 0))['capacity'] == 3
+        assert gr2.nodes_with_attribute('position', (0, 1)) == ['a']
+        assert gr2.version == gr.version
+        assert gr2.changes_since(gr.version - 1) == gr.changes_since(gr.version - 1)
+        assert len(dumps(gr)) * 2 < len(dumps(gr.__dict__))
+    
+    def test_load_state_of_earlier_releases(self):
+        # Graphs pickled by releases up to 1.8 kept their tables as they were
+        state = {'node_neighbors': {'a': ['b', 'c'], 'b': ['a'], 'c': ['a', 'c']},
+                 'edge_properties': {('a', 'b'): {'weight': 2, 'label': 'x'},
+                                     ('b', 'a'): {'weight': 2, 'label': 'x'},
+                                     ('a', 'c'): {'weight': 1, 'label': '', 'capacity': 3},
+                                     ('c', 'a'): {'weight': 1, 'label': '', 'capacity': 3},
+                                     ('c', 'c'): {'weight': 0.5, 'label': ''}},
+                 'edge_attr': {('a', 'b'): [('color', 'red')], ('b', 'a'): [('color', 'red')]},
+                 'node_attr': {'a': [('position', (0, 1))], 'b': [], 'c': []}}
+        gr = graph.__new__(graph)
+        gr.__setstate__(state)
+        assert sorted(gr.nodes()) == ['a', 'b', 'c']
+        assert gr.neighbors('a') == ['b', 'c']
+        assert gr.neighbors('c') == ['a', 'c']
+        assert len(gr.edge_properties) == 3
+        assert gr.edge_weight(('b', 'a')) == 2
+        assert gr.edge_label(('b', 'a')) == 'x'
+        assert gr.edge_weight(('c', 'c')) == 0.5
+        assert gr.get_edge_properties(('c', 'a'))['capacity'] == 3
+        assert gr.edge_attributes(('b', 'a')) == [('color', 'red')]
+        assert gr.nodes_with_attribute('position', (0, 1)) == ['a']
+        assert gr.version == 0
+        gr.add_edge(('b', 'c'))
+        assert loads(dumps(gr)) == gr
+    
+    def test_pickle_edge_records(self):
+        record = edge_record(2.5, 'x')
+        record['capacity'] = 3
+        for protocol in range(0, HIGHEST_PROTOCOL + 1):
+            for each in [record, edge_record()]:
+                loaded = loads(dumps(each, protocol))
+                assert type(loaded) is edge_record
+                assert dict(loaded) == dict(each)
+            gr = testlib.new_graph()
+            gr.set_edge_properties(gr.edges()[0], capacity=3)
+            assert loads(dumps(gr, protocol)) == gr
+            assert loads(dumps(gr.__dict__, protocol))['edge_properties'] == gr.edge_properties
+    
+    def test_copy_does_not_share_tables(self):
+        gr = testlib.new_graph()
+        gr.add_node('a', attrs=[('position', (0, 1))])
+        gr2 = copy(gr)
+        assert gr2 == gr
+        gr.add_node_attribute('a', ('size', 2))
+        gr.del_node(0)
+        assert gr2.node_attributes('a') == [('position', (0, 1))]
+        assert gr2.has_node(0)
+    
+    def test_undirected_edge_labeling_is_shared_by_both_orientations(self):
+        gr = graph()
+        gr.add_nodes([0,1,2])
+        gr.add_edge((0,1), wt=3)
+        gr.set_edge_weight((1,0), 5)
+        gr.set_edge_label((1,0), "label")
+        gr.add_edge_attribute((1,0), ('key','value'))
+        assert gr.edge_weight((0,1)) == 5
+        assert gr.edge_label((0,1)) == "label"
+        assert gr.edge_attributes((0,1)) == [('key','value')]
+        assert len(gr.edge_properties) == 1
+        assert len(gr.edge_attr) == 1
+        gr.add_edges([(2,1)], weights=[7])
+        assert gr.edge_weight((1,2)) == 7
+        assert len(gr.edge_properties) == 2
+        gr.del_edge((1,0))
+        assert not gr.has_edge((0,1))
+        assert list(gr.edge_properties.keys()) == [(2,1)]
+        assert gr.edge_attr == {}
     
     def test_edges_between_different_nodes_should_be_a_single_arrow(self):
         gr = graph()
@@ -129,6 +437,53 @@ class test_graph(unittest.TestCase):
         assert len(gr.edge_attr[(0,0)]) == 1
 
     
+    # Bulk addition
+    
+    def test_add_nodes_is_atomic(self):
+        gr = graph()
+        gr.add_nodes([0, 1])
+        try:
+            gr.add_nodes([2, 3, 1])
+        except AdditionError:
+            pass
+        else:
+            fail()
+        assert gr.nodes() == [0, 1]
+        self.assertRaises(AdditionError, gr.add_nodes, [5, 5])
+        assert not gr.has_node(5)
+    
+    def test_add_edges_is_equivalent_to_add_edge(self):
+        edges = [(0, 1), (1, 2), (2, 2), (3, 0)]
+        gr1 = graph()
+        gr1.add_nodes(range(4))
+        for i, edge in enumerate(edges):
+            gr1.add_edge(edge, wt=i, label=str(i))
+        gr2 = graph()
+        gr2.add_nodes(range(4))
+        gr2.add_edges(edges, weights=range(4), labels=[str(i) for i in range(4)])
+        assert gr1 == gr2
+        assert gr2.edge_weight((1, 0)) == 0
+        assert gr2.edge_label((2, 1)) == '1'
+        assert gr2.neighbors(2) == [1, 2]
+    
+    def test_add_edges_with_default_properties(self):
+        gr = graph()
+        gr.add_nodes(range(3))
+        gr.add_edges([(0, 1), (1, 2)])
+        assert gr.edge_weight((1, 0)) == 1
+        assert gr.edge_label((2, 1)) == ''
+    
+    def test_add_edges_is_atomic(self):
+        gr = graph()
+        gr.add_nodes(range(3))
+        gr.add_edge((0, 1))
+        self.assertRaises(AdditionError, gr.add_edges, [(1, 2), (1, 0)])
+        self.assertRaises(AdditionError, gr.add_edges, [(1, 2), (2, 1)])
+        self.assertRaises(KeyError, gr.add_edges, [(1, 2), (2, 7)])
+        self.assertRaises(AdditionError, gr.add_edges, [(1, 2)], weights=[1, 2])
+        assert gr.edges() == [(0, 1), (1, 0)]
+        assert gr.neighbors(2) == []
+    
     # Invert graph
     
     def test_invert_graph(self):
@@ -148,6 +503,14 @@ class test_graph(unittest.TestCase):
     
     # Complete graph
     
+    def test_invert_graph_with_self_loop(self):
+        gr = graph()
+        gr.add_nodes([0, 1, 2])
+        gr.add_edge((0, 0))
+        gr.add_edge((0, 1))
+        inv = gr.inverse()
+        assert sorted(inv.edges()) == [(0, 2), (1, 2), (2, 0), (2, 1)]
+    
     def test_complete_graph(self):
         gr = graph()
         gr.add_nodes(range(10))
@@ -190,6 +553,78 @@ class test_graph(unittest.TestCase):
         self.assertTrue(gr1.edges() == gr1c.edges())
     
     
+    def test_merge(self):
+        gr1 = graph()
+        gr1.add_nodes([0, 1])
+        gr1.add_node(2, attrs=[('color', 'red')])
+        gr1.add_edge((0, 1), wt=2, label='a', attrs=[('key', 'old')])
+        gr2 = graph()
+        gr2.add_nodes([1, 3])
+        gr2.add_node(2, attrs=[('color', 'blue')])
+        gr2.add_node(0)
+        gr2.add_edge((1, 0), wt=5, label='b', attrs=[('key', 'new')])
+        gr2.add_edge((2, 3), wt=4, label='c', attrs=[('key', 'value')])
+        gr2.add_edge((3, 3))
+        
+        kept = deepcopy(gr1)
+        kept.merge(gr2)
+        assert sorted(kept.nodes()) == [0, 1, 2, 3]
+        assert sorted(kept.edges()) == [(0, 1), (1, 0), (2, 3), (3, 2), (3, 3)]
+        assert kept.edge_weight((0, 1)) == 2
+        assert kept.edge_label((1, 0)) == 'a'
+        assert kept.edge_attributes((0, 1)) == [('key', 'old')]
+        assert kept.node_attributes(2) == [('color', 'red')]
+        assert kept.edge_weight((3, 2)) == 4
+        assert kept.edge_label((2, 3)) == 'c'
+        assert kept.edge_attributes((3, 2)) == [('key', 'value')]
+        
+        overwritten = deepcopy(gr1)
+        overwritten.merge(gr2, conflict='overwrite')
+        assert overwritten.edge_weight((0, 1)) == 5
+        assert overwritten.edge_label((0, 1)) == 'b'
+        assert overwritten.edge_attributes((0, 1)) == [('key', 'new')]
+        assert overwritten.node_attributes(2) == [('color', 'blue')]
+        assert overwritten.nodes_with_attribute('color', 'blue') == [2]
+        assert overwritten.nodes_with_attribute('color', 'red') == []
+        
+        summed = deepcopy(gr1)
+        summed.merge(gr2, conflict='sum')
+        assert summed.edge_weight((1, 0)) == 7
+        assert summed.edge_label((1, 0)) == 'a'
+        assert summed.node_attributes(2) == [('color', 'red')]
+        assert summed.version == gr1.version + 1
+        
+        self.assertRaises(AdditionError, summed.merge, gr2, conflict='max')
+    
+    def test_merge_digraph(self):
+        dgr = digraph()
+        dgr.add_nodes([0, 1, 2])
+        dgr.add_edge((0, 1), wt=1, label='a')
+        dgr.add_edge((1, 0), wt=2, label='b')
+        dgr.add_edge((2, 1), wt=3)
+        gr = graph()
+        gr.add_nodes([0, 1])
+        gr.add_edge((0, 1), wt=4)
+        gr.merge(dgr, conflict='sum')
+        assert gr.edge_weight((0, 1)) == 5
+        assert gr.edge_weight((1, 2)) == 3
+        gr = graph()
+        gr.merge(dgr)
+        assert sorted(gr.edges()) == [(0, 1), (1, 0), (1, 2), (2, 1)]
+        assert gr.edge_label((1, 0)) == 'a'
+        assert not hasattr(hypergraph(), 'merge')
+        assert not hasattr(gr.subgraph_view([0]), 'merge')
+    
+    def test_merge_large_graphs(self):
+        gr1 = graph()
+        gr1.add_nodes(range(20000))
+        gr2 = graph()
+        gr2.add_nodes(range(10000, 30000))
+        gr2.add_edges((i, i + 1) for i in range(10000, 29999))
+        gr1.merge(gr2)
+        assert len(gr1) == 30000
+        assert gr1.has_edge((20000, 19999))
+    
     # Add spanning tree
     
     def test_add_spanning_tree(self):
@@ -0,0 +1,128 @@
+# Copyright (c) 2012 Pedro Matiello <pmatiello@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+
+
+"""
+Unittests for algorithms on frozen graphs and graph views
+"""
+
+
+import unittest
+import testlib
+from pygraph.classes.digraph import digraph
+from pygraph.algorithms.accessibility import accessibility, mutual_accessibility
+from pygraph.algorithms.accessibility import connected_components, cut_edges, cut_nodes
+from pygraph.algorithms.critical import critical_path, transitive_edges
+from pygraph.algorithms.cycles import find_cycle
+from pygraph.algorithms.heuristics.chow import chow
+from pygraph.algorithms.minmax import minimal_spanning_tree, shortest_path, heuristic_search
+from pygraph.algorithms.minmax import shortest_path_bellman_ford, maximum_flow, cut_tree
+from pygraph.algorithms.pagerank import pagerank
+from pygraph.algorithms.searching import depth_first_search, breadth_first_search
+from pygraph.algorithms.sorting import topological_sorting
+from pygraph.algorithms.traversal import traversal
+
+
+# helpers
+
+def graph_likes():
+    for gr in (testlib.new_graph(wt_range=(1,10)), testlib.new_digraph(wt_range=(1,10))):
+        for like, plain in testlib.graph_likes(gr):
+            yield like, plain
+
+
+class test_algorithms_on_graph_likes(unittest.TestCase):
+    
+    def test_searching(self):
+        for like, plain in graph_likes():
+            st, pre, post = depth_first_search(like, root=0)
+            assert sorted(st.keys()) == sorted(depth_first_search(plain, root=0)[0].keys())
+            testlib.assert_spanning_tree(plain, st)
+            st, lo = breadth_first_search(like, root=0)
+            assert sorted(st.keys()) == sorted(breadth_first_search(plain, root=0)[0].keys())
+            testlib.assert_spanning_tree(plain, st)
+            assert sorted(traversal(like, 0, 'pre')) == sorted(traversal(plain, 0, 'pre'))
+    
+    def test_accessibility(self):
+        for like, plain in graph_likes():
+            acc = accessibility(plain)
+            for node, reachable in accessibility(like).items():
+                assert sorted(reachable) == sorted(acc[node])
+            assert sorted(map(sorted, mutual_accessibility(like).values())) == \
+                   sorted(map(sorted, mutual_accessibility(plain).values()))
+            if (not like.DIRECTED):
+                cc = connected_components(like)
+                for edge in plain.edges():
+                    assert cc[edge[0]] == cc[edge[1]]
+                assert len(set(cc.values())) == len(set(connected_components(plain).values()))
+                assert sorted(cut_nodes(like)) == sorted(cut_nodes(plain))
+                assert len(cut_edges(like)) == len(cut_edges(plain))
+    
+    def test_cycles_and_sorting(self):
+        dag = digraph()
+        dag.add_nodes(range(6))
+        dag.add_edge((0, 1), wt=3)
+        dag.add_edge((1, 2), wt=1)
+        dag.add_edge((0, 2), wt=1)
+        dag.add_edge((2, 4), wt=2)
+        dag.add_edge((3, 4), wt=9)
+        dag.add_edge((4, 5))
+        for gr in (testlib.new_digraph(), dag):
+            for like, plain in testlib.graph_likes(gr):
+                assert bool(find_cycle(like)) == bool(find_cycle(plain))
+                if (find_cycle(plain)):
+                    continue
+                order = topological_sorting(like)
+                for u, v in plain.edges():
+                    assert order.index(u) < order.index(v)
+                assert critical_path(like) == critical_path(plain)
+                assert sorted(transitive_edges(like)) == sorted(transitive_edges(plain))
+    
+    def test_minmax(self):
+        for like, plain in graph_likes():
+            assert shortest_path(like, 0)[1] == shortest_path(plain, 0)[1]
+            if (like.DIRECTED):
+                assert shortest_path_bellman_ford(like, 0)[1] == \
+                       shortest_path_bellman_ford(plain, 0)[1]
+                assert maximum_flow(like, 0, 1)[1] == maximum_flow(plain, 0, 1)[1]
+            else:
+                assert testlib.tree_weight(plain, minimal_spanning_tree(like, 0)) == \
+                       testlib.tree_weight(plain, minimal_spanning_tree(plain, 0))
+                if (1 in shortest_path(like, 0)[1]):
+                    h = chow(0)
+                    h.optimize(like)
+                    path = heuristic_search(like, 0, 1, h)
+                    assert path[0] == 0 and path[-1] == 1
+                assert len(cut_tree(like)) == len(cut_tree(plain))
+    
+    def test_pagerank(self):
+        for like, plain in graph_likes():
+            if (like.DIRECTED):
+                pr = pagerank(plain)
+                for node, rank in pagerank(like).items():
+                    assert abs(rank - pr[node]) < 0.001
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,211 @@
+# Copyright (c) 2012 Pedro Matiello <pmatiello@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+
+
+"""
+Unittests for graph.classes.graphview
+"""
+
+
+import unittest
+import testlib
+from pygraph.classes.graph import graph
+from pygraph.classes.digraph import digraph
+from pygraph.classes.graphview import graphview, subgraphview, reversedview, complementview
+from pygraph.algorithms.cycles import find_cycle
+from pygraph.algorithms.sorting import topological_sorting
+
+
+# helpers
+
+def views():
+    for gr in (testlib.new_graph(wt_range=(1,10)), testlib.new_digraph(wt_range=(1,10))):
+        nodes = [node for node in gr if node % 3 != 2]
+        yield gr.subgraph_view(nodes), testlib.induced(gr, nodes)
+
+
+class test_subgraphview(unittest.TestCase):
+    
+    def test_view_matches_induced_subgraph(self):
+        for view, sub in views():
+            assert isinstance(view, graphview)
+            assert view.DIRECTED == sub.DIRECTED
+            assert sorted(view.nodes()) == sorted(sub.nodes())
+            assert sorted(view.edges()) == sorted(sub.edges())
+            for node in view:
+                assert sorted(view.neighbors(node)) == sorted(sub.neighbors(node))
+                assert sorted(view[node]) == sorted(sub[node])
+                assert view.node_order(node) == sub.node_order(node)
+            for edge in sub.edges():
+                assert view.has_edge(edge)
+                assert view.edge_weight(edge) == sub.edge_weight(edge)
+            assert view == sub
+            assert sub == view
+            assert view.copy() == sub
+    
+    def test_incidents(self):
+        gr = testlib.new_digraph()
+        view = gr.subgraph_view(range(0, len(gr), 2))
+        for node in view:
+            assert sorted(view.incidents(node)) == \
+                   sorted(each for each in gr.incidents(node) if each % 2 == 0)
+    
+    def test_incidents_in_graph(self):
+        gr = testlib.new_graph()
+        view = gr.subgraph_view(range(0, len(gr), 2))
+        for node in view:
+            assert view.incidents(node) == view.neighbors(node)
+    
+    def test_view_follows_the_graph(self):
+        gr = graph()
+        gr.add_nodes([0, 1, 2, 3])
+        gr.add_edge((0, 1), wt=4)
+        view = gr.subgraph_view([0, 1, 2, 'missing'])
+        assert view.nodes() == [0, 1, 2]
+        assert not view.has_node('missing')
+        gr.add_edge((1, 2))
+        gr.add_edge((2, 3))
+        assert sorted(view.edges()) == [(0, 1), (1, 0), (1, 2), (2, 1)]
+        assert not view.has_edge((2, 3))
+        gr.set_edge_weight((0, 1), 7)
+        assert view.edge_weight((1, 0)) == 7
+        self.assertRaises(KeyError, view.neighbors, 3)
+    
+    def test_cycles_through_outside_nodes(self):
+        gr = digraph()
+        gr.add_nodes(range(3))
+        gr.add_edge((0, 1))
+        gr.add_edge((1, 2))
+        gr.add_edge((2, 0))
+        view = gr.subgraph_view([0, 1])
+        assert find_cycle(gr)
+        assert find_cycle(view) == []
+        assert topological_sorting(view) == [0, 1]
+    
+    def test_view_is_read_only(self):
+        view = testlib.new_graph().subgraph_view([0, 1])
+        assert not hasattr(view, 'add_node')
+        assert not hasattr(view, 'add_edge')
+        assert not hasattr(view, 'del_node')
+    
+    def test_node_attributes(self):
+        gr = graph()
+        gr.add_node(0, attrs=[('color', 'red')])
+        gr.add_node(1, attrs=[('color', 'red')])
+        gr.add_node(2)
+        view = gr.subgraph_view([1, 2])
+        assert view.node_attributes(1) == [('color', 'red')]
+        assert view.node_attribute_column('color') == {1: 'red'}
+        assert view.nodes_with_attribute('color', 'red') == [1]
+    
+    def test_equality_compares_attributes_as_sets(self):
+        gr1 = graph()
+        gr1.add_nodes([0, 1])
+        gr1.add_node_attribute(0, ('color', 'red'))
+        gr1.add_node_attribute(0, ('color', 'red'))
+        gr2 = graph()
+        gr2.add_node(0, attrs=[('color', 'red')])
+        assert gr1.subgraph_view([0]) == gr2
+        assert gr2 == gr1.subgraph_view([0])
+        assert gr1.subgraph_view([0]).copy() == gr2
+
+
+class test_reversedview(unittest.TestCase):
+    
+    def test_view_matches_reverse(self):
+        gr = testlib.new_digraph(wt_range=(1,10))
+        view = gr.reversed_view()
+        rev = gr.reverse()
+        assert isinstance(view, reversedview)
+        assert view.DIRECTED
+        assert sorted(view.edges()) == sorted(rev.edges())
+        for node in gr:
+            assert sorted(view.neighbors(node)) == sorted(rev.neighbors(node))
+            assert sorted(view.incidents(node)) == sorted(rev.incidents(node))
+            assert view.node_order(node) == rev.node_order(node)
+        for edge in rev.edges():
+            assert view.has_edge(edge)
+            assert view.edge_weight(edge) == rev.edge_weight(edge)
+        assert view == rev
+        assert rev == view
+        assert view.reverse() == gr
+    
+    def test_view_follows_the_digraph(self):
+        gr = digraph()
+        gr.add_nodes([0, 1, 2])
+        gr.add_edge((0, 1), wt=4, label='a', attrs=[('key', 'value')])
+        view = gr.reversed_view()
+        assert view.has_edge((1, 0))
+        assert not view.has_edge((0, 1))
+        assert view.edge_weight((1, 0)) == 4
+        assert view.edge_label((1, 0)) == 'a'
+        assert view.edge_attributes((1, 0)) == [('key', 'value')]
+        gr.add_edge((1, 2))
+        assert view.neighbors(2) == [1]
+        assert view.incidents(1) == [2]
+        gr.del_node(0)
+        assert view.nodes() == [1, 2]
+
+
+class test_complementview(unittest.TestCase):
+    
+    def test_view_matches_inverse(self):
+        for gr in (testlib.new_graph(), testlib.new_digraph()):
+            gr.add_edge((0, 0))
+            view = gr.complement_view()
+            inv = gr.inverse()
+            assert isinstance(view, complementview)
+            assert sorted(view.edges()) == sorted(inv.edges())
+            for node in gr:
+                assert sorted(view.neighbors(node)) == sorted(inv.neighbors(node))
+                assert view.node_order(node) == inv.node_order(node)
+                if (gr.DIRECTED):
+                    assert sorted(view.incidents(node)) == sorted(inv.incidents(node))
+            assert not view.has_edge((0, 0))
+            assert view == inv
+            assert inv == view
+    
+    def test_incidents_in_graph(self):
+        gr = testlib.new_graph()
+        view = gr.complement_view()
+        inv = gr.inverse()
+        for node in gr:
+            assert view.incidents(node) == view.neighbors(node)
+            assert sorted(view.incidents(node)) == sorted(inv.neighbors(node))
+    
+    def test_view_follows_the_graph(self):
+        gr = graph()
+        gr.add_nodes([0, 1, 2])
+        gr.add_edge((0, 1), wt=3)
+        view = gr.complement_view()
+        assert sorted(view.neighbors(0)) == [2]
+        assert view.edge_weight((0, 2)) == 1
+        gr.add_edge((0, 2))
+        assert view.neighbors(0) == []
+        assert view.has_edge((2, 1))
+        assert not view.has_edge((2, 'missing'))
+
+
+if __name__ == "__main__":
+    unittest.main()
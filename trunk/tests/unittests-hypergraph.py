@@ -32,8 +32,10 @@ import pygraph
 from pygraph.algorithms.generators import generate
 from pygraph.classes.exceptions import AdditionError
 from pygraph.classes.hypergraph import hypergraph
+from pygraph.classes.graph import graph
 import testlib
 from copy import copy, deepcopy
+from pickle import dumps, loads, HIGHEST_PROTOCOL
 
 class test_hypergraph(unittest.TestCase):
 
@@ -146,6 +148,165 @@ class test_hypergraph(unittest.TestCase):
             assert n in gr
             assert gr.has_node(n)
 
+    def test_add_nodes_is_atomic(self):
+        gr = hypergraph()
+        gr.add_nodes([0, 1])
+        self.assertRaises(AdditionError, gr.add_nodes, [2, 1])
+        assert sorted(gr.nodes()) == [0, 1]
+        assert sorted(gr.graph.nodes()) == [(0, 'n'), (1, 'n')]
+    
+    def test_bipartite_graph_is_built_when_needed(self):
+        gr = hypergraph()
+        gr.add_nodes([0, 1])
+        gr.add_hyperedge('a')
+        gr.link(0, 'a')
+        assert gr._bipartite is None
+        bipartite = gr.graph
+        assert bipartite.nodes() == [(0, 'n'), (1, 'n'), ('a', 'h')]
+        assert bipartite.edges() == [((0, 'n'), ('a', 'h')), (('a', 'h'), (0, 'n'))]
+        assert gr.graph is bipartite
+        gr.link(1, 'a')
+        assert gr.graph is not bipartite
+        assert gr.graph.has_edge(((1, 'n'), ('a', 'h')))
+        gr.del_hyperedge('a')
+        assert gr.graph.edges() == []
+    
+    def test_memory_report(self):
+        gr = testlib.new_hypergraph()
+        report = gr.memory_report()
+        assert report['graph'] == 0
+        assert report['adjacency'] > 0
+        gr.graph
+        assert gr.memory_report()['graph'] > 0
+        assert gr.memory_report()['total'] > report['total']
+    
+    def test_neighbors_are_cached_until_links_change(self):
+        gr = hypergraph()
+        gr.add_nodes([0, 1, 2, 3])
+        gr.add_hyperedges(['a', 'b'])
+        gr.link(0, 'a')
+        gr.link(1, 'a')
+        gr.link(1, 'b')
+        gr.link(2, 'b')
+        assert sorted(gr.neighbors(1)) == [0, 2]
+        assert gr.neighbors(3) == []
+        gr.neighbors(1).append('junk')
+        assert sorted(gr.neighbors(1)) == [0, 2]
+        gr.link(3, 'b')
+        assert sorted(gr.neighbors(1)) == [0, 2, 3]
+        assert sorted(gr.neighbors(2)) == [1, 3]
+        gr.unlink(2, 'b')
+        assert gr.neighbors(2) == []
+        assert sorted(gr.neighbors(3)) == [1]
+        gr.del_node(0)
+        assert sorted(gr.neighbors(1)) == [3]
+        gr.del_hyperedge('b')
+        assert gr.neighbors(1) == []
+        assert gr.neighbors(3) == []
+    
+    def test_materialize_neighbors(self):
+        gr = testlib.new_hypergraph()
+        expected = dict((node, sorted(gr.neighbors(node))) for node in gr.nodes())
+        gr._neighbors.clear()
+        gr.materialize_neighbors()
+        assert sorted(gr._neighbors) == sorted(gr.nodes())
+        for node in gr.nodes():
+            assert sorted(gr.neighbors(node)) == expected[node]
+    
+    def test_pickle(self):
+        hgr = testlib.new_hypergraph()
+        hgr.set_edge_label(hgr.hyperedges()[0], 'x')
+        for protocol in range(0, HIGHEST_PROTOCOL + 1):
+            hgr2 = loads(dumps(hgr, protocol))
+            assert hgr2 == hgr
+            assert hgr2.edge_label(hgr.hyperedges()[0]) == 'x'
+    
+    def test_pickle_leaves_out_caches(self):
+        hgr = testlib.new_hypergraph()
+        hgr.graph
+        hgr.materialize_neighbors()
+        # Stands for a fingerprint computed in another process, with another hash seed
+        hgr._fingerprint = (hgr.version, hgr.fingerprint() + 1)
+        loaded = loads(dumps(hgr))
+        assert loaded._bipartite is None
+        assert loaded._neighbors == {}
+        assert loaded == testlib.new_hypergraph()
+        for node in hgr.nodes():
+            assert sorted(loaded.neighbors(node)) == sorted(hgr.neighbors(node))
+    
+    def test_load_state_of_earlier_releases(self):
+        # Hypergraphs pickled by releases up to 1.8 kept the bipartite graph in their state
+        bipartite = graph()
+        bipartite.add_nodes([('a', 'n'), ('b', 'n'), ('x', 'h')])
+        bipartite.add_edges([(('a', 'n'), ('x', 'h')), (('b', 'n'), ('x', 'h'))])
+        state = {'node_links': {'a': ['x'], 'b': ['x']},
+                 'edge_links': {'x': ['a', 'b']},
+                 'graph': bipartite,
+                 'edge_properties': {'x': {'weight': 2, 'label': 'l', 'capacity': 3}},
+                 'edge_attr': {},
+                 'node_attr': {'a': [('color', 'red')], 'b': []}}
+        gr = hypergraph.__new__(hypergraph)
+        gr.__setstate__(state)
+        assert gr.graph is bipartite
+        assert sorted(gr.neighbors('a')) == ['b']
+        assert gr.edge_weight('x') == 2
+        assert gr.edge_label('x') == 'l'
+        assert gr.get_edge_properties('x')['capacity'] == 3
+        gr.add_node_attribute('b', ('color', 'red'))
+        assert sorted(gr.nodes_with_attribute('color', 'red')) == ['a', 'b']
+        gr.add_node('c')
+        gr.link('c', 'x')
+        assert sorted(gr.neighbors('a')) == ['b', 'c']
+        assert gr.graph.has_edge((('c', 'n'), ('x', 'h')))
+        assert loads(dumps(gr)) == gr
+    
+    def test_add_hyperedges(self):
+        gr = hypergraph()
+        gr.add_nodes([0, 1])
+        gr.add_hyperedges(['a', 'b', 'a'])
+        gr.add_hyperedges(['b', 'c'])
+        assert sorted(gr.hyperedges()) == ['a', 'b', 'c']
+        gr.link(0, 'c')
+        assert gr.links('c') == [0]
+    
+    def test_add_edges_with_weights_and_labels(self):
+        gr = hypergraph()
+        gr.add_edges(['a', 'b'], weights=[2, 3], labels=['x', 'y'])
+        assert gr.edge_weight('b') == 3
+        assert gr.edge_label('a') == 'x'
+        gr.add_hyperedges(['b', 'c'], weights=[4, 5])
+        assert gr.edge_weight('b') == 3
+        assert gr.edge_weight('c') == 5
+        assert gr.edge_label('c') == ''
+        version = gr.version
+        self.assertRaises(AdditionError, gr.add_edges, ['d', 'e'], weights=[1])
+        assert sorted(gr.hyperedges()) == ['a', 'b', 'c']
+        assert gr.version == version
+
+    def test_version_and_journal(self):
+        gr = hypergraph()
+        gr.enable_journal()
+        gr.add_nodes([0, 1])
+        gr.add_hyperedge('a')
+        gr.link(0, 'a')
+        gr.link(1, 'a')
+        gr.unlink(1, 'a')
+        gr.del_node(0)
+        assert gr.version == 6
+        assert [op for op, args, kwargs in gr.changes_since(3)] == ['link', 'unlink', 'del_node']
+
+    def test_fingerprint(self):
+        gr1 = testlib.new_hypergraph()
+        gr2 = deepcopy(gr1)
+        assert gr1.fingerprint() == gr2.fingerprint()
+        edge = gr2.hyperedges()[0]
+        for node in gr2.nodes():
+            if (node not in gr2.links(edge)):
+                gr2.link(node, edge)
+                break
+        assert gr1.fingerprint() != gr2.fingerprint()
+        assert gr1 != gr2
+
     def test_rank(self):
         # Uniform case
         gr = testlib.new_uniform_hypergraph(3)
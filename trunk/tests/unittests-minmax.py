@@ -142,6 +142,65 @@ class test_shortest_path(unittest.TestCase):
             assert False
         except (KeyError):
             pass
+    
+    def test_shortest_path_with_target(self):
+        gr = testlib.new_digraph(wt_range=(1,10))
+        st, dist = shortest_path(gr, 0)
+        for each in dist:
+            st_t, dist_t = shortest_path(gr, 0, target=each)
+            assert dist_t[each] == dist[each]
+            assert len(dist_t) <= len(dist)
+            for node in dist_t:
+                assert dist_t[node] <= dist[each]
+                assert st_t[node] in dist_t or st_t[node] is None
+    
+    def test_shortest_path_with_targets(self):
+        gr = testlib.new_graph(wt_range=(1,10))
+        st, dist = shortest_path(gr, 0)
+        targets = list(dist.keys())[-3:]
+        st_t, dist_t = shortest_path(gr, 0, targets=targets)
+        for each in targets:
+            assert dist_t[each] == dist[each]
+    
+    def test_shortest_path_with_unreachable_target(self):
+        gr = generate_fixture_digraph_unconnected()
+        st, dist = shortest_path(gr, 1, target=100)
+        assert 100 not in dist
+        assert dist == shortest_path(gr, 1)[1]
+    
+    def test_shortest_path_with_interning(self):
+        for gr in [testlib.new_graph(wt_range=(1,10)), testlib.new_digraph(wt_range=(1,10)),
+                   testlib.new_graph(wt_range=(1,2)), testlib.new_digraph(wt_range=(1,2))]:
+            st, dist = shortest_path(gr, 0)
+            targets = list(dist.keys())[-3:] + ['invalid']
+            early = shortest_path(gr, 0, targets=targets)
+            bounded = shortest_path(gr, 0, max_distance=5)
+            gr.enable_interning()
+            assert shortest_path(gr, 0) == (st, dist)
+            assert shortest_path(gr, 0, targets=targets) == early
+            assert shortest_path(gr, 0, max_distance=5) == bounded
+            assert bounded[1] == dict((node, dist[node]) for node in dist if dist[node] <= 5)
+    
+    def test_shortest_path_with_interning_breaks_ties_alike(self):
+        # Nodes added in reverse order get ids in the opposite order of their values
+        for gr in [testlib.new_graph(), testlib.new_digraph()]:
+            reverse = gr.__class__()
+            reverse.add_nodes(reversed(gr.nodes()))
+            reverse.add_edges(gr.edges() if gr.DIRECTED else set(tuple(sorted(edge))
+                                                                 for edge in gr.edges()))
+            expected = shortest_path(reverse, 0)
+            reverse.enable_interning()
+            assert shortest_path(reverse, 0) == expected
+    
+    def test_shortest_path_with_max_distance(self):
+        gr = testlib.new_graph(wt_range=(1,10))
+        st, dist = shortest_path(gr, 0)
+        st_m, dist_m = shortest_path(gr, 0, max_distance=5)
+        for each in dist:
+            if (dist[each] <= 5):
+                assert dist_m[each] == dist[each]
+            else:
+                assert each not in dist_m
                 
 class test_shortest_path_bellman_ford(unittest.TestCase):
     
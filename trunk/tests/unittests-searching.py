@@ -32,6 +32,10 @@ import unittest
 import pygraph
 import pygraph.classes
 from pygraph.algorithms.searching import depth_first_search, breadth_first_search
+from pygraph.algorithms.searching import weighted_search
+from pygraph.algorithms.minmax import shortest_path
+from pygraph.algorithms.accessibility import accessibility
+from pygraph.algorithms.filters.radius import radius
 from sys import getrecursionlimit
 import testlib
 
@@ -105,6 +109,60 @@ class test_breadth_first_search(unittest.TestCase):
         assert st == {}
         assert lo == []
     
+    def test_bfs_with_interning(self):
+        for gr in [testlib.new_graph(), testlib.new_digraph()]:
+            expected = breadth_first_search(gr)
+            expected_from_root = breadth_first_search(gr, root=0, filter=radius(2))
+            gr.enable_interning()
+            assert breadth_first_search(gr) == expected
+            assert breadth_first_search(gr, root=0, filter=radius(2)) == expected_from_root
+    
+    def test_graph_like_objects(self):
+        # Objects providing only iteration and neighbor lookup are searched as before interning
+        class adjacency(dict):
+            def edge_weight(self, edge):
+                return 1
+        gr = adjacency({0: [1], 1: [0, 2], 2: [1]})
+        assert breadth_first_search(gr, root=0) == ({0: None, 1: 0, 2: 1}, [0, 1, 2])
+        assert shortest_path(gr, 0)[1] == {0: 0, 1: 1, 2: 2}
+        assert accessibility(gr)[2] == [2, 1, 0]
+    
+    def test_bfs_with_levels(self):
+        gr = testlib.new_graph()
+        st, lo, levels = breadth_first_search(gr, root=0, levels=True)
+        assert (st, lo) == breadth_first_search(gr, root=0)
+        assert sorted(levels) == sorted(lo)
+        for node in lo:
+            if (st[node] is None):
+                assert levels[node] == 0
+            else:
+                assert levels[node] == levels[st[node]] + 1
+        for i in range(1, len(lo)):
+            assert levels[lo[i-1]] <= levels[lo[i]]
+    
+    def test_bfs_from_many_roots(self):
+        gr = testlib.new_digraph()
+        roots = [0, 1, 2]
+        st, lo, levels = breadth_first_search(gr, roots=roots, levels=True)
+        assert lo[:3] == roots
+        for each in roots:
+            assert st[each] is None
+        for node in lo:
+            nearest = [breadth_first_search(gr, root=each, levels=True)[2].get(node)
+                       for each in roots]
+            assert levels[node] == min(x for x in nearest if x is not None)
+        assert breadth_first_search(gr, root=0, roots=[1, 2]) == (st, lo)
+        gr.enable_interning()
+        assert breadth_first_search(gr, roots=roots, levels=True) == (st, lo, levels)
+    
+    def test_bfs_from_many_roots_with_filter(self):
+        gr = pygraph.classes.graph.graph()
+        gr.add_nodes(range(10))
+        gr.add_edges([(i, i+1) for i in range(9)])
+        st, lo, levels = breadth_first_search(gr, roots=[0, 9], filter=radius(2), levels=True)
+        assert sorted(lo) == [0, 1, 2, 7, 8, 9]
+        assert levels == {0: 0, 9: 0, 1: 1, 8: 1, 2: 2, 7: 2}
+    
     def test_bfs_in_digraph(self):
         gr = testlib.new_digraph()
         st, lo = breadth_first_search(gr)
@@ -114,5 +172,47 @@ class test_breadth_first_search(unittest.TestCase):
         for node in st:
             assert gr.has_edge((st[node], node)) or st[node] == None
             
+
+class test_weighted_search(unittest.TestCase):
+
+    def test_weighted_search_in_empty_graph(self):
+        gr = pygraph.classes.graph.graph()
+        st, lo = weighted_search(gr)
+        assert st == {}
+        assert lo == []
+    
+    def test_weighted_search_in_graph(self):
+        for gr in [testlib.new_graph(), testlib.new_digraph()]:
+            st, lo, dist = weighted_search(gr, root=0, distances=True)
+            expected_st, expected_dist = shortest_path(gr, 0)
+            assert dist == expected_dist
+            assert sorted(lo) == sorted(expected_st)
+            for i in range(1, len(lo)):
+                assert dist[lo[i-1]] <= dist[lo[i]]
+            for node in lo:
+                if (st[node] is not None):
+                    assert dist[node] == dist[st[node]] + gr.edge_weight((st[node], node))
+    
+    def test_weighted_search_whole_graph(self):
+        gr = testlib.new_digraph()
+        st, lo = weighted_search(gr)
+        assert sorted(lo) == sorted(gr)
+        for node in st:
+            assert st[node] is None or gr.has_edge((st[node], node))
+        assert weighted_search(gr) == (st, lo)
+    
+    def test_weighted_search_from_many_roots(self):
+        gr = pygraph.classes.graph.graph()
+        gr.add_nodes(range(6))
+        gr.add_edge((0, 1), wt=1)
+        gr.add_edge((1, 2), wt=5)
+        gr.add_edge((2, 3), wt=1)
+        gr.add_edge((3, 4), wt=1)
+        gr.add_edge((4, 5), wt=1)
+        st, lo, dist = weighted_search(gr, roots=[0, 5], distances=True)
+        assert lo == [0, 5, 1, 4, 3, 2]
+        assert st == {0: None, 5: None, 1: 0, 4: 5, 3: 4, 2: 3}
+        assert dist == {0: 0, 5: 0, 1: 1, 4: 1, 3: 2, 2: 3}
+    
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
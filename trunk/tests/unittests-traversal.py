@@ -0,0 +1,80 @@
+# Copyright (c) 2012 Pedro Matiello <pmatiello@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+
+"""
+Unittests for graph.algorithms.traversal
+"""
+
+
+import unittest
+import testlib
+from pygraph.classes.graph import graph
+from pygraph.classes.digraph import digraph
+from pygraph.algorithms.traversal import traversal
+from pygraph.algorithms.searching import depth_first_search, breadth_first_search
+from sys import getrecursionlimit
+
+
+class test_traversal(unittest.TestCase):
+    
+    def test_pre_and_post_order(self):
+        for gr in [testlib.new_graph(), testlib.new_digraph()]:
+            st, pre, post = depth_first_search(gr, root=0)
+            assert list(traversal(gr, 0)) == pre
+            assert list(traversal(gr, 0, 'pre')) == pre
+            assert list(traversal(gr, 0, 'post')) == post
+    
+    def test_bfs_order(self):
+        for gr in [testlib.new_graph(), testlib.new_digraph()]:
+            st, lo, levels = breadth_first_search(gr, root=0, levels=True)
+            assert list(traversal(gr, 0, 'bfs')) == lo
+            assert list(traversal(gr, 0, 'bfs', edges=True)) == [(st[node], node, levels[node])
+                                                                 for node in lo]
+    
+    def test_edges(self):
+        gr = digraph()
+        gr.add_nodes([0, 1, 2, 3])
+        gr.add_edges([(0, 1), (1, 2), (0, 3), (3, 2)])
+        assert list(traversal(gr, 0, 'pre', edges=True)) == [(None, 0, 0), (0, 1, 1), (1, 2, 2),
+                                                             (0, 3, 1)]
+        assert list(traversal(gr, 0, 'post', edges=True)) == [(1, 2, 2), (0, 1, 1), (0, 3, 1),
+                                                              (None, 0, 0)]
+        assert list(traversal(gr, 0, 'bfs', edges=True)) == [(None, 0, 0), (0, 1, 1), (0, 3, 1),
+                                                             (1, 2, 2)]
+    
+    def test_unknown_order(self):
+        gr = testlib.new_graph()
+        self.assertRaises(ValueError, traversal, gr, 0, 'in')
+    
+    def test_very_deep_graph(self):
+        gr = graph()
+        gr.add_nodes(range(0, 5 * getrecursionlimit()))
+        gr.add_edges((i, i+1) for i in range(0, 5 * getrecursionlimit() - 1))
+        for order in ['pre', 'post', 'bfs']:
+            assert len(list(traversal(gr, 0, order))) == len(gr)
+        assert list(traversal(gr, 0, 'post', edges=True))[0] == (len(gr) - 2, len(gr) - 1,
+                                                                 len(gr) - 1)
+    
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+# Copyright (c) 2012 Pedro Matiello <pmatiello@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+
+"""
+Unittests for graph.algorithms.walk
+"""
+
+
+import unittest
+import testlib
+from pygraph.classes.graph import graph
+from pygraph.classes.digraph import digraph
+from pygraph.algorithms.walk import depth_first_walk, PRE, POST, BACK
+from pygraph.algorithms.filters.null import null
+from pygraph.algorithms.filters.find import find
+from sys import getrecursionlimit
+
+
+class test_depth_first_walk(unittest.TestCase):
+    
+    def test_events(self):
+        gr = digraph()
+        gr.add_nodes([0, 1, 2, 3])
+        gr.add_edges([(0, 1), (1, 2), (2, 0), (0, 2)])
+        events = list(depth_first_walk(gr, gr, back=True))
+        assert events == [(PRE, 0, None), (PRE, 1, 0), (PRE, 2, 1), (BACK, 2, 0), (POST, 2, 1),
+                          (POST, 1, 0), (BACK, 0, 2), (POST, 0, None), (PRE, 3, None),
+                          (POST, 3, None)]
+        assert BACK not in [event for event, node, other in depth_first_walk(gr, gr)]
+    
+    def test_pre_and_post_order(self):
+        for gr in [testlib.new_graph(), testlib.new_digraph()]:
+            pre = {}
+            post = {}
+            for event, node, parent in depth_first_walk(gr, gr):
+                if (event == PRE):
+                    if (parent is not None):
+                        assert gr.has_edge((parent, node))
+                        assert parent in pre and parent not in post
+                    pre[node] = len(pre)
+                else:
+                    assert node in pre and node not in post
+                    post[node] = len(post)
+            assert set(pre) == set(post) == set(gr)
+    
+    def test_filter(self):
+        gr = graph()
+        gr.add_nodes([0, 1, 2, 3])
+        gr.add_edges([(0, 1), (1, 2), (2, 3)])
+        walk = depth_first_walk(gr, [0], filter=lambda node, parent: node != 2)
+        assert [node for event, node, other in walk if (event == PRE)] == [0, 1]
+        walk = depth_first_walk(gr, [0], filter=null())
+        assert [node for event, node, other in walk if (event == PRE)] == [0, 1, 2, 3]
+    
+    def test_stop(self):
+        gr = graph()
+        gr.add_nodes([0, 1, 2, 3, 4])
+        gr.add_edges([(0, 1), (1, 2), (1, 3), (3, 4)])
+        events = list(depth_first_walk(gr, gr, filter=find(2), back=True))
+        assert events == [(PRE, 0, None), (PRE, 1, 0), (BACK, 1, 0), (PRE, 2, 1), (POST, 2, 1),
+                          (POST, 1, 0), (POST, 0, None)]
+    
+    def test_interned_rows(self):
+        gr = testlib.new_digraph()
+        gr.enable_interning()
+        nodes, ids, rows = gr.interned()
+        by_node = [(event, node) for event, node, other in depth_first_walk(gr, gr)]
+        by_id = [(event, nodes[i]) for event, i, other in depth_first_walk(rows, range(len(nodes)))]
+        assert by_node == by_id
+    
+    def test_very_deep_graph(self):
+        gr = graph()
+        gr.add_nodes(range(0, 5 * getrecursionlimit()))
+        gr.add_edges((i, i+1) for i in range(0, 5 * getrecursionlimit() - 1))
+        recursionlimit = getrecursionlimit()
+        events = list(depth_first_walk(gr, [0]))
+        assert len(events) == 2 * len(gr)
+        assert events[-1] == (POST, 0, None)
+        assert getrecursionlimit() == recursionlimit
+    
+if __name__ == "__main__":
+    unittest.main()